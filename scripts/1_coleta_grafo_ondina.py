@@ -1,13 +1,48 @@
 import osmnx as ox
 import networkx as nx
 import pickle
+import argparse
+import logging
+from pathlib import Path
 
-# Nome do bairro ou área de interesse
-bairro = "Ondina, Salvador, Brazil"
+from coleta_tiles import coleta_tiles
 
-# Baixar o grafo do bairro da Ondina
-print("Baixando dados do OpenStreetMap...")
-grafo = ox.graph_from_place(bairro, network_type='drive')
+logging.basicConfig(level=logging.INFO)
+
+parser = argparse.ArgumentParser(description="Coleta a malha viária do OpenStreetMap")
+parser.add_argument("--lugares", nargs="+", default=None,
+                    help="Lugares coletados como tiles separados (ex.: vários bairros)")
+parser.add_argument("--bbox", nargs=4, type=float, default=None, metavar=("OESTE", "SUL", "LESTE", "NORTE"),
+                    help="Retângulo dividido em tiles")
+parser.add_argument("--tamanho-tile", type=float, default=0.01,
+                    help="Lado dos tiles em graus")
+parser.add_argument("--osm", type=Path, default=None,
+                    help="Extrato OSM local (.osm ou .osm.bz2) para coletar sem internet")
+parser.add_argument("--workers", type=int, default=None,
+                    help="Número de processos usados para construir os tiles")
+parser.add_argument("--atualizar", action="store_true",
+                    help="Reconstrói todos os tiles, ignorando o cache")
+parser.add_argument("--saida", default="grafo_ondina.gpickle")
+args = parser.parse_args()
+
+if args.lugares or args.bbox or args.osm:
+    # Modo em tiles: cada tile é construído em paralelo (com cache) e os grafos são costurados
+    print("Coletando a malha viária em tiles...")
+    grafo = coleta_tiles(
+        lugares=args.lugares,
+        bbox=tuple(args.bbox) if args.bbox else None,
+        tamanho_tile=args.tamanho_tile,
+        extrato=args.osm,
+        max_workers=args.workers,
+        atualizar=args.atualizar,
+    )
+else:
+    # Nome do bairro ou área de interesse
+    bairro = "Ondina, Salvador, Brazil"
+
+    # Baixar o grafo do bairro da Ondina
+    print("Baixando dados do OpenStreetMap...")
+    grafo = ox.graph_from_place(bairro, network_type='drive')
 
 # Criar uma figura maior para melhor visualização
 # plt.figure(figsize=(20, 20))
@@ -51,6 +86,6 @@ grafo = ox.graph_from_place(bairro, network_type='drive')
 
 # Exportar o grafo para análise posterior
 print("Salvando o grafo...")
-with open("grafo_ondina.gpickle", 'wb') as f:
+with open(args.saida, 'wb') as f:
     pickle.dump(grafo, f)
-print("Grafo salvo com sucesso em: grafo_ondina.gpickle")
\ No newline at end of file
+print(f"Grafo com {len(grafo)} nós e {grafo.number_of_edges()} arestas salvo com sucesso em: {args.saida}")
\ No newline at end of file
@@ -2,69 +2,196 @@ import networkx as nx
 import json
 import os
 import pickle
+import argparse
+from array import array
+from pathlib import Path
+from textwrap import indent
 
-def cria_instancia_do_grafo(grafo_path, output_dir):
-    # Carregar o grafo
-    with open(grafo_path, 'rb') as f:
-        G = pickle.load(f)
-    
-    # Criar dicionário de mapeamento de nós
-    mapeamento_nos = {node: idx for idx, node in enumerate(G.nodes())}
-    
-    # Criar a estrutura da instância
-    instancia = {
-        "nodes": [],
-        "edges": [],
-        "metadata": {
-            "name": "Grafo de Ondina",
-            "description": "Grafo das ruas do bairro de Ondina, Salvador",
-            "source": "OpenStreetMap"
-        }
+from carregador import arquivo_vertex_cover, carrega_instancia
+from instancia_binaria import salva_instancia_binaria
+from instancia_jsonl import TAMANHO_BUFFER, escreve_jsonl
+
+METADATA = {
+    "name": "Grafo de Ondina",
+    "description": "Grafo das ruas do bairro de Ondina, Salvador",
+    "source": "OpenStreetMap"
+}
+
+def nome_da_instancia(grafo_path):
+    """
+    Nome da instância a partir do arquivo do grafo: grafo_salvador.gpickle -> salvador.
+    """
+    nome = Path(grafo_path).stem
+    return nome[len("grafo_"):] if nome.startswith("grafo_") else nome
+
+def metadados(nome):
+    """
+    Metadados gravados na instância. Ondina mantém os metadados originais.
+    """
+    if nome == "ondina":
+        return METADATA
+    lugar = nome.replace("_", " ").title()
+    return {
+        "name": f"Grafo de {lugar}",
+        "description": f"Grafo das ruas de {lugar}",
+        "source": "OpenStreetMap"
     }
-    
-    # Adicionar nós
+
+def gera_nos(G, mapeamento_nos):
+    """
+    Gera os nós da instância um a um, sem montar a lista completa.
+    """
     for node_id, data in G.nodes(data=True):
-        instancia["nodes"].append({
+        yield {
             "id": mapeamento_nos[node_id],
             "lat": data['y'],
             "lon": data['x']
-        })
-    
-    # Adicionar arestas
+        }
+
+def gera_arestas(G, mapeamento_nos):
+    """
+    Gera as arestas da instância uma a uma, sem montar a lista completa.
+    """
     for u, v, data in G.edges(data=True):
         if 'length' in data:
             peso = data['length']
         else:
-            peso = ((G.nodes[u]['y'] - G.nodes[v]['y'])**2 + 
+            peso = ((G.nodes[u]['y'] - G.nodes[v]['y'])**2 +
                    (G.nodes[u]['x'] - G.nodes[v]['x'])**2)**0.5 * 111000
-        
-        edge = {
+
+        yield {
             "source": mapeamento_nos[u],
             "target": mapeamento_nos[v],
             "weight": float(peso),
             "name": data.get('name', '')
         }
-        instancia["edges"].append(edge)
-    
-    # Calcular cobertura de vértices
+
+def _escreve_lista_json(f, chave, itens, ultima=False):
+    # Mesmo layout de json.dump(..., indent=2), um item de cada vez
+    f.write(f'  "{chave}": [')
+    vazia = True
+    for item in itens:
+        f.write("\n" if vazia else ",\n")
+        f.write(indent(json.dumps(item, indent=2, ensure_ascii=False), "    "))
+        vazia = False
+    f.write("]" if vazia else "\n  ]")
+    f.write("\n" if ultima else ",\n")
+
+def escreve_json(caminho, metadata, nos, arestas):
+    """
+    Grava a instância no formato do ondina.json consumindo os geradores.
+    O arquivo sai igual ao de json.dump com indent=2.
+    """
+    with open(caminho, 'w', encoding='utf-8', buffering=TAMANHO_BUFFER) as f:
+        f.write("{\n")
+        _escreve_lista_json(f, "nodes", nos)
+        _escreve_lista_json(f, "edges", arestas)
+        f.write('  "metadata": ')
+        f.write(indent(json.dumps(metadata, indent=2, ensure_ascii=False), "  ")[2:])
+        f.write("\n}")
+
+def escreve_binario(caminho, metadata, nos, arestas):
+    """
+    Grava a instância no formato binário. Os geradores são consumidos em
+    colunas compactas (array), sem guardar um dicionário por nó ou aresta.
+    """
+    ids, lat, lon = array('q'), array('d'), array('d')
+    for no in nos:
+        ids.append(no["id"])
+        lat.append(no["lat"])
+        lon.append(no["lon"])
+
+    origens, destinos, pesos, nomes = array('q'), array('q'), array('d'), []
+    for aresta in arestas:
+        origens.append(aresta["source"])
+        destinos.append(aresta["target"])
+        pesos.append(aresta["weight"])
+        nomes.append(aresta["name"])
+
+    salva_instancia_binaria(caminho, nos=ids, lat=lat, lon=lon, origens=origens, destinos=destinos,
+                            pesos=pesos, nomes=nomes, metadata=metadata)
+
+def calcula_vertex_cover(instancia_path):
+    """
+    Etapa separada: calcula a cobertura de vértices de uma instância já gerada
+    e a grava ao lado dela (ex.: ondina.vertex_cover.json). O carregador junta
+    esse arquivo à instância.
+
+    Como na versão original, a cobertura é calculada sobre o multigrafo
+    direcionado do OSM, remontado com nós e arestas na ordem do arquivo (o
+    resultado da aproximação depende da ordem em que as arestas são vistas).
+    """
+    instancia = carrega_instancia(instancia_path)
+    origens, destinos, _ = instancia.arestas()
+    G = nx.MultiDiGraph()
+    G.add_nodes_from(instancia.pos)
+    G.add_edges_from(zip(map(int, origens), map(int, destinos)))
     vertex_cover = nx.approximation.min_weighted_vertex_cover(G)
-    instancia["vertex_cover"] = [mapeamento_nos[node] for node in vertex_cover]
-    
+
+    output_path = arquivo_vertex_cover(instancia_path)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({"vertex_cover": sorted(vertex_cover)}, f, indent=2)
+
+    print(f"Cobertura de vértices com {len(vertex_cover)} nós salva em: {output_path}")
+    return output_path
+
+def cria_instancia_do_grafo(grafo_path, output_dir, formato="ambos", vertex_cover=False, nome=None):
+    # Arquivos e metadados seguem o grafo de entrada (grafo_salvador.gpickle -> salvador.bin)
+    nome = nome or nome_da_instancia(grafo_path)
+    metadata = metadados(nome)
+
+    # Carregar o grafo
+    with open(grafo_path, 'rb') as f:
+        G = pickle.load(f)
+
+    # Criar dicionário de mapeamento de nós
+    mapeamento_nos = {node: idx for idx, node in enumerate(G.nodes())}
+
     # Criar diretório de saída se não existir
     os.makedirs(output_dir, exist_ok=True)
-    
-    # Salvar a instância em formato JSON
-    output_path = os.path.join(output_dir, "ondina.json")
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(instancia, f, indent=2, ensure_ascii=False)
-    
+
+    # Cada formato percorre o grafo com os geradores e escreve à medida que lê
+    escritores = {
+        "binario": (f"{nome}.bin", escreve_binario),
+        "json": (f"{nome}.json", escreve_json),
+        "jsonl": (f"{nome}.jsonl", escreve_jsonl),
+    }
+    formatos = ["binario", "json"] if formato == "ambos" else [formato]
+    arquivos = []
+    for nome in formatos:
+        arquivo, escreve = escritores[nome]
+        output_path = os.path.join(output_dir, arquivo)
+        escreve(output_path, metadata, gera_nos(G, mapeamento_nos), gera_arestas(G, mapeamento_nos))
+        arquivos.append(output_path)
+
     print(f"Instância gerada com sucesso!")
-    print(f"Número de nós: {len(instancia['nodes'])}")
-    print(f"Número de arestas: {len(instancia['edges'])}")
-    print(f"Arquivo salvo em: {output_path}")
+    print(f"Número de nós: {G.number_of_nodes()}")
+    print(f"Número de arestas: {G.number_of_edges()}")
+    print(f"Arquivos salvos em: {', '.join(arquivos)}")
+
+    # Calcular cobertura de vértices (etapa opcional, sobre a instância gerada)
+    if vertex_cover:
+        del G
+        calcula_vertex_cover(arquivos[0])
 
 if __name__ == "__main__":
-    grafo_path = "grafo_ondina.gpickle"
+    parser = argparse.ArgumentParser(description="Gera a instância a partir do grafo coletado")
+    parser.add_argument("--formato", choices=["binario", "json", "jsonl", "ambos"], default="ambos",
+                        help="Formato da instância gerada (o JSON fica como exportação)")
+    parser.add_argument("--vertex-cover", action="store_true",
+                        help="Também calcula a cobertura de vértices depois de gerar a instância")
+    parser.add_argument("--grafo", default="grafo_ondina.gpickle",
+                        help="Grafo coletado pelo 1_coleta_grafo_ondina.py (um bairro ou vários tiles consolidados)")
+    parser.add_argument("--nome", default=None,
+                        help="Nome dos arquivos da instância (padrão: derivado do grafo, grafo_salvador.gpickle -> salvador)")
+    parser.add_argument("--somente-vertex-cover", metavar="INSTANCIA", default=None,
+                        help="Só calcula a cobertura de vértices de uma instância já gerada")
+    args = parser.parse_args()
+
+    grafo_path = args.grafo
     output_dir = "../instancias"
-    
-    cria_instancia_do_grafo(grafo_path, output_dir) 
\ No newline at end of file
+
+    if args.somente_vertex_cover:
+        calcula_vertex_cover(args.somente_vertex_cover)
+    else:
+        cria_instancia_do_grafo(grafo_path, output_dir, args.formato, args.vertex_cover, args.nome)
@@ -1,31 +1,18 @@
-import json
+import argparse
+from pathlib import Path
+
 import networkx as nx
 import matplotlib.pyplot as plt
 
+from carregador import carrega_instancia
+
 def visualiza_grafo(json_path):
-    # Carregar o JSON
-    print("Carregando dados do arquivo JSON...")
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # Criar um grafo direcionado
-    G = nx.Graph()
-    
-    # Adicionar nós com suas posições
-    print("Criando grafo...")
-    pos = {}
-    for node in data['nodes']:
-        G.add_node(node['id'])
-        # Usar longitude como x e latitude como y
-        pos[node['id']] = (node['lon'], node['lat'])
-    
-    # Adicionar arestas
-    for edge in data['edges']:
-        G.add_edge(
-            edge['source'], 
-            edge['target'], 
-            weight=edge['weight']
-        )
+    # Carregar a instância (grafo e posições vêm do cache quando disponível)
+    print("Carregando instância...")
+    instancia = carrega_instancia(json_path)
+    data = instancia.dados
+    G = instancia.grafo
+    pos = instancia.pos
     
     # Configurar o plot
     plt.figure(figsize=(20, 20))
@@ -66,7 +53,10 @@ def visualiza_grafo(json_path):
     plt.show()
 
 if __name__ == "__main__":
-    # Caminho para o arquivo JSON
-    json_path = "../instancias/ondina.json"
+    script_dir = Path(__file__).parent.parent  # Diretório raiz do projeto
+    parser = argparse.ArgumentParser(description="Visualização da instância e da cobertura de vértices")
+    parser.add_argument("--instancia", type=Path, default=script_dir / "instancias" / "ondina.bin",
+                        help="Arquivo da instância, .bin, .json ou .jsonl (padrão: instancias/ondina.bin)")
+    args = parser.parse_args()
     
-    visualiza_grafo(json_path) 
\ No newline at end of file
+    visualiza_grafo(args.instancia) 
\ No newline at end of file
@@ -1,20 +1,21 @@
-import json
+import argparse
 import networkx as nx
 from collections import Counter
+from pathlib import Path
+
+from carregador import carrega_instancia
 
 def analisa_instancia(json_path):
-    # Carregar o JSON
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # Carregar a instância
+    instancia = carrega_instancia(json_path)
+    data = instancia.dados
     
     # Estatísticas básicas
     num_nos = len(data['nodes'])
     num_arestas = len(data['edges'])
     
-    # Criar grafo para análises
-    G = nx.Graph()
-    for edge in data['edges']:
-        G.add_edge(edge['source'], edge['target'], weight=edge['weight'])
+    # Grafo para análises
+    G = instancia.grafo
     
     # Análise de conectividade
     num_componentes = nx.number_connected_components(G)
@@ -69,7 +70,10 @@ def analisa_instancia(json_path):
     print(f"- Nós na cobertura de vértices: {vertex_cover}")
 
 if __name__ == "__main__":
-    # Caminho para o arquivo JSON
-    json_path = "../instancias/ondina.json"
+    script_dir = Path(__file__).parent.parent  # Diretório raiz do projeto
+    parser = argparse.ArgumentParser(description="Estatísticas da instância")
+    parser.add_argument("--instancia", type=Path, default=script_dir / "instancias" / "ondina.bin",
+                        help="Arquivo da instância, .bin, .json ou .jsonl (padrão: instancias/ondina.bin)")
+    args = parser.parse_args()
     
-    analisa_instancia(json_path) 
\ No newline at end of file
+    analisa_instancia(args.instancia) 
\ No newline at end of file
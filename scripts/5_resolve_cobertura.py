@@ -3,66 +3,88 @@
 
 import networkx as nx
 import numpy as np
-from typing import List, Set, Tuple
+from typing import Dict, List, Set, Tuple
 import json
 import os
 from pathlib import Path
 import logging
+import argparse
+
+from avaliacao_incremental import AvaliadorIncremental
+from carregador import carrega_instancia
+from guloso_estocastico import GulosoEstocastico
+from guloso_preguicoso import GulosoPreguicoso
+from indice_vizinhanca import IndiceVizinhanca
+from reducao import ReducaoInstancia
+from solucao_exata import SolverExato
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def load_graph_from_json(json_path: str) -> nx.Graph:
-    """
-    Carrega o grafo a partir do arquivo JSON.
-    
-    Args:
-        json_path (str): Caminho para o arquivo JSON
-        
-    Returns:
-        nx.Graph: Grafo do NetworkX
-    """
-    with open(json_path, 'r') as f:
-        data = json.load(f)
-    
-    # Cria um grafo não direcionado
-    G = nx.Graph()
-    
-    # Adiciona os nós com seus atributos
-    for node in data['nodes']:
-        G.add_node(
-            node['id'],
-            lat=node['lat'],
-            lon=node['lon']
-        )
-    
-    # Adiciona as arestas com seus atributos
-    for edge in data['edges']:
-        G.add_edge(
-            edge['source'],
-            edge['target'],
-            weight=edge['weight'],
-            name=edge.get('name', '')  # Alguns podem não ter nome
-        )
-    
-    return G
-
 class CoberturaVertices:
-    def __init__(self, grafo: nx.Graph):
+    def __init__(self, grafo: nx.Graph, indice: IndiceVizinhanca = None, I: List[int] = None, J: List[int] = None):
         """
         Inicializa o solver de cobertura de vértices.
         
         Args:
             grafo (nx.Graph): Grafo do NetworkX representando a malha viária
+            indice (IndiceVizinhanca, optional): Índice das vizinhanças fechadas já construído
+            I (List[int], optional): Vértices de demanda (padrão: todos; ex.: após a redução)
+            J (List[int], optional): Vértices de instalação (padrão: todos; ex.: após a redução)
         """
         self.grafo = grafo
-        self.I = list(grafo.nodes())  # conjunto de vértices de demanda
-        self.J = list(grafo.nodes())  # conjunto de vértices de instalação
+        self.I = list(I) if I is not None else list(grafo.nodes())  # conjunto de vértices de demanda
+        self.J = list(J) if J is not None else list(grafo.nodes())  # conjunto de vértices de instalação
         self.cameras = {}  # dicionário para armazenar as câmeras instaladas
+        self.estatisticas_guloso = {}  # contadores da última execução gulosa
+        
+        # Vizinhanças fechadas N[v] calculadas uma única vez
+        self.indice = indice if indice is not None else IndiceVizinhanca.de_grafo(grafo)
         
-        # Inicialização da matriz de adjacência
-        self.matriz_adjacencia = nx.adjacency_matrix(grafo).toarray()  # matriz de adjacência
+        # Matriz de adjacência esparsa, construída só se for usada
+        self._matriz_adjacencia = None
+        
+    @property
+    def matriz_adjacencia(self):
+        """
+        Matriz de adjacência do grafo em CSR (memória proporcional ao número de arestas).
+        """
+        if self._matriz_adjacencia is None:
+            self._matriz_adjacencia = nx.adjacency_matrix(self.grafo).tocsr()
+        return self._matriz_adjacencia
+
+    def memoria_bytes(self) -> Dict[str, int]:
+        """
+        Memória ocupada pelas estruturas do solver, em bytes.
         
+        Returns:
+            Dict: bytes do índice, da matriz esparsa (0 se ainda não construída)
+                  e de uma matriz densa |V|×|V| equivalente, para comparação
+        """
+        matriz = 0
+        if self._matriz_adjacencia is not None:
+            m = self._matriz_adjacencia
+            matriz = m.data.nbytes + m.indices.nbytes + m.indptr.nbytes
+        return {
+            "indice": self.indice.memoria_bytes(),
+            "matriz_adjacencia": int(matriz),
+            "matriz_densa_equivalente": self.indice.n * self.indice.n * 8,
+        }
+
+    def _guloso(self, demanda) -> GulosoPreguicoso:
+        """
+        Cria o motor guloso preguiçoso sobre as vizinhanças fechadas de J.
+        """
+        return GulosoPreguicoso(self.indice, self.indice.posicoes(self.J), self.indice.posicoes(demanda))
+
+    def _registra_estatisticas(self, guloso: GulosoPreguicoso, nome: str):
+        self.estatisticas_guloso = dict(guloso.estatisticas)
+        logger.info(
+            f"{nome}: {guloso.estatisticas['avaliacoes']} avaliações de ganho "
+            f"({guloso.estatisticas['reavaliacoes_evitadas']} evitadas de "
+            f"{guloso.estatisticas['avaliacoes_ingenuas']} da varredura completa)"
+        )
+
     def resolve_cobertura_completa(self) -> Set[int]:
         """
         Implementa o algoritmo guloso para cobertura completa de vértices.
@@ -72,77 +94,139 @@ class CoberturaVertices:
         Returns:
             Set[int]: Conjunto de vértices selecionados para instalação de câmeras
         """
-        vertices_nao_cobertos = set(self.I)
-        cobertura = set()
+        guloso = self._guloso(self.I)
+        cobertura = set(self.indice.ids(guloso.seleciona()))
+        self._registra_estatisticas(guloso, "Cobertura completa")
         
-        while vertices_nao_cobertos:
-            # Encontra o vértice que cobre mais vértices ainda não cobertos
-            melhor_vertice = None
-            max_cobertura = 0
-            
-            for v in self.J:
-                if v not in cobertura:
-                    # Calcula quantos vértices não cobertos este vértice pode cobrir
-                    vizinhos = set(self.grafo.neighbors(v))
-                    cobertura_atual = len((vizinhos | {v}) & vertices_nao_cobertos)
-                    
-                    if cobertura_atual > max_cobertura:
-                        max_cobertura = cobertura_atual
-                        melhor_vertice = v
-            
-            if melhor_vertice is None:
-                break
-                
-            # Adiciona o melhor vértice à cobertura
-            cobertura.add(melhor_vertice)
-            
-            # Atualiza os vértices não cobertos
-            vertices_nao_cobertos -= set(self.grafo.neighbors(melhor_vertice))
-            vertices_nao_cobertos.discard(melhor_vertice)
-            
         return cobertura
 
-    def resolve_cobertura_maxima(self, max_cameras: int = 40) -> Tuple[List[int], Set[int]]:
+    def resolve_cobertura_maxima(self, max_cameras: int = 40, epsilon: float = None,
+                                 semente: int = None) -> Tuple[List[int], Set[int]]:
         """
         Resolve o problema de cobertura máxima, onde queremos cobrir o máximo
         de vértices possível usando no máximo max_cameras câmeras.
         
         Args:
             max_cameras: Número máximo de câmeras que podem ser usadas.
+            epsilon: Se informado, usa o guloso estocástico, que avalia só
+                ⌈(n/k)·ln(1/ε)⌉ candidatos sorteados por rodada (garantia
+                esperada de 1 - 1/e - ε); None usa o guloso preguiçoso exato
+            semente: Semente da amostragem do guloso estocástico
             
         Returns:
             Tupla com (lista de vértices selecionados, conjunto de vértices cobertos)
         """
-        cobertura = set()
-        vertices_cobertos = set()
+        if epsilon is not None:
+            guloso = GulosoEstocastico(self.indice, self.indice.posicoes(self.J), self.indice.posicoes(self.I),
+                                       epsilon, semente)
+            cobertura = set(self.indice.ids(guloso.seleciona(max_cameras)))
+            self._registra_estatisticas(guloso, "Cobertura máxima (estocástica)")
+            logger.info(f"Guloso estocástico: amostras de {guloso.estatisticas['tamanho_amostra']} candidatos, "
+                        f"aproximação esperada de (1 - 1/e - ε) = {guloso.fator_aproximacao:.3f} do ótimo")
+        else:
+            guloso = self._guloso(self.I)
+            cobertura = set(self.indice.ids(guloso.seleciona(max_cameras)))
+            self._registra_estatisticas(guloso, "Cobertura máxima")
+        
+        vertices_cobertos = self.vertices_cobertos(cobertura)
+            
+        return list(cobertura), vertices_cobertos
+
+    def varredura_orcamento(self, max_cameras: int = None) -> Dict:
+        """
+        Curva de cobertura para todos os orçamentos p = 1..max_cameras em uma única execução gulosa.
+        
+        O guloso é consistente com prefixos: a solução com p câmeras são as p
+        primeiras escolhas da execução sem limite. Por isso basta uma
+        execução e a soma acumulada dos ganhos marginais dá a cobertura de
+        cada orçamento. Depois da cobertura completa a curva fica constante.
+        
+        Args:
+            max_cameras: Maior orçamento da curva (None para ir até a cobertura completa)
+            
+        Returns:
+            Dict: orçamentos, vértices de demanda cobertos em cada um e a ordem de seleção (ids);
+                  a solução do orçamento p é ordem_selecao[:p]
+        """
+        guloso = self._guloso(self.I)
+        ordem = guloso.seleciona(max_cameras)
+        self._registra_estatisticas(guloso, "Varredura de orçamentos")
+        
+        cobertura = np.cumsum(guloso.ganhos, dtype=np.int64).tolist()
+        maximo = max_cameras if max_cameras is not None else len(ordem)
+        total = cobertura[-1] if cobertura else 0
+        cobertura.extend([total] * (maximo - len(cobertura)))
+        return {
+            "orcamentos": list(range(1, maximo + 1)),
+            "cobertura": cobertura,
+            "ordem_selecao": self.indice.ids(ordem),
+            "cobertura_completa_com": len(ordem) if total == len(self.I) else None,
+        }
+
+    def resolve_cobertura_completa_exata(self, tempo_limite: float = 60.0) -> Dict:
+        """
+        Resolve a cobertura completa de forma exata (programação inteira),
+        partindo da solução gulosa como limite superior.
         
-        for _ in range(max_cameras):
-            melhor_vertice = None
-            max_novos_cobertos = 0
+        Args:
+            tempo_limite: Tempo máximo do solver em segundos
             
-            for v in self.J:
-                if v not in cobertura:
-                    # Calcula quantos novos vértices seriam cobertos
-                    vizinhos = set(self.grafo.neighbors(v))
-                    novos_cobertos = len((vizinhos | {v}) - vertices_cobertos)
-                    
-                    if novos_cobertos > max_novos_cobertos:
-                        max_novos_cobertos = novos_cobertos
-                        melhor_vertice = v
+        Returns:
+            Dict: solução (ids), valor, limites inferior/superior e gap de otimalidade
+        """
+        gulosa = self.indice.posicoes(self.resolve_cobertura_completa())
+        exato = SolverExato(self.indice, self.indice.posicoes(self.J), self.indice.posicoes(self.I))
+        resultado = exato.resolve_cobertura_completa(gulosa, tempo_limite)
+        resultado["solucao"] = self.indice.ids(resultado["solucao"])
+        return resultado
+
+    def resolve_cobertura_maxima_exata(self, max_cameras: int = 40, tempo_limite: float = 60.0) -> Dict:
+        """
+        Resolve a cobertura máxima de forma exata (programação inteira),
+        partindo da solução gulosa como limite inferior.
+        
+        Args:
+            max_cameras: Número máximo de câmeras que podem ser usadas.
+            tempo_limite: Tempo máximo do solver em segundos
             
-            if melhor_vertice is None or max_novos_cobertos == 0:
-                break
-                
-            # Adiciona o melhor vértice à cobertura
-            cobertura.add(melhor_vertice)
+        Returns:
+            Dict: solução (ids), valor, limites inferior/superior e gap de otimalidade
+        """
+        gulosa, _ = self.resolve_cobertura_maxima(max_cameras)
+        exato = SolverExato(self.indice, self.indice.posicoes(self.J), self.indice.posicoes(self.I))
+        resultado = exato.resolve_cobertura_maxima(max_cameras, self.indice.posicoes(gulosa), tempo_limite)
+        resultado["solucao"] = self.indice.ids(resultado["solucao"])
+        return resultado
+
+    def vertices_cobertos(self, cobertura) -> Set[int]:
+        """
+        Calcula os vértices cobertos por um conjunto de câmeras.
+        
+        Args:
+            cobertura: Vértices onde há câmeras instaladas
             
-            # Atualiza os vértices cobertos
-            vertices_cobertos.update(self.grafo.neighbors(melhor_vertice))
-            vertices_cobertos.add(melhor_vertice)
+        Returns:
+            Set[int]: Conjunto de vértices cobertos
+        """
+        mascara = self.indice.mascara_cobertura(self.indice.posicoes(cobertura))
+        return set(self.indice.ids(np.flatnonzero(mascara)))
+
+    def avaliador_incremental(self, cobertura) -> AvaliadorIncremental:
+        """
+        Cria um avaliador incremental para melhorar uma solução após o guloso.
+        
+        Args:
+            cobertura: Vértices onde há câmeras instaladas
             
-        return list(cobertura), vertices_cobertos
+        Returns:
+            AvaliadorIncremental: Avaliador com os contadores de cobertura (em posições do índice)
+        """
+        demanda = np.zeros(self.indice.n, dtype=bool)
+        demanda[self.indice.posicoes(self.I)] = True
+        return AvaliadorIncremental(self.indice, self.indice.posicoes(cobertura), demanda)
 
-    def salvar_resultado(self, cobertura: Set[int], arquivo_saida: str, vertices_cobertos: Set[int] = None):
+    def salvar_resultado(self, cobertura: Set[int], arquivo_saida: str, vertices_cobertos: Set[int] = None,
+                         extras: Dict = None):
         """
         Salva o resultado da cobertura em um arquivo JSON.
         
@@ -150,9 +234,10 @@ class CoberturaVertices:
             cobertura (Set[int]): Conjunto de vértices selecionados
             arquivo_saida (str): Caminho do arquivo de saída
             vertices_cobertos (Set[int], optional): Conjunto de vértices cobertos
+            extras (Dict, optional): Campos adicionais gravados junto ao resultado
         """
         if vertices_cobertos is None:
-            vertices_cobertos = set().union(*[set(self.grafo.neighbors(v)) | {v} for v in cobertura])
+            vertices_cobertos = self.vertices_cobertos(cobertura)
             
         resultado = {
             "vertices_selecionados": list(cobertura),
@@ -161,37 +246,112 @@ class CoberturaVertices:
             "total_cobertura": len(vertices_cobertos),
             "total_vertices": len(self.grafo)
         }
+        if extras:
+            resultado.update(extras)
         
         os.makedirs(os.path.dirname(arquivo_saida), exist_ok=True)
         with open(arquivo_saida, 'w') as f:
             json.dump(resultado, f, indent=2)
             
+def registra_reducao(reducao: ReducaoInstancia):
+    """
+    Registra no log o tamanho da instância antes e depois da redução.
+    """
+    e = reducao.estatisticas
+    logger.info(f"Redução ({reducao.modo}): J {e['candidatos_iniciais']} -> {e['candidatos_finais']}, "
+                f"I {e['demanda_inicial']} -> {e['demanda_final']}, "
+                f"{e['forcados']} câmeras forçadas, {e['gemeos']} gêmeos unidos")
+
+def resolve_exato(solver: CoberturaVertices, p: int, tempo_limite: float, sufixo: str = ""):
+    """
+    Resolve os dois problemas de forma exata e registra o gap de otimalidade.
+    """
+    for nome, resultado, arquivo in [
+        ("Cobertura Completa", solver.resolve_cobertura_completa_exata(tempo_limite),
+         f"resultados/cobertura_completa_exata{sufixo}.json"),
+        ("Cobertura Máxima", solver.resolve_cobertura_maxima_exata(p, tempo_limite),
+         f"resultados/cobertura_maxima_exata{sufixo}.json"),
+    ]:
+        logger.info(f"\n{nome} (exata):")
+        logger.info(f"- Valor: {resultado['valor']} ({'ótimo' if resultado['otimo'] else 'não provado ótimo'})")
+        logger.info(f"- Limites: [{resultado['limite_inferior']}, {resultado['limite_superior']}], "
+                    f"gap de {resultado['gap'] * 100:.2f}% em {resultado['tempo']:.2f} s")
+        extras = {k: v for k, v in resultado.items() if k not in ("solucao", "valor")}
+        solver.salvar_resultado(resultado["solucao"], arquivo, extras=extras)
+
 def main():
-    # Carrega o grafo do arquivo JSON
-    script_dir = Path(__file__).parent.parent  # Sobe um nível para a raiz do projeto
-    json_path = script_dir / "instancias" / "ondina.json"
+    script_dir = Path(__file__).parent.parent  # Raiz do projeto
+    parser = argparse.ArgumentParser(description="Cobertura completa e máxima de vértices")
+    parser.add_argument("--exato", action="store_true",
+                        help="Também resolve os dois problemas de forma exata e informa o gap de otimalidade")
+    parser.add_argument("--reducao", action="store_true",
+                        help="Reduz a instância (dominância e seleções forçadas) antes dos gulosos")
+    parser.add_argument("--tempo-limite", type=float, default=60.0,
+                        help="Tempo máximo do solver exato, em segundos")
+    parser.add_argument("--max-cameras", type=int, default=40,
+                        help="Número máximo de câmeras da cobertura máxima")
+    parser.add_argument("--varredura", type=int, default=None, metavar="P",
+                        help="Também calcula a curva de cobertura para p = 1..P em uma única execução gulosa")
+    parser.add_argument("--epsilon", type=float, default=None,
+                        help="Cobertura máxima com o guloso estocástico (amostras por rodada, garantia 1 - 1/e - ε)")
+    parser.add_argument("--semente", type=int, default=None,
+                        help="Semente do guloso estocástico")
+    parser.add_argument("--raio", type=float, default=None, metavar="R",
+                        help="Cada câmera cobre os vértices a até R metros pelas ruas (padrão: ela e os vizinhos)")
+    parser.add_argument("--instancia", type=Path, default=script_dir / "instancias" / "ondina.bin",
+                        help="Arquivo da instância, .bin, .json ou .jsonl (padrão: instancias/ondina.bin)")
+    args = parser.parse_args()
+    
+    # Carrega o grafo do arquivo da instância
+    json_path = args.instancia
     
     if not json_path.exists():
         logger.error(f"Arquivo do grafo não encontrado em {json_path}")
         return
         
-    grafo = load_graph_from_json(str(json_path))
+    # Grafo e índice das vizinhanças fechadas vêm do cache da instância
+    instancia = carrega_instancia(json_path)
+    grafo = instancia.grafo
     total_vertices = len(grafo.nodes())
     total_arestas = len(grafo.edges())
     logger.info(f"\nGrafo de Ondina carregado:")
     logger.info(f"- Total de vértices: {total_vertices}")
     logger.info(f"- Total de arestas: {total_arestas}")
         
-    solver = CoberturaVertices(grafo)
+    indice = instancia.indice
+    sufixo = ""
+    if args.raio is not None:
+        # Conjuntos de cobertura pelo Dijkstra limitado, calculados uma vez por raio (cache em disco)
+        indice = instancia.indice_raio(args.raio)
+        sufixo = f"_raio{args.raio:g}"
+        logger.info(f"- Cobertura por raio de {args.raio:g} m: {indice.graus().mean():.1f} vértices por câmera, em média")
+    solver = CoberturaVertices(grafo, indice)
+    memoria = solver.memoria_bytes()
+    logger.info(f"- Memória do solver: {(memoria['indice'] + memoria['matriz_adjacencia']) / 1024:.1f} KiB "
+                f"(uma matriz de adjacência densa ocuparia {memoria['matriz_densa_equivalente'] / 1024:.1f} KiB)")
     
     # Resolve cobertura completa
-    cobertura_completa = solver.resolve_cobertura_completa()
-    solver.salvar_resultado(cobertura_completa, "resultados/cobertura_completa.json")
+    if args.reducao:
+        # Seleções forçadas + guloso sobre os conjuntos I e J reduzidos
+        reducao = ReducaoInstancia(indice, 'completa').reduz()
+        registra_reducao(reducao)
+        reduzido = CoberturaVertices(grafo, indice, I=reducao.ids_demanda(), J=reducao.ids_candidatos())
+        cobertura_completa = reducao.eleva(reduzido.resolve_cobertura_completa())
+    else:
+        cobertura_completa = solver.resolve_cobertura_completa()
+    solver.salvar_resultado(cobertura_completa, f"resultados/cobertura_completa{sufixo}.json")
     
     # Resolve cobertura máxima com limite de câmeras
-    p = 40  # número máximo de câmeras
-    cobertura_maxima, vertices_cobertos = solver.resolve_cobertura_maxima(p)
-    solver.salvar_resultado(cobertura_maxima, "resultados/cobertura_maxima.json", vertices_cobertos)
+    p = args.max_cameras  # número máximo de câmeras
+    if args.reducao:
+        # Na cobertura máxima só os candidatos dominados são removidos
+        reducao = ReducaoInstancia(indice, 'maxima').reduz()
+        registra_reducao(reducao)
+        reduzido = CoberturaVertices(grafo, indice, J=reducao.ids_candidatos())
+        cobertura_maxima, vertices_cobertos = reduzido.resolve_cobertura_maxima(p, args.epsilon, args.semente)
+    else:
+        cobertura_maxima, vertices_cobertos = solver.resolve_cobertura_maxima(p, args.epsilon, args.semente)
+    solver.salvar_resultado(cobertura_maxima, f"resultados/cobertura_maxima{sufixo}.json", vertices_cobertos)
     
     # Log dos resultados em formato similar ao README
     logger.info(f"\nResultados da execução:")
@@ -206,7 +366,7 @@ def main():
     logger.info(f"- Média de {vertices_cobertos_max/p:.1f} vértices cobertos por câmera")
     
     # Salva um resumo em formato markdown
-    with open("resultados/README.md", "w") as f:
+    with open(f"resultados/README{sufixo}.md", "w") as f:
         f.write("## Resultados da Execução\n\n")
         f.write("Na execução com o grafo de Ondina:\n")
         f.write(f"- Total de vértices no grafo: {total_vertices}\n")
@@ -217,6 +377,16 @@ def main():
         f.write("### Cobertura Máxima\n")
         f.write(f"- Com {p} câmeras, consegue cobrir {vertices_cobertos_max} vértices ({porcentagem_cobertura:.1f}% do total)\n")
         f.write(f"- Média de {vertices_cobertos_max/p:.1f} vértices cobertos por câmera\n")
+    
+    if args.varredura:
+        curva = solver.varredura_orcamento(args.varredura)
+        curva["total_vertices"] = total_vertices
+        with open(f"resultados/varredura_gulosa{sufixo}.json", "w") as f:
+            json.dump(curva, f)
+        logger.info(f"Varredura p = 1..{args.varredura} salva em resultados/varredura_gulosa{sufixo}.json")
+    
+    if args.exato:
+        resolve_exato(solver, p, args.tempo_limite, sufixo)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
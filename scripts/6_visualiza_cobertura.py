@@ -1,14 +1,18 @@
+import argparse
 import json
 import networkx as nx
 import matplotlib.pyplot as plt
 import os
 from pathlib import Path
 
+from carregador import carrega_instancia
+
 def visualiza_cobertura(json_path, resultados_dir, figuras_dir):
-    # Carregar o grafo original
-    print("Carregando dados do arquivo JSON...")
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # Carregar o grafo original (do cache quando disponível)
+    print("Carregando instância...")
+    instancia = carrega_instancia(json_path)
+    G = instancia.grafo
+    pos = instancia.pos
     
     # Carregar resultados da cobertura
     print("Carregando resultados da cobertura...")
@@ -17,20 +21,6 @@ def visualiza_cobertura(json_path, resultados_dir, figuras_dir):
     with open(f"{resultados_dir}/cobertura_maxima.json", 'r') as f:
         cobertura_maxima = json.load(f)
     
-    # Criar grafo
-    G = nx.Graph()
-    pos = {}
-    
-    # Adicionar nós com suas posições
-    print("Criando grafo...")
-    for node in data['nodes']:
-        G.add_node(node['id'])
-        pos[node['id']] = (node['lon'], node['lat'])
-    
-    # Adicionar arestas
-    for edge in data['edges']:
-        G.add_edge(edge['source'], edge['target'], weight=edge['weight'])
-    
     # Criar duas visualizações lado a lado
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(20, 10))
     
@@ -92,7 +82,11 @@ def visualiza_cobertura(json_path, resultados_dir, figuras_dir):
 if __name__ == "__main__":
     # Determinar caminhos relativos ao script
     script_dir = Path(__file__).parent.parent  # Diretório raiz do projeto
-    json_path = script_dir / "instancias" / "ondina.json"
+    parser = argparse.ArgumentParser(description="Visualização das coberturas completa e máxima")
+    parser.add_argument("--instancia", type=Path, default=script_dir / "instancias" / "ondina.bin",
+                        help="Arquivo da instância, .bin, .json ou .jsonl (padrão: instancias/ondina.bin)")
+    args = parser.parse_args()
+    json_path = args.instancia
     resultados_dir = script_dir / "resultados"
     figuras_dir = script_dir / "Figuras"
     
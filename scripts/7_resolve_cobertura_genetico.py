@@ -1,206 +1,1034 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import networkx as nx
 import numpy as np
-from typing import List, Set, Tuple
+from scipy import sparse
 import json
 import random
 import os
+import time
 from pathlib import Path
 import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from avaliacao_incremental import AvaliadorIncremental
+from cache_fitness import CacheFitness, digest
+from carregador import carrega_instancia
+from indice_vizinhanca import IndiceVizinhanca
+from metricas_genetico import MetricasGeracao, PerfilCProfile
+from reducao import ReducaoInstancia
+from selecao_genetico import cria_selecao, elites
+from semeadura_genetico import amostra_por_grau, guloso, guloso_aleatorio, le_fracoes, quantidades
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def load_graph_from_json(json_path: str) -> nx.Graph:
-    """
-    Carrega o grafo a partir do arquivo JSON.
-    """
-    with open(json_path, 'r') as f:
-        data = json.load(f)
-    
-    G = nx.Graph()
-    
-    # Adiciona nós
-    for node in data['nodes']:
-        G.add_node(
-            node['id'],
-            lat=node['lat'],
-            lon=node['lon']
-        )
-    
-    # Adiciona arestas
-    for edge in data['edges']:
-        G.add_edge(
-            edge['source'],
-            edge['target'],
-            weight=edge['weight'],
-            name=edge.get('name', '')
-        )
-    
-    return G
+# Genes por bloco nas matrizes auxiliares das operações em lote da codificação binária
+ELEMENTOS_POR_BLOCO = 1 << 22
 
 class GeneticVertexCover:
-    def __init__(self, graph, population_size=1000, generations=200, crossover_rate=0.8, mutation_rate=0.1):
+    def __init__(self, graph, population_size=1000, generations=200, crossover_rate=0.8, mutation_rate=0.1, indice=None,
+                 modo_fitness='vetorizado', codificacao='binaria', semente=None, verbose=True, candidatos=None,
+                 max_cameras=40, tamanho_cache=100_000, paciencia=None, tempo_limite=None, max_avaliacoes=None,
+                 fitness_alvo=None, selecao='topo', tamanho_selecao=None, elite_size=2):
         self.graph = graph
+        # Gerador próprio para que execuções com a mesma semente sejam reproduzíveis
+        self.random = random.Random(semente)
+        # Os índices dos pais de cada geração saem em lote deste gerador do numpy
+        self.rng = np.random.default_rng(semente)
+        self.verbose = verbose
+        # Vizinhanças fechadas compartilhadas; a posição no índice é o gene do indivíduo
+        self.indice = indice if indice is not None else IndiceVizinhanca.de_grafo(graph)
+        # 'vetorizado' avalia a geração inteira de uma vez; 'escalar' avalia indivíduo a indivíduo
+        self.modo_fitness = modo_fitness
+        # Transposta da matriz de cobertura: linha i indica as câmeras que cobrem i
+        self.cobertura_t = self.indice.matriz_csr().T.tocsr()
+        # 'binaria' guarda um array 0/1 (uint8) de tamanho |V|; 'indices' guarda um array
+        # ordenado com as posições das câmeras (int32), de tamanho max_cameras
+        self.codificacao = codificacao
+        self.num_vertices = self.indice.n
+        # Bitmap de pertinência reaproveitado pelos operadores da codificação por índices;
+        # é sempre devolvido zerado, então não precisa existir um por indivíduo
+        self._membros = np.zeros(self.num_vertices, dtype=bool)
+        # Posições onde câmeras podem ser instaladas (conjunto J, ex.: após a redução)
+        self.candidatos = (list(range(self.num_vertices)) if candidatos is None
+                           else sorted(int(v) for v in candidatos))
+        self._eh_candidato = np.zeros(self.num_vertices, dtype=bool)
+        self._eh_candidato[self.candidatos] = True
         self.population_size = population_size
         self.generations = generations
         self.crossover_rate = crossover_rate
         self.mutation_rate = mutation_rate
-        self.max_cameras = 40  # Limitando a 40 câmeras
+        # Orçamento de câmeras (40 no experimento original); o cromossomo não
+        # pode ter mais câmeras que candidatos
+        self.max_cameras = min(max_cameras, len(self.candidatos))
+        # Critérios de parada antecipada de run() (None desativa cada um): gerações
+        # sem melhora, segundos de relógio, avaliações e fitness que encerra a busca
+        self.paciencia = paciencia
+        self.tempo_limite = tempo_limite
+        self.max_avaliacoes = max_avaliacoes
+        self.fitness_alvo = fitness_alvo
+        self.motivo_parada = None  # por que a última chamada de run() terminou
+        # Seleção dos pais: 'topo' (uniforme entre os 50 melhores), 'torneio' ou 'sus';
+        # tamanho_selecao é o tamanho do topo ou do torneio
+        self.selecao = cria_selecao(selecao, **({'tamanho': tamanho_selecao}
+                                                 if tamanho_selecao is not None and selecao != 'sus' else {}))
+        self.elite_size = elite_size
+        self.geracoes_executadas = 0
         self.best_solution = None
         self.best_fitness = float('-inf')
+        self.population = None  # população ao final da última chamada de run()
+        self.historico = []  # melhor fitness de cada geração avaliada
+        self.avaliacoes = 0  # indivíduos avaliados desde a criação
+        # Cache LRU da fitness por conjunto de câmeras (0 desativa)
+        self.cache = CacheFitness(tamanho_cache) if tamanho_cache else None
         
     def initialize_population(self):
         population = []
+        if self.codificacao == 'indices':
+            for _ in range(self.population_size):
+                camera_positions = self.random.sample(self.candidatos, self.max_cameras)
+                population.append(np.array(sorted(camera_positions), dtype=np.int32))
+            return population
+            
         for _ in range(self.population_size):
-            # Gera um indivíduo com exatamente 40 câmeras
-            individual = [0] * len(self.graph.nodes())
-            camera_positions = random.sample(range(len(individual)), self.max_cameras)
-            for pos in camera_positions:
-                individual[pos] = 1
+            # Gera um indivíduo com exatamente max_cameras câmeras
+            individual = np.zeros(self.num_vertices, dtype=np.uint8)
+            individual[self.random.sample(self.candidatos, self.max_cameras)] = 1
             population.append(individual)
         return population
     
+    def individuo(self, cameras):
+        """
+        Codifica um conjunto de posições de câmeras como indivíduo da codificação configurada.
+        """
+        cameras = sorted(int(v) for v in cameras)
+        if self.codificacao == 'indices':
+            return np.array(cameras, dtype=np.int32)
+        individual = np.zeros(self.num_vertices, dtype=np.uint8)
+        individual[cameras] = 1
+        return individual
+    
+    def ajusta_orcamento(self, cameras):
+        """
+        Leva uma solução de outro orçamento para exatamente max_cameras câmeras:
+        sobrando orçamento, entram as câmeras de maior ganho; faltando, saem
+        as de menor perda.
+        """
+        avaliador = AvaliadorIncremental(self.indice, cameras)
+        while len(avaliador.cameras) > self.max_cameras:
+            avaliador.remover(min(sorted(avaliador.cameras), key=avaliador.perda_remocao))
+        while len(avaliador.cameras) < self.max_cameras:
+            livres = [v for v in self.candidatos if v not in avaliador.cameras]
+            if not livres:
+                break
+            avaliador.adicionar(max(livres, key=avaliador.ganho_adicao))
+        return sorted(avaliador.cameras)
+    
+    def populacao_aquecida(self, cameras, fracao=0.1, max_trocas=3):
+        """
+        População inicial a partir da melhor solução de um orçamento vizinho.
+        
+        A solução ajustada ao orçamento atual e variações dela (de 1 a
+        `max_trocas` câmeras trocadas por candidatos sorteados) ocupam uma
+        fração `fracao` da população; o restante é sorteado como de costume,
+        para manter a diversidade.
+        
+        Args:
+            cameras: Posições das câmeras da solução anterior
+            fracao: Fração da população derivada da solução anterior
+            max_trocas: Número máximo de câmeras trocadas em cada variação
+        """
+        base = self.ajusta_orcamento(cameras)
+        population = self.initialize_population()
+        aquecidos = max(1, int(self.population_size * fracao))
+        population[0] = self.individuo(base)
+        for k in range(1, min(aquecidos, len(population))):
+            variacao = list(base)
+            self._membros[variacao] = True
+            for _ in range(min(self.random.randint(1, max_trocas), len(variacao))):
+                if np.count_nonzero(self._membros) >= len(self.candidatos):
+                    break
+                novo = self._amostra_fora(1)[0]
+                i = self.random.randrange(len(variacao))
+                self._membros[variacao[i]] = False
+                variacao[i] = novo
+            self._membros[variacao] = False
+            population[k] = self.individuo(variacao)
+        return population
+    
+    def populacao_semeada(self, fracoes, r=3, expoente_grau=1.0):
+        """
+        População inicial com parte dos indivíduos vindos de heurísticas.
+        
+        Estratégias (fração da população de cada uma; o restante é sorteado
+        como em initialize_population):
+        - 'guloso': a solução do guloso preguiçoso (um único indivíduo);
+        - 'guloso_aleatorio': gulosos que sorteiam entre os r melhores candidatos a cada passo;
+        - 'grau': câmeras sorteadas com probabilidade proporcional a |N[v]|^expoente_grau.
+        
+        Args:
+            fracoes: Estratégia -> fração da população (ex.: {'guloso_aleatorio': 0.2, 'grau': 0.2})
+            r: Número de candidatos considerados em cada passo do guloso aleatorizado
+            expoente_grau: Expoente do viés por grau
+        """
+        numeros = quantidades(fracoes, self.population_size)
+        # Gerador do numpy derivado do gerador do GA: a semente continua valendo
+        rng = np.random.default_rng(self.random.getrandbits(64))
+        population = self.initialize_population()
+        
+        semeados = []
+        if numeros.get('guloso'):
+            semeados.append(guloso(self.indice, self.candidatos, self.max_cameras))
+        for _ in range(numeros.get('guloso_aleatorio', 0)):
+            semeados.append(guloso_aleatorio(self.indice, self.candidatos, self.max_cameras, r, rng))
+        for _ in range(numeros.get('grau', 0)):
+            semeados.append(amostra_por_grau(self.indice, self.candidatos, self.max_cameras, rng, expoente_grau))
+        
+        for k, cameras in enumerate(semeados[:len(population)]):
+            population[k] = self.individuo(cameras)
+        return population
+    
+    def cameras(self, individual):
+        """
+        Posições das câmeras de um indivíduo, em qualquer codificação.
+        """
+        if self.codificacao == 'indices':
+            return individual.tolist()
+        return np.flatnonzero(individual).tolist()
+    
     def calculate_fitness(self, individual):
-        cameras = [i for i, gene in enumerate(individual) if gene == 1]
-        if len(cameras) > self.max_cameras:  # Penaliza soluções com mais de 40 câmeras
+        cameras = self.cameras(individual)
+        if len(cameras) > self.max_cameras:  # Penaliza soluções acima do orçamento
             return float('-inf')
             
-        vertices_cobertos = set()
-        for camera in cameras:
-            vertices_cobertos.add(camera)
-            vertices_cobertos.update(self.graph.neighbors(camera))
+        return self.indice.cobertura(cameras)
+    
+    def avaliar_populacao(self, population, matriz=None):
+        """
+        Avalia todos os indivíduos da geração em uma única passada.
+        
+        A população é empilhada em uma matriz (pop, n) de uint8 e o número de câmeras
+        que vê cada vértice sai de um produto com a matriz esparsa de
+        cobertura; um vértice está coberto quando esse número é positivo.
+        O resultado é idêntico ao de calculate_fitness para cada indivíduo.
+        Na codificação binária, `matriz` evita reconverter uma população já
+        convertida (ex.: pelo cache de fitness).
+        """
+        if self.codificacao == 'indices':
+            # Na codificação por índices a matriz da população já nasce esparsa
+            num_cameras = np.array([len(ind) for ind in population])
+            indptr = np.zeros(len(population) + 1, dtype=np.int64)
+            np.cumsum(num_cameras, out=indptr[1:])
+            matriz = sparse.csr_matrix(
+                (np.ones(indptr[-1], dtype=np.int32), np.concatenate(population), indptr),
+                shape=(len(population), self.num_vertices),
+            )
+            cobertos = np.diff((matriz @ self.cobertura_t.T).tocsr().indptr)
+        else:
+            if matriz is None:
+                matriz = np.asarray(population, dtype=np.uint8)
+            num_cameras = matriz.sum(axis=1)
+            cobertos = np.count_nonzero(self.cobertura_t @ matriz.T, axis=0)
+        
+        return [float('-inf') if cameras > self.max_cameras else cobertura
+                for cameras, cobertura in zip(num_cameras.tolist(), cobertos.tolist())]
+    
+    def _amostra_fora(self, quantidade):
+        """
+        Sorteia `quantidade` posições distintas fora do bitmap de pertinência,
+        marcando-as. Com poucas câmeras a rejeição custa O(1) por sorteio.
+        """
+        if quantidade > len(self.candidatos) - np.count_nonzero(self._membros) - quantidade:
+            livres = np.flatnonzero(self._eh_candidato & ~self._membros)
+            novos = self.random.sample(livres.tolist(), quantidade)
+            self._membros[novos] = True
+            return novos
             
-        return len(vertices_cobertos)
+        novos = []
+        while len(novos) < quantidade:
+            pos = self.candidatos[self.random.randrange(len(self.candidatos))]
+            if not self._membros[pos]:
+                self._membros[pos] = True
+                novos.append(pos)
+        return novos
+    
+    def _repara_indices(self, child):
+        """
+        Ajusta um filho na codificação por índices para exatamente max_cameras câmeras.
+        """
+        excesso = len(child) - self.max_cameras
+        if excesso > 0:
+            return np.delete(child, self.random.sample(range(len(child)), excesso))
+        if excesso < 0:
+            self._membros[child] = True
+            novos = self._amostra_fora(-excesso)
+            self._membros[child] = False
+            self._membros[novos] = False
+            child = np.concatenate([child, np.array(novos, dtype=np.int32)])
+            child.sort()
+        return child
+    
+    def _repara_binaria(self, child):
+        """
+        Ajusta um filho na codificação binária para exatamente max_cameras
+        câmeras, com o mesmo reparo da codificação por índices.
+        """
+        cameras = np.flatnonzero(child).astype(np.int32)
+        if len(cameras) != self.max_cameras:
+            child[cameras] = 0
+            child[self._repara_indices(cameras)] = 1
+        return child
+    
+    def _crossover_indices(self, parent1, parent2):
+        # Corte de um ponto sobre as posições: como os pais estão ordenados,
+        # cada metade é uma fatia encontrada por busca binária
+        point = self.random.randint(1, self.num_vertices - 1)
+        corte1 = np.searchsorted(parent1, point)
+        corte2 = np.searchsorted(parent2, point)
+        child1 = np.concatenate([parent1[:corte1], parent2[corte2:]])
+        child2 = np.concatenate([parent2[:corte2], parent1[corte1:]])
+        return self._repara_indices(child1), self._repara_indices(child2)
+    
+    def _mutate_indices(self, individual):
+        # Troca uma câmera de posição sem alterar o array do pai
+        if len(individual) == 0 or np.count_nonzero(self._eh_candidato[individual]) >= len(self.candidatos):
+            return individual  # nenhum candidato fora do cromossomo
+        remove_idx = self.random.randrange(len(individual))
+        self._membros[individual] = True
+        add_pos = self._amostra_fora(1)[0]
+        self._membros[individual] = False
+        self._membros[add_pos] = False
+        
+        mutated = np.delete(individual, remove_idx)
+        return np.insert(mutated, np.searchsorted(mutated, add_pos), add_pos)
+    
+    def _avalia(self, population, matriz=None):
+        self.avaliacoes += len(population)
+        if self.modo_fitness == 'vetorizado':
+            return self.avaliar_populacao(population, matriz)
+        return [self.calculate_fitness(ind) for ind in population]
+    
+    def fitness_populacao(self, population):
+        """
+        Fitness de todos os indivíduos conforme o modo configurado.
+        
+        Com o cache ativo, só os conjuntos de câmeras ainda não vistos (ou
+        já descartados do cache) são avaliados, cada um uma única vez;
+        elites copiados e filhos iguais aos pais saem do cache.
+        """
+        if self.cache is None:
+            return self._avalia(population)
+        
+        # Chave: digest das posições ordenadas (índices) ou do bitset empacotado (binária)
+        matriz = None
+        if self.codificacao == 'indices':
+            chaves = [digest(ind.tobytes()) for ind in population]
+        else:
+            matriz = np.asarray(population, dtype=np.uint8)
+            chaves = [digest(linha.tobytes()) for linha in np.packbits(matriz, axis=1)]
+        
+        fitness, pendentes = self.cache.busca_lote(chaves)
+        if pendentes:
+            primeiros = [posicoes[0] for posicoes in pendentes.values()]
+            novos = self._avalia([population[i] for i in primeiros],
+                                 None if matriz is None else matriz[primeiros])
+            for (chave, posicoes), valor in zip(pendentes.items(), novos):
+                self.cache.guarda(chave, valor)
+                for i in posicoes:
+                    fitness[i] = valor
+        return fitness
     
     def crossover(self, parent1, parent2):
-        if random.random() > self.crossover_rate:
+        if self.random.random() > self.crossover_rate:
             return parent1, parent2
             
-        point = random.randint(1, len(parent1)-1)
-        child1 = parent1[:point] + parent2[point:]
-        child2 = parent2[:point] + parent1[point:]
-        
-        # Ajusta para manter exatamente 40 câmeras
-        for child in [child1, child2]:
-            cameras = sum(child)
-            while cameras != self.max_cameras:
-                if cameras < self.max_cameras:
-                    zeros = [i for i, gene in enumerate(child) if gene == 0]
-                    if zeros:
-                        pos = random.choice(zeros)
-                        child[pos] = 1
-                        cameras += 1
-                else:
-                    ones = [i for i, gene in enumerate(child) if gene == 1]
-                    if ones:
-                        pos = random.choice(ones)
-                        child[pos] = 0
-                        cameras -= 1
-                        
-        return child1, child2
+        if self.codificacao == 'indices':
+            return self._crossover_indices(parent1, parent2)
+            
+        point = self.random.randint(1, len(parent1)-1)
+        child1 = np.concatenate([parent1[:point], parent2[point:]])
+        child2 = np.concatenate([parent2[:point], parent1[point:]])
+        
+        # Ajusta para manter exatamente max_cameras câmeras
+        return self._repara_binaria(child1), self._repara_binaria(child2)
     
     def mutate(self, individual):
-        if random.random() > self.mutation_rate:
+        if self.random.random() > self.mutation_rate:
             return individual
             
-        # Troca uma câmera de posição
-        ones = [i for i, gene in enumerate(individual) if gene == 1]
-        zeros = [i for i, gene in enumerate(individual) if gene == 0]
+        if self.codificacao == 'indices':
+            return self._mutate_indices(individual)
+            
+        # Troca uma câmera de posição, sem alterar o array do pai
+        ones = np.flatnonzero(individual)
+        if len(ones) == 0 or not np.any(self._eh_candidato & (individual == 0)):
+            return individual
+        remove_pos = ones[self.random.randrange(len(ones))]
+        self._membros[ones] = True
+        add_pos = self._amostra_fora(1)[0]
+        self._membros[ones] = False
+        self._membros[add_pos] = False
+        
+        mutated = individual.copy()
+        mutated[remove_pos] = 0
+        mutated[add_pos] = 1
+        return mutated
+    
+    def _blocos(self, linhas):
+        # Blocos de linhas com até ELEMENTOS_POR_BLOCO genes (matrizes auxiliares limitadas)
+        tamanho = max(1, ELEMENTOS_POR_BLOCO // max(self.num_vertices, 1))
+        for inicio in range(0, len(linhas), tamanho):
+            yield linhas[inicio:inicio + tamanho]
+    
+    def _repara_lote(self, filhos, linhas):
+        """
+        Reparo das linhas `linhas` da matriz de filhos para exatamente
+        max_cameras câmeras, todas de uma vez.
         
-        if ones and zeros:
-            remove_pos = random.choice(ones)
-            add_pos = random.choice(zeros)
-            individual[remove_pos] = 0
-            individual[add_pos] = 1
+        Cada gene recebe uma pontuação aleatória em [0, 1), somada de 1 se
+        for câmera (não candidatos sem câmera ficam com -1), e as max_cameras
+        maiores ficam: sobrando câmeras, sai um subconjunto uniforme delas;
+        faltando, entram candidatos livres uniformes, como no reparo individual.
+        """
+        for bloco in self._blocos(linhas):
+            genes = filhos[bloco]
+            pontuacao = self.rng.random(genes.shape, dtype=np.float32) + genes
+            pontuacao[(genes == 0) & ~self._eh_candidato] = -1
+            escolhidos = np.argpartition(-pontuacao, self.max_cameras - 1, axis=1)[:, :self.max_cameras]
+            genes[:] = 0
+            np.put_along_axis(genes, escolhidos, 1, axis=1)
+            filhos[bloco] = genes
+    
+    def crossover_lote(self, pais1, pais2):
+        """
+        Crossover de um ponto e reparo de todos os pares da geração de uma
+        vez, na codificação binária. Cada par cruza com probabilidade
+        crossover_rate; os que não cruzam são copiados.
+        
+        Args:
+            pais1, pais2: Matrizes (pares, n) de uint8 com os pais de cada par
             
-        return individual
+        Returns:
+            Tupla (matriz (2·pares, n) com os filhos de cada par em sequência,
+            máscara dos pares que cruzaram)
+        """
+        pares = len(pais1)
+        pontos = self.rng.integers(1, self.num_vertices, size=pares)
+        cruzou = self.rng.random(pares) <= self.crossover_rate
+        pontos[~cruzou] = self.num_vertices
+        mascara = np.arange(self.num_vertices) < pontos[:, None]
+        
+        filhos = np.empty((2 * pares, self.num_vertices), dtype=np.uint8)
+        filhos[0::2] = np.where(mascara, pais1, pais2)
+        filhos[1::2] = np.where(mascara, pais2, pais1)
+        
+        # Ajusta para manter exatamente max_cameras câmeras
+        errados = np.flatnonzero(filhos.sum(axis=1, dtype=np.int64) != self.max_cameras)
+        if len(errados):
+            self._repara_lote(filhos, errados)
+        return filhos, cruzou
     
-    def run(self):
-        population = self.initialize_population()
-        best_ever_fitness = float('-inf')
-        best_ever_solution = None
+    def mutate_lote(self, populacao, identidade=None, inicio=0):
+        """
+        Mutação de todos os filhos de uma vez, na codificação binária: cada
+        linha a partir de `inicio`, com probabilidade mutation_rate, troca uma
+        câmera sorteada por um candidato livre sorteado. Altera `populacao`.
+        
+        No run() original um filho não cruzado é o próprio objeto do pai, e a
+        mutação (feita no lugar) vale para todas as cópias dele na nova
+        população, inclusive elites. Com `identidade` (o objeto de origem de
+        cada linha), linhas de mesma identidade recebem a mesma troca.
+        """
+        mutados = inicio + np.flatnonzero(self.rng.random(len(populacao) - inicio) <= self.mutation_rate)
+        compartilhados = np.zeros(0, dtype=np.int64)
+        if identidade is not None and len(mutados):
+            _, inverso, copias = np.unique(identidade, return_inverse=True, return_counts=True)
+            repetidos = copias[inverso[mutados]] > 1
+            compartilhados, mutados = mutados[repetidos], mutados[~repetidos]
+        
+        for bloco in self._blocos(mutados):
+            genes = populacao[bloco].astype(bool)
+            livres = ~genes & self._eh_candidato
+            validos = genes.any(axis=1) & livres.any(axis=1)
+            # O maior de valores uniformes sobre um conjunto é um sorteio uniforme nele
+            sorteio = self.rng.random(genes.shape, dtype=np.float32)
+            sai = np.argmax(np.where(genes, sorteio, -1), axis=1)
+            entra = np.argmax(np.where(livres, sorteio, -1), axis=1)
+            linhas = bloco[validos]
+            populacao[linhas, sai[validos]] = 0
+            populacao[linhas, entra[validos]] = 1
+        
+        # Poucas linhas (não cruzadas e mutadas): uma a uma, sobre o estado atual do objeto
+        for linha in compartilhados.tolist():
+            uns = np.flatnonzero(populacao[linha])
+            livres = np.flatnonzero(self._eh_candidato & (populacao[linha] == 0))
+            if len(uns) and len(livres):
+                copias = identidade == identidade[linha]
+                populacao[copias, uns[self.rng.integers(len(uns))]] = 0
+                populacao[copias, livres[self.rng.integers(len(livres))]] = 1
+        return populacao
+    
+    def desempate(self, population):
+        """
+        Critério de desempate entre indivíduos de mesma fitness na ordenação da geração.
+        
+        Na codificação binária vale o do run() original, que ordenava os
+        pares (fitness, indivíduo) em ordem decrescente: entre fitness iguais
+        vem antes o vetor 0/1 lexicograficamente maior. O posto de cada
+        indivíduo sai de um np.unique sobre as linhas empacotadas, cuja
+        ordem de bytes é a ordem lexicográfica dos bits. Na codificação por
+        índices não há desempate (vence a menor posição).
+        
+        Returns:
+            np.ndarray: Posto de cada indivíduo (maior vence), ou None
+        """
+        if self.codificacao != 'binaria':
+            return None
+        linhas = np.packbits(np.asarray(population, dtype=np.uint8), axis=1)
+        _, posto = np.unique(linhas.view(np.dtype((np.void, linhas.shape[1]))).ravel(), return_inverse=True)
+        return posto
+    
+    def limite_superior(self):
+        """
+        Cobertura máxima possível com max_cameras câmeras: o menor entre o
+        total coberto por todos os candidatos e a soma das max_cameras
+        maiores vizinhanças fechadas. Atingir esse valor prova otimalidade.
+        """
+        tamanhos = np.sort(np.diff(self.indice.indptr)[self.candidatos])[::-1]
+        return int(min(self.indice.cobertura(self.candidatos), tamanhos[:self.max_cameras].sum()))
+    
+    def _criterio_parada(self, generation, ultima_melhora, inicio, avaliacoes_inicio):
+        if self.fitness_alvo is not None and self.best_fitness >= self.fitness_alvo:
+            return 'alvo'
+        if self.paciencia is not None and generation - ultima_melhora >= self.paciencia:
+            return 'estagnacao'
+        if self.tempo_limite is not None and time.perf_counter() - inicio >= self.tempo_limite:
+            return 'tempo'
+        if self.max_avaliacoes is not None and self.avaliacoes - avaliacoes_inicio >= self.max_avaliacoes:
+            return 'avaliacoes'
+        return None
+    
+    def run(self, population=None, callbacks=()):
+        """
+        Executa o algoritmo genético por até self.generations gerações.
+        
+        A busca para antes ao atingir fitness_alvo, após `paciencia` gerações
+        sem melhora, ao esgotar tempo_limite segundos ou max_avaliacoes
+        avaliações (verificados a cada geração, depois da avaliação). Em
+        qualquer caso a melhor solução encontrada é devolvida e o motivo
+        fica em self.motivo_parada ('geracoes', 'alvo', 'estagnacao',
+        'tempo' ou 'avaliacoes').
+        
+        Args:
+            population: População inicial (se None, é sorteada)
+            callbacks: Ganchos de metricas_genetico.Callback, chamados no início,
+                ao fim de cada geração (com os tempos por fase) e no fim
+        """
+        inicio_run = time.perf_counter()
+        avaliacoes_inicio = self.avaliacoes
+        if population is None:
+            population = self.initialize_population()
+        best_ever_fitness = self.best_fitness
+        best_ever_solution = self.best_solution
+        ultima_melhora = 0
+        self.motivo_parada = 'geracoes'
+        self.geracoes_executadas = 0
+        # Objeto de origem de cada indivíduo binário (ver mutate_lote)
+        identidade = np.arange(len(population))
+        proxima_identidade = len(population)
+        for callback in callbacks:
+            callback.inicio(self)
         
         for generation in range(self.generations):
             # Avalia a população
-            fitness_scores = [(self.calculate_fitness(ind), ind) for ind in population]
-            fitness_scores.sort(reverse=True)
+            inicio = time.perf_counter()
+            fitness = self.fitness_populacao(population)
+            fim_avaliacao = time.perf_counter()
+            tempo_crossover = tempo_mutacao = 0.0
+            # Só os elites são ordenados (argpartition); o resto da população não precisa de ordem
+            valores = np.asarray(fitness, dtype=np.float64)
+            desempate = self.desempate(population)
+            ordem_elite = elites(valores, max(self.elite_size, 1), desempate)
             
             # Atualiza a melhor solução
-            current_best_fitness = fitness_scores[0][0]
+            current_best_fitness = fitness[ordem_elite[0]]
+            self.historico.append(current_best_fitness)
             if current_best_fitness > best_ever_fitness:
                 best_ever_fitness = current_best_fitness
-                best_ever_solution = fitness_scores[0][1].copy()  # importante fazer uma cópia
-                print(f"Geração {generation}: Melhor fitness = {best_ever_fitness}")
+                best_ever_solution = population[ordem_elite[0]].copy()  # importante fazer uma cópia
+                ultima_melhora = generation
+                if self.verbose:
+                    print(f"Geração {generation}: Melhor fitness = {best_ever_fitness}")
             
             self.best_fitness = best_ever_fitness
             self.best_solution = best_ever_solution
+            self.geracoes_executadas += 1
             
-            # Seleção
-            new_population = []
-            elite_size = 2
-            new_population.extend([ind for _, ind in fitness_scores[:elite_size]])
+            # A população avaliada desta geração é a última se algum critério de parada valer
+            motivo = self._criterio_parada(generation, ultima_melhora, inicio_run, avaliacoes_inicio)
+            if motivo is None:
+                # Seleção: elites mais todos os pais da geração sorteados de uma vez
+                new_population = [population[i] for i in ordem_elite[:self.elite_size]]
+                num_pares = -(-(self.population_size - len(new_population)) // 2)
+                pais = self.selecao.sorteia(valores, 2 * num_pares, self.rng, desempate)
+                
+                # Crossover e Mutação (na codificação binária, da geração inteira de uma vez)
+                if self.codificacao == 'binaria':
+                    t0 = time.perf_counter()
+                    matriz = np.asarray(population, dtype=np.uint8)
+                    filhos, cruzou = self.crossover_lote(matriz[pais[0::2]], matriz[pais[1::2]])
+                    # A população binária segue como matriz: a próxima avaliação não a reempilha
+                    new_population = np.concatenate([matriz[ordem_elite[:self.elite_size]], filhos])
+                    # Filhos não cruzados mantêm a identidade do pai; os cruzados ganham uma nova
+                    cruzados = np.flatnonzero(np.repeat(cruzou, 2))
+                    ids_filhos = identidade[pais]
+                    ids_filhos[cruzados] = proxima_identidade + np.arange(len(cruzados))
+                    proxima_identidade += len(cruzados)
+                    identidade = np.concatenate([identidade[ordem_elite[:self.elite_size]], ids_filhos])
+                    t1 = time.perf_counter()
+                    self.mutate_lote(new_population, identidade, inicio=len(new_population) - len(filhos))
+                    tempo_crossover = t1 - t0
+                    tempo_mutacao = time.perf_counter() - t1
+                else:
+                    pais = pais.tolist()
+                    for k in range(num_pares):
+                        parent1 = population[pais[2 * k]]
+                        parent2 = population[pais[2 * k + 1]]
+                        t0 = time.perf_counter()
+                        child1, child2 = self.crossover(parent1, parent2)
+                        t1 = time.perf_counter()
+                        child1 = self.mutate(child1)
+                        child2 = self.mutate(child2)
+                        t2 = time.perf_counter()
+                        tempo_crossover += t1 - t0
+                        tempo_mutacao += t2 - t1
+                        new_population.extend([child1, child2])
             
-            # Crossover e Mutação
-            while len(new_population) < self.population_size:
-                parent1 = random.choice([ind for _, ind in fitness_scores[:50]])
-                parent2 = random.choice([ind for _, ind in fitness_scores[:50]])
-                child1, child2 = self.crossover(parent1, parent2)
-                child1 = self.mutate(child1)
-                child2 = self.mutate(child2)
-                new_population.extend([child1, child2])
+            if callbacks:
+                fim = time.perf_counter()
+                registro = {
+                    'geracao': generation,
+                    'tempo': fim - inicio,
+                    'tempo_avaliacao': fim_avaliacao - inicio,
+                    # Elites e sorteio dos pais
+                    'tempo_selecao': fim - fim_avaliacao - tempo_crossover - tempo_mutacao,
+                    'tempo_crossover': tempo_crossover,
+                    'tempo_mutacao': tempo_mutacao,
+                    'avaliacoes': self.avaliacoes,
+                    'melhor_fitness': best_ever_fitness,
+                }
+                for callback in callbacks:
+                    callback.geracao(self, registro, population, fitness)
             
+            if motivo is not None:
+                self.motivo_parada = motivo
+                break
             population = new_population[:self.population_size]
+            identidade = identidade[:self.population_size]
         
+        self.population = population
+        for callback in callbacks:
+            callback.fim(self)
         return self.best_solution
     
     def get_coverage(self):
-        if not self.best_solution:
+        if self.best_solution is None:
             return None
             
-        cameras = [i for i, gene in enumerate(self.best_solution) if gene == 1]
-        vertices_cobertos = set()
-        for camera in cameras:
-            vertices_cobertos.add(camera)
-            vertices_cobertos.update(self.graph.neighbors(camera))
+        cameras = self.cameras(self.best_solution)
+        vertices_cobertos = np.flatnonzero(self.indice.mascara_cobertura(cameras))
             
         return {
-            'vertices_selecionados': list(cameras),
-            'vertices_cobertos': list(vertices_cobertos),
+            'vertices_selecionados': self.indice.ids(cameras),
+            'vertices_cobertos': self.indice.ids(vertices_cobertos),
             'total_cameras': len(cameras),
             'total_cobertura': len(vertices_cobertos),
-            'total_vertices': len(self.graph.nodes())
+            'total_vertices': self.num_vertices,
+            **({'motivo_parada': self.motivo_parada, 'geracoes_executadas': self.geracoes_executadas}
+               if self.motivo_parada is not None else {}),
+        }
+
+_indice_ilha = None
+
+def _inicializa_ilha(indice):
+    """
+    Inicializador dos processos do modelo de ilhas: o índice é enviado uma única vez.
+    """
+    global _indice_ilha
+    _indice_ilha = indice
+
+def _evolui_ilha(params, semente, population, geracoes, num_migrantes):
+    """
+    Evolui uma ilha por `geracoes` gerações dentro de um processo do pool.
+    
+    Returns:
+        Tupla com (população final, emigrantes, melhor solução, melhor fitness, histórico)
+    """
+    ga = GeneticVertexCover(None, generations=geracoes, indice=_indice_ilha, semente=semente,
+                            verbose=False, **params)
+    ga.run(population)
+    
+    # Os melhores da população final são os emigrantes desta época
+    fitness = ga.fitness_populacao(ga.population)
+    emigrantes = [ga.population[i] for i in elites(np.asarray(fitness, dtype=np.float64), num_migrantes)]
+    
+    return ga.population, emigrantes, ga.best_solution, ga.best_fitness, ga.historico
+
+def semente_ilha(semente, ilha, epoca):
+    """
+    Semente determinística de uma ilha em uma época de migração.
+    """
+    return int(np.random.SeedSequence([semente, ilha, epoca]).generate_state(1)[0])
+
+def executar_ilhas(indice, num_ilhas=4, generations=200, intervalo_migracao=20, num_migrantes=5,
+                   semente=0, max_workers=None, **params):
+    """
+    Executa o modelo de ilhas: `num_ilhas` subpopulações evoluem em paralelo
+    em um ProcessPoolExecutor e, a cada `intervalo_migracao` gerações, os
+    `num_migrantes` melhores indivíduos de cada ilha substituem indivíduos
+    da ilha seguinte (topologia em anel).
+    
+    Args:
+        indice: Índice das vizinhanças fechadas
+        num_ilhas: Número de subpopulações
+        generations: Total de gerações de cada ilha
+        intervalo_migracao: Gerações entre duas migrações
+        num_migrantes: Indivíduos enviados por ilha em cada migração
+        semente: Semente base; cada ilha e época recebe uma semente derivada
+        max_workers: Número de processos (padrão: um por núcleo)
+        **params: Demais parâmetros de GeneticVertexCover
+        
+    Returns:
+        Resultado no formato de get_coverage, com o histórico de cada ilha
+    """
+    populations = [None] * num_ilhas
+    historicos = [[] for _ in range(num_ilhas)]
+    best_solution, best_fitness = None, float('-inf')
+    
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_inicializa_ilha,
+                             initargs=(indice,)) as executor:
+        epoca = 0
+        restantes = generations
+        while restantes > 0:
+            geracoes = min(intervalo_migracao, restantes)
+            futuros = [
+                executor.submit(_evolui_ilha, params, semente_ilha(semente, ilha, epoca),
+                                populations[ilha], geracoes, num_migrantes)
+                for ilha in range(num_ilhas)
+            ]
+            resultados = [futuro.result() for futuro in futuros]
+            
+            for ilha, (population, _, solucao, fitness, historico) in enumerate(resultados):
+                populations[ilha] = population
+                historicos[ilha].extend(historico)
+                if fitness > best_fitness:
+                    best_fitness, best_solution = fitness, solucao
+            
+            restantes -= geracoes
+            epoca += 1
+            
+            # Migração em anel: os emigrantes da ilha i ocupam o fim da população da ilha i+1
+            if restantes > 0 and num_ilhas > 1:
+                for ilha, (_, emigrantes, _, _, _) in enumerate(resultados):
+                    destino = populations[(ilha + 1) % num_ilhas]
+                    destino[len(destino) - len(emigrantes):] = [ind.copy() for ind in emigrantes]
+            
+            print(f"Época {epoca}: melhor fitness = {best_fitness} "
+                  f"({', '.join(str(h[-1]) for h in historicos)} por ilha)")
+    
+    ga = GeneticVertexCover(None, indice=indice, verbose=False, **params)
+    ga.best_solution, ga.best_fitness = best_solution, best_fitness
+    coverage = ga.get_coverage()
+    coverage['ilhas'] = [
+        {'ilha': ilha, 'melhor_fitness': max(historico), 'historico': historico}
+        for ilha, historico in enumerate(historicos)
+    ]
+    return coverage
+
+def varredura_genetica(indice, orcamentos, semente=None, fracao_aquecida=0.1, **params):
+    """
+    Varredura de orçamentos com o algoritmo genético: cada orçamento parte
+    da melhor solução do orçamento anterior (população aquecida) em vez de
+    uma população totalmente aleatória.
+    
+    Args:
+        indice: Índice das vizinhanças fechadas
+        orcamentos: Orçamentos em ordem (ex.: range(1, 61))
+        semente: Semente base; cada orçamento recebe uma semente derivada
+        fracao_aquecida: Fração da população derivada da solução anterior
+        **params: Demais parâmetros de GeneticVertexCover
+        
+    Returns:
+        Lista com orçamento, cobertura, câmeras (ids) e tempo de cada execução
+    """
+    params.setdefault('verbose', False)
+    resultados = []
+    anterior = None
+    for p in orcamentos:
+        inicio = time.perf_counter()
+        semente_p = semente_ilha(semente, 0, p) if semente is not None else None
+        ga = GeneticVertexCover(None, indice=indice, max_cameras=p, semente=semente_p, **params)
+        population = ga.populacao_aquecida(anterior, fracao_aquecida) if anterior is not None else None
+        ga.run(population)
+        anterior = ga.cameras(ga.best_solution)
+        resultados.append({
+            'max_cameras': p,
+            'total_cobertura': int(ga.best_fitness),
+            'vertices_selecionados': indice.ids(anterior),
+            'tempo': time.perf_counter() - inicio,
+            'motivo_parada': ga.motivo_parada,
+        })
+        print(f"p = {p}: {resultados[-1]['total_cobertura']} vértices cobertos "
+              f"({resultados[-1]['tempo']:.1f} s)")
+    return resultados
+
+def compara_semeadura(indice, configuracoes, sementes=(0, 1, 2), alvo=None, r=3, **params):
+    """
+    Compara a convergência de populações iniciais semeadas com a aleatória.
+    
+    Cada configuração roda com as mesmas sementes. O alvo padrão é a
+    melhor fitness obtida por qualquer execução; para cada execução são
+    registradas a fitness inicial e final e a primeira geração em que o
+    alvo (e 99% dele) foi atingido.
+    
+    Args:
+        indice: Índice das vizinhanças fechadas
+        configuracoes: Nome -> frações de populacao_semeada ({} é a inicialização aleatória)
+        sementes: Sementes de cada repetição
+        alvo: Fitness de referência (padrão: melhor obtida)
+        r: Candidatos considerados pelo guloso aleatorizado
+        **params: Demais parâmetros de GeneticVertexCover
+        
+    Returns:
+        Dict com o alvo, as execuções e um resumo por configuração
+    """
+    params.setdefault('verbose', False)
+    execucoes = {}
+    for nome, fracoes in configuracoes.items():
+        execucoes[nome] = []
+        for semente in sementes:
+            ga = GeneticVertexCover(None, indice=indice, semente=semente, **params)
+            inicio = time.perf_counter()
+            population = ga.populacao_semeada(fracoes, r) if fracoes else None
+            tempo_semeadura = time.perf_counter() - inicio
+            ga.run(population)
+            execucoes[nome].append({
+                'semente': semente,
+                'historico': [int(f) for f in ga.historico],
+                'tempo_semeadura': tempo_semeadura,
+                'tempo': time.perf_counter() - inicio,
+            })
+    
+    if alvo is None:
+        alvo = max(e['historico'][-1] for lista in execucoes.values() for e in lista)
+    
+    def primeira_geracao(historico, valor):
+        return next((g for g, f in enumerate(historico) if f >= valor), None)
+    
+    resumo = {}
+    for nome, lista in execucoes.items():
+        for e in lista:
+            e['geracao_alvo'] = primeira_geracao(e['historico'], alvo)
+            e['geracao_99'] = primeira_geracao(e['historico'], 0.99 * alvo)
+        atingiram = [e['geracao_alvo'] for e in lista if e['geracao_alvo'] is not None]
+        resumo[nome] = {
+            'fracoes': configuracoes[nome],
+            'fitness_inicial_media': float(np.mean([e['historico'][0] for e in lista])),
+            'fitness_final_media': float(np.mean([e['historico'][-1] for e in lista])),
+            'atingiram_alvo': len(atingiram),
+            'geracao_alvo_media': float(np.mean(atingiram)) if atingiram else None,
+            'tempo_medio': float(np.mean([e['tempo'] for e in lista])),
         }
+    return {'alvo': alvo, 'sementes': list(sementes), 'resumo': resumo, 'execucoes': execucoes}
 
 def main():
+    script_dir = Path(__file__).parent.parent  # Raiz do projeto
+    parser = argparse.ArgumentParser(description="Cobertura máxima com algoritmo genético")
+    parser.add_argument("--ilhas", type=int, default=0,
+                        help="Número de ilhas executadas em paralelo (0 para uma única população)")
+    parser.add_argument("--intervalo-migracao", type=int, default=20,
+                        help="Gerações entre migrações no modelo de ilhas")
+    parser.add_argument("--migrantes", type=int, default=5,
+                        help="Indivíduos enviados por ilha em cada migração")
+    parser.add_argument("--semente", type=int, default=None,
+                        help="Semente para execuções reproduzíveis")
+    parser.add_argument("--reducao", action="store_true",
+                        help="Remove candidatos dominados antes de executar o algoritmo genético")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Número de processos do modelo de ilhas (padrão: núcleos disponíveis)")
+    parser.add_argument("--max-cameras", type=int, default=40,
+                        help="Número máximo de câmeras")
+    parser.add_argument("--populacao", type=int, default=1000,
+                        help="Tamanho da população")
+    parser.add_argument("--geracoes", type=int, default=200,
+                        help="Número de gerações (por orçamento, na varredura)")
+    parser.add_argument("--varredura", type=int, default=None, metavar="P",
+                        help="Varre os orçamentos 1..P, aquecendo cada um com a solução do anterior")
+    parser.add_argument("--raio", type=float, default=None, metavar="R",
+                        help="Cada câmera cobre os vértices a até R metros pelas ruas (padrão: ela e os vizinhos)")
+    parser.add_argument("--semeadura", default=None, metavar="FRACOES",
+                        help="Semeia a população inicial, ex.: 'guloso=0.001,guloso_aleatorio=0.1,grau=0.2'")
+    parser.add_argument("--top-r", type=int, default=3,
+                        help="Candidatos sorteáveis em cada passo do guloso aleatorizado")
+    parser.add_argument("--compara-semeadura", action="store_true",
+                        help="Compara a convergência da semeadura (--semeadura) com a inicialização aleatória")
+    parser.add_argument("--codificacao", choices=["binaria", "indices"], default="binaria",
+                        help="Codificação dos indivíduos: vetor 0/1 de tamanho |V| ou as posições das câmeras")
+    parser.add_argument("--modo-fitness", choices=["vetorizado", "escalar"], default="vetorizado",
+                        help="Avaliação da geração inteira de uma vez ou indivíduo a indivíduo")
+    parser.add_argument("--selecao", choices=["topo", "torneio", "sus"], default="topo",
+                        help="Seleção dos pais: uniforme entre os melhores, torneio ou amostragem universal estocástica")
+    parser.add_argument("--tamanho-selecao", type=int, default=None,
+                        help="Tamanho do topo (padrão 50) ou do torneio (padrão 2)")
+    parser.add_argument("--paciencia", type=int, default=None, metavar="N",
+                        help="Para após N gerações sem melhora")
+    parser.add_argument("--tempo-limite", type=float, default=None, metavar="S",
+                        help="Para após S segundos e devolve a melhor solução até então")
+    parser.add_argument("--max-avaliacoes", type=int, default=None, metavar="N",
+                        help="Para após N avaliações de fitness")
+    parser.add_argument("--parar-no-limite", action="store_true",
+                        help="Para ao atingir o limite superior de cobertura (solução ótima)")
+    parser.add_argument("--cache-fitness", type=int, default=100_000, metavar="N",
+                        help="Capacidade do cache LRU de fitness (0 desativa)")
+    parser.add_argument("--metricas", type=Path, default=None, metavar="ARQUIVO",
+                        help="Grava as métricas por geração (tempos por fase, fitness, diversidade) em .json ou .csv")
+    parser.add_argument("--memoria", action="store_true",
+                        help="Inclui nas métricas a memória alocada (tracemalloc) em cada geração")
+    parser.add_argument("--perfil", type=Path, default=None, metavar="ARQUIVO",
+                        help="Executa sob o cProfile e grava as estatísticas (pstats) neste arquivo")
+    parser.add_argument("--instancia", type=Path, default=script_dir / "instancias" / "ondina.bin",
+                        help="Arquivo da instância, .bin, .json ou .jsonl (padrão: instancias/ondina.bin)")
+    args = parser.parse_args()
+    
     # Carregar o grafo
-    script_dir = Path(__file__).parent.parent
-    json_path = script_dir / "instancias" / "ondina.json"
+    json_path = args.instancia
     resultados_dir = script_dir / "resultados"
     
     print("Carregando grafo...")
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    G = nx.Graph()
-    for node in data['nodes']:
-        G.add_node(node['id'])
-    for edge in data['edges']:
-        G.add_edge(edge['source'], edge['target'])
+    instancia = carrega_instancia(json_path)
+    G = instancia.grafo
     
     print(f"Grafo carregado: {len(G.nodes())} vértices, {len(G.edges())} arestas")
+    indice = instancia.indice
+    sufixo = ""
+    if args.raio is not None:
+        indice = instancia.indice_raio(args.raio)
+        sufixo = f"_raio{args.raio:g}"
+        print(f"Cobertura por raio de {args.raio:g} m: {indice.graus().mean():.1f} vértices por câmera, em média")
+    
+    candidatos = None
+    if args.reducao:
+        reducao = ReducaoInstancia(indice, 'maxima').reduz()
+        candidatos = sorted(reducao.candidatos)
+        print(f"Redução: {reducao.estatisticas['candidatos_iniciais']} -> "
+              f"{reducao.estatisticas['candidatos_finais']} candidatos")
+    
+    fracoes = le_fracoes(args.semeadura) if args.semeadura else None
+    if args.compara_semeadura:
+        fracoes = fracoes or {'guloso': 0.001, 'guloso_aleatorio': 0.1, 'grau': 0.2}
+        base = args.semente if args.semente is not None else 0
+        print(f"\nComparando semeadura {fracoes} com a inicialização aleatória...")
+        comparacao = compara_semeadura(indice, {'aleatoria': {}, 'semeada': fracoes},
+                                       sementes=range(base, base + 3), r=args.top_r,
+                                       population_size=args.populacao, generations=args.geracoes,
+                                       max_cameras=args.max_cameras, candidatos=candidatos,
+                                       codificacao=args.codificacao, modo_fitness=args.modo_fitness,
+                                       tamanho_cache=args.cache_fitness,
+                                       selecao=args.selecao, tamanho_selecao=args.tamanho_selecao)
+        for nome, resumo in comparacao['resumo'].items():
+            geracao = resumo['geracao_alvo_media']
+            print(f"{nome}: fitness inicial {resumo['fitness_inicial_media']:.1f}, final "
+                  f"{resumo['fitness_final_media']:.1f}; alvo {comparacao['alvo']} atingido em "
+                  f"{resumo['atingiram_alvo']}/3 execuções"
+                  + (f", na geração {geracao:.1f} em média" if geracao is not None else ""))
+        os.makedirs(resultados_dir, exist_ok=True)
+        output_path = resultados_dir / f"convergencia_semeadura{sufixo}.json"
+        with open(output_path, 'w') as f:
+            json.dump(comparacao, f, indent=2)
+        print(f"\nComparação salva em {output_path}")
+        return
+    
+    if args.varredura:
+        # Curva cobertura x orçamento em um único arquivo
+        print(f"\nVarredura de orçamentos 1..{args.varredura}...")
+        curva = varredura_genetica(indice, range(1, args.varredura + 1), semente=args.semente,
+                                   population_size=args.populacao, generations=args.geracoes,
+                                   candidatos=candidatos, paciencia=args.paciencia,
+                                   codificacao=args.codificacao, modo_fitness=args.modo_fitness,
+                                   tamanho_cache=args.cache_fitness,
+                                   selecao=args.selecao, tamanho_selecao=args.tamanho_selecao)
+        os.makedirs(resultados_dir, exist_ok=True)
+        output_path = resultados_dir / f"varredura_genetica{sufixo}.json"
+        with open(output_path, 'w') as f:
+            json.dump({'total_vertices': indice.n, 'varredura': curva}, f, indent=2)
+        print(f"\nVarredura salva em {output_path}")
+        return
     
     # Executar o algoritmo genético
     print("\nExecutando algoritmo genético...")
-    ga = GeneticVertexCover(G)
-    solution = ga.run()
-    coverage = ga.get_coverage()
+    if args.ilhas > 0:
+        if args.metricas or args.memoria or args.perfil or args.paciencia or args.tempo_limite or args.max_avaliacoes:
+            logger.warning("--metricas, --memoria, --perfil e os critérios de parada valem só "
+                           "para uma única população; ignorados")
+        coverage = executar_ilhas(
+            indice,
+            num_ilhas=args.ilhas,
+            intervalo_migracao=args.intervalo_migracao,
+            num_migrantes=args.migrantes,
+            semente=args.semente if args.semente is not None else 0,
+            max_workers=args.workers,
+            generations=args.geracoes,
+            candidatos=candidatos,
+            max_cameras=args.max_cameras,
+            population_size=args.populacao,
+            codificacao=args.codificacao,
+            modo_fitness=args.modo_fitness,
+            tamanho_cache=args.cache_fitness,
+            selecao=args.selecao,
+            tamanho_selecao=args.tamanho_selecao,
+        )
+    else:
+        callbacks = []
+        if args.metricas or args.memoria:
+            metricas = MetricasGeracao(memoria=args.memoria)
+            callbacks.append(metricas)
+        if args.perfil:
+            callbacks.append(PerfilCProfile(args.perfil))
+        
+        ga = GeneticVertexCover(G, indice=indice, semente=args.semente, candidatos=candidatos,
+                                max_cameras=args.max_cameras, population_size=args.populacao,
+                                generations=args.geracoes, tamanho_cache=args.cache_fitness,
+                                codificacao=args.codificacao, modo_fitness=args.modo_fitness,
+                                paciencia=args.paciencia, tempo_limite=args.tempo_limite,
+                                max_avaliacoes=args.max_avaliacoes, selecao=args.selecao,
+                                tamanho_selecao=args.tamanho_selecao)
+        if args.parar_no_limite:
+            ga.fitness_alvo = ga.limite_superior()
+            print(f"Limite superior de cobertura: {ga.fitness_alvo}")
+        population = ga.populacao_semeada(fracoes, args.top_r) if fracoes else None
+        solution = ga.run(population, callbacks=callbacks)
+        coverage = ga.get_coverage()
+        print(f"Parada: {ga.motivo_parada} após {ga.geracoes_executadas} gerações")
+        if ga.cache is not None:
+            estatisticas = ga.cache.estatisticas()
+            print(f"Cache de fitness: {100 * estatisticas['taxa_acertos']:.1f}% de acertos "
+                  f"({estatisticas['acertos']} de {estatisticas['acertos'] + estatisticas['falhas']} consultas, "
+                  f"{estatisticas['remocoes']} descartes)")
+        
+        if args.metricas or args.memoria:
+            resumo = metricas.resumo()
+            print(f"Tempo por fase: " + ", ".join(
+                f"{fase} {resumo[f'tempo_{fase}']:.2f} s ({100 * resumo[f'fracao_{fase}']:.0f}%)"
+                for fase in ("avaliacao", "selecao", "crossover", "mutacao")))
+            print(f"Avaliações: {resumo['avaliacoes']}")
+            if args.metricas:
+                print(f"Métricas por geração salvas em {metricas.salva(args.metricas)}")
     
     # Salvar resultados
     os.makedirs(resultados_dir, exist_ok=True)
-    output_path = resultados_dir / "ga_cobertura_ondina.json"
+    output_path = resultados_dir / f"ga_cobertura_ondina{sufixo}.json"
     
     with open(output_path, 'w') as f:
         json.dump(coverage, f, indent=2)
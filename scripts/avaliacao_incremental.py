@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import Iterable, Optional
+
+import numpy as np
+
+from indice_vizinhanca import IndiceVizinhanca
+
+
+class AvaliadorIncremental:
+    def __init__(self, indice: IndiceVizinhanca, cameras: Iterable[int] = (), demanda: Optional[np.ndarray] = None):
+        """
+        Avaliação incremental da cobertura de um conjunto de câmeras.
+
+        Guarda, para cada vértice, quantas câmeras o enxergam. Com esses
+        contadores, adicionar, remover ou trocar uma câmera atualiza o número
+        de vértices cobertos em O(deg(u) + deg(v)), sem recalcular a cobertura
+        do conjunto inteiro.
+
+        Args:
+            indice: Índice das vizinhanças fechadas
+            cameras: Posições das câmeras iniciais
+            demanda: Máscara dos vértices que contam na cobertura (padrão: todos)
+        """
+        self.indice = indice
+        self.demanda = demanda if demanda is not None else np.ones(indice.n, dtype=bool)
+        self.contagem = np.zeros(indice.n, dtype=np.int32)
+        self.cameras = set()
+        self.cobertos = 0
+        for v in dict.fromkeys(int(v) for v in cameras):
+            self.adicionar(v)
+
+    def copy(self) -> "AvaliadorIncremental":
+        """
+        Cópia independente dos contadores e do conjunto de câmeras.
+        """
+        novo = AvaliadorIncremental.__new__(AvaliadorIncremental)
+        novo.indice = self.indice
+        novo.demanda = self.demanda
+        novo.contagem = self.contagem.copy()
+        novo.cameras = set(self.cameras)
+        novo.cobertos = self.cobertos
+        return novo
+
+    def ganho_adicao(self, v: int) -> int:
+        """
+        Vértices de demanda que passariam a ser cobertos ao instalar uma câmera em v.
+        """
+        viz = self.indice.vizinhanca(v)
+        return int(np.count_nonzero((self.contagem[viz] == 0) & self.demanda[viz]))
+
+    def perda_remocao(self, u: int) -> int:
+        """
+        Vértices de demanda que deixariam de ser cobertos ao retirar a câmera de u.
+        """
+        viz = self.indice.vizinhanca(u)
+        return int(np.count_nonzero((self.contagem[viz] == 1) & self.demanda[viz]))
+
+    def delta_troca(self, u: int, v: int) -> int:
+        """
+        Variação da cobertura ao mover a câmera de u para v.
+        """
+        viz_u = self.indice.vizinhanca(u)
+        viz_v = self.indice.vizinhanca(v)
+        # Vértices vistos só por u e também por v continuam cobertos após a troca
+        comuns = np.intersect1d(viz_u, viz_v, assume_unique=True)
+        ganho = (self.ganho_adicao(v)
+                 + int(np.count_nonzero((self.contagem[comuns] == 1) & self.demanda[comuns])))
+        return ganho - self.perda_remocao(u)
+
+    def adicionar(self, v: int):
+        """
+        Instala uma câmera em v.
+        """
+        if v in self.cameras:
+            raise ValueError(f"Já existe câmera em {v}")
+        self.cobertos += self.ganho_adicao(v)
+        self.contagem[self.indice.vizinhanca(v)] += 1
+        self.cameras.add(v)
+
+    def remover(self, u: int):
+        """
+        Retira a câmera de u.
+        """
+        if u not in self.cameras:
+            raise ValueError(f"Não há câmera em {u}")
+        self.cobertos -= self.perda_remocao(u)
+        self.contagem[self.indice.vizinhanca(u)] -= 1
+        self.cameras.remove(u)
+
+    def trocar(self, u: int, v: int):
+        """
+        Move a câmera de u para v.
+        """
+        self.remover(u)
+        self.adicionar(v)
+
+    def mascara_cobertura(self) -> np.ndarray:
+        """
+        Máscara dos vértices vistos por pelo menos uma câmera.
+        """
+        return self.contagem > 0
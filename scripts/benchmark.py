@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import gc
+import importlib
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import networkx as nx
+import numpy as np
+import scipy
+
+from carregador import carrega_instancia
+from indice_vizinhanca import IndiceVizinhanca
+
+logger = logging.getLogger(__name__)
+
+RAIZ = Path(__file__).parent.parent
+BASELINE_PADRAO = RAIZ / "benchmarks" / "baseline.json"
+
+# Configuração fixa: mudar qualquer valor exige salvar um novo baseline
+CONFIGURACAO = {
+    "fracao_orcamento": 40 / 182,  # mesma proporção câmeras/vértices da instância de Ondina
+    "genetico": {"population_size": 100, "generations": 20, "codificacao": "indices", "semente": 0},
+    "repeticoes": 3,
+}
+TOLERANCIA_TEMPO = 0.5    # até 50% mais lento que o baseline
+TOLERANCIA_MEMORIA = 0.2  # até 20% mais memória que o baseline
+FOLGA_TEMPO = 0.05        # segundos; abaixo disso a diferença é ruído de medição
+
+
+def grade_perturbada(n: int, semente: int = 0) -> Tuple[nx.Graph, np.ndarray]:
+    """
+    Malha parecida com a de ruas: grade de lado ≈ √n com coordenadas
+    perturbadas, 10% das quadras sem uma das ruas e algumas diagonais.
+
+    Returns:
+        Tupla (grafo com nós 0..n-1, coordenadas n×2)
+    """
+    rng = np.random.default_rng(semente)
+    lado = int(round(np.sqrt(n)))
+    G = nx.convert_node_labels_to_integers(nx.grid_2d_graph(lado, lado), ordering="sorted")
+    arestas = list(G.edges())
+    remover = rng.choice(len(arestas), size=len(arestas) // 10, replace=False)
+    G.remove_edges_from(arestas[k] for k in remover.tolist())
+    for v in rng.choice(lado * (lado - 1), size=lado * lado // 50, replace=False).tolist():
+        if (v + 1) % lado:
+            G.add_edge(v, v + lado + 1)
+    linhas, colunas = np.divmod(np.arange(lado * lado), lado)
+    coordenadas = np.column_stack([colunas, linhas]) + rng.uniform(-0.3, 0.3, size=(lado * lado, 2))
+    return G, coordenadas
+
+
+def geometrico(n: int, semente: int = 0) -> Tuple[nx.Graph, np.ndarray]:
+    """
+    Grafo geométrico aleatório no quadrado unitário com grau médio ≈ 3,
+    próximo do grau das interseções de uma malha viária.
+    """
+    raio = np.sqrt(3 / (np.pi * n))
+    G = nx.random_geometric_graph(n, raio, seed=semente)
+    coordenadas = np.array([G.nodes[v]["pos"] for v in range(n)])
+    return G, coordenadas
+
+
+GERADORES: Dict[str, Callable] = {"grade": grade_perturbada, "geometrico": geometrico}
+
+
+def _mede(funcao: Callable, repeticoes: int):
+    """
+    Melhor tempo de `repeticoes` execuções e pico de memória (tracemalloc)
+    de uma execução extra, para que o rastreamento não distorça o tempo.
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        gc.collect()
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    gc.collect()
+    tracemalloc.start()
+    funcao()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, min(tempos), pico
+
+
+def mede_instancia(grafo: nx.Graph, indice: IndiceVizinhanca, repeticoes: int) -> Dict:
+    """
+    Mede cobertura completa, cobertura máxima e o algoritmo genético em uma instância.
+    """
+    cobertura = importlib.import_module("5_resolve_cobertura")
+    genetico = importlib.import_module("7_resolve_cobertura_genetico")
+    p = max(1, round(indice.n * CONFIGURACAO["fracao_orcamento"]))
+    resultado = {"vertices": indice.n, "arestas": grafo.number_of_edges(), "max_cameras": p}
+
+    solver = cobertura.CoberturaVertices(grafo, indice)
+    completa, tempo, pico = _mede(solver.resolve_cobertura_completa, repeticoes)
+    resultado["completa"] = {"tempo": tempo, "memoria_pico": pico, "cameras": len(completa)}
+
+    (_, cobertos), tempo, pico = _mede(lambda: solver.resolve_cobertura_maxima(p), repeticoes)
+    resultado["maxima"] = {"tempo": tempo, "memoria_pico": pico, "cobertura": len(cobertos)}
+
+    params = dict(CONFIGURACAO["genetico"])
+    semente = params.pop("semente")
+
+    def executa_genetico():
+        ga = genetico.GeneticVertexCover(None, indice=indice, max_cameras=p, semente=semente,
+                                         verbose=False, **params)
+        ga.run()
+        return ga.best_fitness
+
+    fitness, tempo, pico = _mede(executa_genetico, repeticoes)
+    resultado["genetico"] = {"tempo": tempo, "memoria_pico": pico, "cobertura": int(fitness)}
+    return resultado
+
+
+def executa_benchmark(tamanhos: List[int], repeticoes: int) -> Dict:
+    """
+    Executa a suíte: a instância de Ondina e os grafos sintéticos de cada tamanho.
+    """
+    resultados = {}
+    instancia = carrega_instancia()
+    resultados["ondina"] = mede_instancia(instancia.grafo, instancia.indice, repeticoes)
+    logger.info(f"ondina: {resultados['ondina']}")
+
+    for nome, gerador in GERADORES.items():
+        for n in tamanhos:
+            grafo, _ = gerador(n)
+            indice = IndiceVizinhanca.de_grafo(grafo)
+            chave = f"{nome}_{n}"
+            resultados[chave] = mede_instancia(grafo, indice, repeticoes)
+            logger.info(f"{chave}: {resultados[chave]}")
+
+    return {
+        "maquina": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "scipy": scipy.__version__,
+            "networkx": nx.__version__,
+            "plataforma": platform.platform(),
+            "processador": platform.processor() or platform.machine(),
+        },
+        "configuracao": {**CONFIGURACAO, "tamanhos": tamanhos},
+        "resultados": resultados,
+    }
+
+
+def compara(atual: Dict, baseline: Dict, tolerancia_tempo: float = TOLERANCIA_TEMPO,
+            tolerancia_memoria: float = TOLERANCIA_MEMORIA) -> List[str]:
+    """
+    Compara com o baseline. Qualidade não pode piorar (os solvers e os
+    geradores são determinísticos); tempo e memória podem variar dentro
+    das tolerâncias.
+
+    Returns:
+        List[str]: Regressões encontradas (vazia se tudo estiver dentro do baseline)
+    """
+    regressoes = []
+    configuracao = {k: v for k, v in atual["configuracao"].items() if k != "tamanhos"}
+    if configuracao != {k: v for k, v in baseline["configuracao"].items() if k != "tamanhos"}:
+        regressoes.append("configuração diferente da do baseline; salve um novo baseline")
+        return regressoes
+
+    # Só as instâncias medidas nesta execução (ex.: --tamanhos 1000 compara um subconjunto)
+    for chave, medido in atual["resultados"].items():
+        base = baseline["resultados"].get(chave)
+        if base is None:
+            logger.warning(f"{chave}: ausente no baseline, sem comparação")
+            continue
+        for etapa in ("completa", "maxima", "genetico"):
+            b, m = base[etapa], medido[etapa]
+            if "cameras" in b and m["cameras"] > b["cameras"]:
+                regressoes.append(f"{chave}/{etapa}: {m['cameras']} câmeras (baseline {b['cameras']})")
+            if "cobertura" in b and m["cobertura"] < b["cobertura"]:
+                regressoes.append(f"{chave}/{etapa}: cobertura {m['cobertura']} (baseline {b['cobertura']})")
+            if m["tempo"] > b["tempo"] * (1 + tolerancia_tempo) + FOLGA_TEMPO:
+                regressoes.append(f"{chave}/{etapa}: {m['tempo']:.3f} s (baseline {b['tempo']:.3f} s)")
+            if m["memoria_pico"] > b["memoria_pico"] * (1 + tolerancia_memoria):
+                regressoes.append(f"{chave}/{etapa}: pico de {m['memoria_pico'] / 2**20:.1f} MiB "
+                                  f"(baseline {b['memoria_pico'] / 2**20:.1f} MiB)")
+    return regressoes
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Benchmark dos solvers de cobertura em Ondina e em grafos sintéticos")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Número de vértices dos grafos sintéticos")
+    parser.add_argument("--repeticoes", type=int, default=CONFIGURACAO["repeticoes"],
+                        help="Execuções por medida de tempo (vale o melhor tempo)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PADRAO)
+    parser.add_argument("--salvar-baseline", action="store_true",
+                        help="Grava o resultado como novo baseline em vez de comparar")
+    parser.add_argument("--saida", type=Path, default=None,
+                        help="Também grava o resultado desta execução neste arquivo")
+    parser.add_argument("--tolerancia-tempo", type=float, default=TOLERANCIA_TEMPO)
+    parser.add_argument("--tolerancia-memoria", type=float, default=TOLERANCIA_MEMORIA)
+    args = parser.parse_args()
+
+    CONFIGURACAO["repeticoes"] = args.repeticoes
+    atual = executa_benchmark(args.tamanhos, args.repeticoes)
+    if args.saida:
+        with open(args.saida, "w") as f:
+            json.dump(atual, f, indent=2)
+
+    if args.salvar_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(atual, f, indent=2)
+        logger.info(f"Baseline salvo em {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        logger.error(f"Baseline {args.baseline} não encontrado; rode com --salvar-baseline")
+        sys.exit(2)
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if atual["maquina"] != baseline["maquina"]:
+        logger.warning("Baseline gravado em outra máquina/versão: os tempos podem não ser comparáveis")
+
+    regressoes = compara(atual, baseline, args.tolerancia_tempo, args.tolerancia_memoria)
+    if regressoes:
+        for regressao in regressoes:
+            logger.error(f"REGRESSÃO: {regressao}")
+        sys.exit(1)
+    logger.info("Sem regressões em relação ao baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from avaliacao_incremental import AvaliadorIncremental
+from carregador import carrega_instancia
+from indice_vizinhanca import IndiceVizinhanca
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class BuscaLocal:
+    def __init__(self, indice: IndiceVizinhanca, demanda: Optional[np.ndarray] = None):
+        """
+        Refinamento por busca local de um conjunto de câmeras de tamanho fixo.
+
+        Os movimentos são trocas de uma câmera (1-swap) e, quando não há
+        troca simples que melhore, trocas de duas câmeras (2-swap). O ganho
+        de cada movimento vem dos contadores do AvaliadorIncremental, então
+        nenhuma cobertura é recalculada do zero.
+
+        Args:
+            indice: Índice das vizinhanças fechadas
+            demanda: Máscara dos vértices que contam na cobertura (padrão: todos)
+        """
+        self.indice = indice
+        self.demanda = demanda if demanda is not None else np.ones(indice.n, dtype=bool)
+        # Linha i: câmeras que cobrem o vértice i
+        self.cobre = indice.matriz_csr().T.tocsr()
+        self.matriz = indice.matriz_csr()
+        self.estatisticas = {}
+
+    def _candidatos(self, avaliador: AvaliadorIncremental) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Candidatos que cobrem algum vértice descoberto e seus ganhos de adição.
+
+        Uma troca só pode melhorar a cobertura se a nova câmera enxergar um
+        vértice hoje descoberto, então os demais vértices são ignorados.
+        """
+        descobertos = self.demanda & (avaliador.contagem == 0)
+        linhas = self.cobre[np.flatnonzero(descobertos)]
+        candidatos = np.unique(linhas.indices)
+        if avaliador.cameras:
+            candidatos = candidatos[~np.isin(candidatos, list(avaliador.cameras))]
+        ganhos = self.matriz[candidatos] @ descobertos.astype(np.int32)
+        return candidatos, np.asarray(ganhos).ravel()
+
+    def _melhor_troca(self, avaliador: AvaliadorIncremental, tabu: Dict[int, int],
+                      iteracao: int, melhor_cobertura: int) -> Optional[Tuple[int, int, int]]:
+        """
+        Melhor troca (u sai, v entra) permitida pela lista tabu.
+
+        Returns:
+            Tupla (delta, u, v) ou None se não houver candidatos
+        """
+        candidatos, ganhos = self._candidatos(avaliador)
+        if len(candidatos) == 0:
+            return None
+        ganho_de = dict(zip(candidatos.tolist(), ganhos.tolist()))
+        ordem = np.argsort(-ganhos, kind='stable').tolist()
+        unicos = self.demanda & (avaliador.contagem == 1)
+
+        melhor = None
+        for u in sorted(avaliador.cameras):
+            perda = avaliador.perda_remocao(u)
+            # Vértices vistos só por u que o novo candidato também veria
+            extras = {}
+            for w in self.indice.vizinhanca(u):
+                if unicos[w]:
+                    for v in self.cobre.indices[self.cobre.indptr[w]:self.cobre.indptr[w + 1]].tolist():
+                        if v in ganho_de:
+                            extras[v] = extras.get(v, 0) + 1
+
+            opcoes = [(ganho_de[v] + extra, v) for v, extra in extras.items()]
+            # Sem correção, basta percorrer os candidatos em ordem de ganho até o
+            # primeiro fora da lista tabu; os anteriores só valem por aspiração
+            for i in ordem:
+                v = int(candidatos[i])
+                if v in extras:
+                    continue
+                opcoes.append((ganho_de[v], v))
+                if tabu.get(v, -1) < iteracao:
+                    break
+
+            for ganho, v in opcoes:
+                delta = ganho - perda
+                # Critério de aspiração: um movimento tabu é aceito se gerar um novo melhor
+                proibido = tabu.get(v, -1) >= iteracao or tabu.get(u, -1) >= iteracao
+                if proibido and avaliador.cobertos + delta <= melhor_cobertura:
+                    continue
+                if melhor is None or delta > melhor[0]:
+                    melhor = (delta, u, v)
+        return melhor
+
+    def _melhor_troca_dupla(self, avaliador: AvaliadorIncremental, prazo: float) -> bool:
+        """
+        Tenta retirar duas câmeras e reinstalar duas de forma gulosa.
+        Aplica a primeira troca dupla que melhora a cobertura.
+
+        Returns:
+            bool: True se alguma troca dupla foi aplicada
+        """
+        cameras = sorted(avaliador.cameras, key=avaliador.perda_remocao)
+        antes = avaliador.cobertos
+        for i, u1 in enumerate(cameras):
+            for u2 in cameras[i + 1:]:
+                if time.perf_counter() > prazo:
+                    return False
+                avaliador.remover(u1)
+                avaliador.remover(u2)
+                novas = []
+                for _ in range(2):
+                    candidatos, ganhos = self._candidatos(avaliador)
+                    mantidos = ~np.isin(candidatos, [u1, u2])
+                    candidatos, ganhos = candidatos[mantidos], ganhos[mantidos]
+                    if len(candidatos) == 0:
+                        break
+                    v = int(candidatos[int(np.argmax(ganhos))])
+                    avaliador.adicionar(v)
+                    novas.append(v)
+                if len(novas) == 2 and avaliador.cobertos > antes:
+                    return True
+                for v in novas:
+                    avaliador.remover(v)
+                avaliador.adicionar(u1)
+                avaliador.adicionar(u2)
+        return False
+
+    def refina(self, cameras: Iterable[int], tempo_limite: Optional[float] = 1.0, tabu: int = 0,
+               max_iteracoes: int = 10000, troca_dupla: bool = True, paciencia: int = 100) -> List[int]:
+        """
+        Refina um conjunto de câmeras mantendo o número de câmeras.
+
+        Args:
+            cameras: Posições das câmeras da solução inicial
+            tempo_limite: Tempo máximo em segundos (None para sem limite)
+            tabu: Número de iterações em que um vértice movido fica proibido
+                  de voltar (0 desativa a lista tabu e faz subida de encosta pura).
+                  Com a lista tabu, a melhor troca permitida é aplicada mesmo que piore.
+            max_iteracoes: Número máximo de trocas simples
+            troca_dupla: Se True, tenta trocas de duas câmeras nos ótimos locais
+            paciencia: Iterações sem melhorar a melhor solução antes de parar a busca tabu
+
+        Returns:
+            List[int]: Posições da melhor solução encontrada
+        """
+        inicio = time.perf_counter()
+        prazo = inicio + tempo_limite if tempo_limite is not None else float('inf')
+        avaliador = AvaliadorIncremental(self.indice, cameras, self.demanda)
+        melhor_cobertura = avaliador.cobertos
+        melhor_solucao = set(avaliador.cameras)
+        self.estatisticas = {
+            "cobertura_inicial": avaliador.cobertos,
+            "trocas": 0,
+            "trocas_duplas": 0,
+            "iteracoes": 0,
+        }
+
+        lista_tabu = {}
+        ultima_melhora = 0
+        for iteracao in range(max_iteracoes):
+            if time.perf_counter() > prazo or iteracao - ultima_melhora > paciencia:
+                break
+            self.estatisticas["iteracoes"] += 1
+            movimento = self._melhor_troca(avaliador, lista_tabu, iteracao, melhor_cobertura)
+
+            if movimento is not None and (movimento[0] > 0 or tabu > 0):
+                delta, u, v = movimento
+                avaliador.trocar(u, v)
+                self.estatisticas["trocas"] += 1
+                if tabu > 0:
+                    lista_tabu[u] = iteracao + tabu
+                    lista_tabu[v] = iteracao + tabu
+            elif troca_dupla and self._melhor_troca_dupla(avaliador, prazo):
+                self.estatisticas["trocas_duplas"] += 1
+            else:
+                break
+
+            if avaliador.cobertos > melhor_cobertura:
+                ultima_melhora = iteracao
+                melhor_cobertura = avaliador.cobertos
+                melhor_solucao = set(avaliador.cameras)
+
+        self.estatisticas["cobertura_final"] = melhor_cobertura
+        self.estatisticas["tempo"] = time.perf_counter() - inicio
+        return sorted(melhor_solucao)
+
+
+def refina_arquivo(entrada: Path, saida: Path, indice: IndiceVizinhanca, **parametros) -> Dict:
+    """
+    Aplica a busca local a um arquivo de resultado (guloso ou genético)
+    e salva o resultado refinado no mesmo formato.
+    """
+    with open(entrada, 'r') as f:
+        resultado = json.load(f)
+
+    busca = BuscaLocal(indice)
+    cameras = busca.refina(indice.posicoes(resultado['vertices_selecionados']), **parametros)
+    vertices_cobertos = np.flatnonzero(indice.mascara_cobertura(cameras))
+
+    resultado['vertices_selecionados'] = indice.ids(cameras)
+    resultado['vertices_cobertos'] = indice.ids(vertices_cobertos)
+    resultado['total_cobertura'] = len(vertices_cobertos)
+    resultado['busca_local'] = busca.estatisticas
+
+    with open(saida, 'w') as f:
+        json.dump(resultado, f, indent=2)
+
+    logger.info(f"{entrada.name}: {busca.estatisticas['cobertura_inicial']} -> "
+                f"{busca.estatisticas['cobertura_final']} vértices cobertos em "
+                f"{busca.estatisticas['tempo'] * 1000:.1f} ms "
+                f"({busca.estatisticas['trocas']} trocas, {busca.estatisticas['trocas_duplas']} trocas duplas)")
+    return resultado
+
+
+def main():
+    script_dir = Path(__file__).parent.parent
+    parser = argparse.ArgumentParser(description="Refinamento por busca local de soluções de cobertura máxima")
+    parser.add_argument("entradas", nargs="*", type=Path,
+                        default=[script_dir / "resultados" / "cobertura_maxima.json",
+                                 script_dir / "resultados" / "ga_cobertura_ondina.json"],
+                        help="Arquivos de resultado a refinar")
+    parser.add_argument("--instancia", type=Path, default=script_dir / "instancias" / "ondina.bin")
+    parser.add_argument("--tempo", type=float, default=1.0, help="Tempo máximo por arquivo, em segundos")
+    parser.add_argument("--tabu", type=int, default=0, help="Duração da lista tabu (0 desativa)")
+    parser.add_argument("--sem-troca-dupla", action="store_true", help="Desativa as trocas de duas câmeras")
+    args = parser.parse_args()
+
+    indice = carrega_instancia(args.instancia).indice
+    for entrada in args.entradas:
+        saida = entrada.with_name(f"{entrada.stem}_busca_local.json")
+        refina_arquivo(entrada, saida, indice, tempo_limite=args.tempo, tabu=args.tabu,
+                       troca_dupla=not args.sem_troca_dupla)
+
+
+if __name__ == "__main__":
+    main()
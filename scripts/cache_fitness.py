@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+
+def digest(dados: bytes) -> bytes:
+    """
+    Chave compacta (16 bytes) de um conjunto de câmeras serializado, seja o
+    array ordenado de posições ou o bitset empacotado.
+    """
+    return hashlib.blake2b(dados, digest_size=16).digest()
+
+
+class CacheFitness:
+    def __init__(self, capacidade: int = 100_000):
+        """
+        Cache LRU de fitness indexado pelo conjunto de câmeras.
+
+        Guarda até `capacidade` valores; ao passar disso, descarta o usado
+        há mais tempo. Conta acertos e falhas para a taxa de acerto.
+
+        Args:
+            capacidade: Número máximo de conjuntos guardados
+        """
+        self.capacidade = capacidade
+        self._valores: "OrderedDict[Hashable, float]" = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+
+    def __len__(self) -> int:
+        return len(self._valores)
+
+    def busca_lote(self, chaves: Sequence[Hashable]) -> Tuple[List, Dict[Hashable, List[int]]]:
+        """
+        Procura a fitness de uma geração inteira.
+
+        Repetições de uma mesma chave dentro do lote contam como acerto:
+        só a primeira ocorrência de cada conjunto ausente precisa ser avaliada.
+
+        Returns:
+            Tupla (valores, com None onde falta; chaves ausentes -> posições no lote)
+        """
+        valores = [None] * len(chaves)
+        pendentes: Dict[Hashable, List[int]] = {}
+        for i, chave in enumerate(chaves):
+            if chave in pendentes:
+                pendentes[chave].append(i)
+                self.acertos += 1
+                continue
+            valor = self._valores.get(chave)
+            if valor is None:
+                pendentes[chave] = [i]
+                self.falhas += 1
+            else:
+                self._valores.move_to_end(chave)
+                valores[i] = valor
+                self.acertos += 1
+        return valores, pendentes
+
+    def guarda(self, chave: Hashable, valor: float) -> None:
+        self._valores[chave] = valor
+        self._valores.move_to_end(chave)
+        if len(self._valores) > self.capacidade:
+            self._valores.popitem(last=False)
+            self.remocoes += 1
+
+    @property
+    def taxa_acertos(self) -> float:
+        consultas = self.acertos + self.falhas
+        return self.acertos / consultas if consultas else 0.0
+
+    def estatisticas(self) -> Dict:
+        return {
+            "capacidade": self.capacidade,
+            "tamanho": len(self._valores),
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "remocoes": self.remocoes,
+            "taxa_acertos": self.taxa_acertos,
+        }
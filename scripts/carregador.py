@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+import networkx as nx
+import numpy as np
+
+from indice_vizinhanca import IndiceVizinhanca
+
+logger = logging.getLogger(__name__)
+
+RAIZ = Path(__file__).parent.parent
+INSTANCIA_PADRAO = RAIZ / "instancias" / "ondina.bin"
+DIRETORIO_CACHE = RAIZ / "instancias" / ".cache"
+# Incrementar quando o conteúdo guardado no cache mudar de formato
+VERSAO_CACHE = 1
+
+
+def hash_arquivo(caminho) -> str:
+    """
+    SHA-256 do conteúdo do arquivo da instância.
+    """
+    h = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def arquivo_vertex_cover(caminho) -> Path:
+    """
+    Arquivo opcional com a cobertura de vértices da instância, gerado em uma
+    etapa separada do 2_gera_instancia.py (ex.: ondina.vertex_cover.json).
+    """
+    caminho = Path(caminho)
+    return caminho.with_name(f"{caminho.stem}.vertex_cover.json")
+
+
+def grafo_de_dados(data: Dict) -> nx.Graph:
+    """
+    Monta o grafo do NetworkX a partir da instância no formato do ondina.json.
+    """
+    # Cria um grafo não direcionado
+    G = nx.Graph()
+
+    # Adiciona os nós com seus atributos
+    for node in data['nodes']:
+        G.add_node(
+            node['id'],
+            lat=node['lat'],
+            lon=node['lon']
+        )
+
+    # Adiciona as arestas com seus atributos
+    for edge in data['edges']:
+        G.add_edge(
+            edge['source'],
+            edge['target'],
+            weight=edge['weight'],
+            name=edge.get('name', '')  # Alguns podem não ter nome
+        )
+
+    return G
+
+
+def load_graph_from_json(json_path: str) -> nx.Graph:
+    """
+    Carrega o grafo a partir do arquivo JSON.
+
+    Args:
+        json_path (str): Caminho para o arquivo JSON
+
+    Returns:
+        nx.Graph: Grafo do NetworkX
+    """
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return grafo_de_dados(data)
+
+
+class Instancia:
+    def __init__(self, caminho: Path, hash: str, dados: Optional[Dict], grafo: Optional[nx.Graph],
+                 pos: Optional[Dict[int, tuple]], indice: IndiceVizinhanca, binaria=None):
+        """
+        Instância carregada: os dados brutos e tudo o que os scripts constroem a partir deles.
+
+        Args:
+            caminho: Arquivo da instância (.json, .jsonl ou .bin)
+            hash: SHA-256 do conteúdo da instância
+            dados: Instância no formato do ondina.json (nodes, edges, metadata, vertex_cover)
+            grafo: Grafo do NetworkX com lat/lon nos nós e weight/name nas arestas
+            pos: Posição (lon, lat) de cada vértice, para desenhar o grafo
+            indice: Índice das vizinhanças fechadas em CSR
+            binaria: InstanciaBinaria mapeada em memória (instâncias .bin); dados,
+                grafo e pos passados como None são montados a partir dela no primeiro acesso
+        """
+        self.caminho = caminho
+        self.hash = hash
+        self._dados = dados
+        self._grafo = grafo
+        self._pos = pos
+        self.indice = indice
+        self.binaria = binaria
+        self._indices_raio: Dict[float, IndiceVizinhanca] = {}
+
+    @property
+    def dados(self) -> Dict:
+        if self._dados is None:
+            self._dados = self.binaria.para_dict()
+            _junta_vertex_cover(self.caminho, self._dados)
+        return self._dados
+
+    @property
+    def grafo(self) -> nx.Graph:
+        if self._grafo is None:
+            self._grafo = self.binaria.grafo()
+        return self._grafo
+
+    @property
+    def pos(self) -> Dict[int, tuple]:
+        if self._pos is None:
+            self._pos = self.binaria.posicoes()
+        return self._pos
+
+    def arestas(self):
+        """
+        Origem, destino (ids) e comprimento de cada aresta. Nas instâncias
+        .bin saem direto dos arrays mapeados, sem montar os dados.
+        """
+        if self.binaria is not None:
+            nos = np.asarray(self.binaria.nos)
+            return nos[self.binaria.origens], nos[self.binaria.destinos], self.binaria.pesos
+        arestas = self.dados['edges']
+        return ([e['source'] for e in arestas], [e['target'] for e in arestas],
+                [e['weight'] for e in arestas])
+
+    @classmethod
+    def constroi(cls, caminho: Path, hash: str) -> "Instancia":
+        """
+        Lê o arquivo e constrói grafo, posições e índice (sem cache).
+        """
+        if caminho.suffix == '.bin':
+            # Só o índice é construído (direto da adjacência CSR); o resto é montado sob demanda
+            from instancia_binaria import InstanciaBinaria
+            binaria = InstanciaBinaria(str(caminho))
+            return cls(caminho, hash, None, None, None, binaria.indice(), binaria=binaria)
+
+        if caminho.suffix == '.jsonl':
+            from instancia_jsonl import le_jsonl
+            data = le_jsonl(str(caminho))
+        else:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        _junta_vertex_cover(caminho, data)
+        pos = {node['id']: (node['lon'], node['lat']) for node in data['nodes']}
+        indice = IndiceVizinhanca.de_arestas(
+            [node['id'] for node in data['nodes']],
+            [edge['source'] for edge in data['edges']],
+            [edge['target'] for edge in data['edges']],
+        )
+        return cls(caminho, hash, data, grafo_de_dados(data), pos, indice)
+
+    def indice_raio(self, raio: float, max_workers: Optional[int] = None, usar_cache: bool = True,
+                    diretorio_cache: Optional[Path] = None) -> IndiceVizinhanca:
+        """
+        Índice de cobertura por raio: cada câmera cobre os vértices a até
+        `raio` metros pela malha viária (peso das arestas), em vez de N[v].
+
+        Os caminhos mínimos são calculados uma vez por (instância, raio) e
+        guardados no cache em disco ao lado do da instância, então uma
+        varredura de raios só recalcula os raios novos.
+
+        Args:
+            raio: Alcance da câmera ao longo das ruas, em metros
+            max_workers: Processos para o Dijkstra limitado (padrão: serial)
+            usar_cache: Se False, sempre recalcula
+            diretorio_cache: Diretório do cache (padrão: instancias/.cache)
+        """
+        raio = float(raio)
+        if raio in self._indices_raio:
+            return self._indices_raio[raio]
+
+        arquivo = (Path(diretorio_cache or DIRETORIO_CACHE) /
+                   f"{self.caminho.stem}{self.caminho.suffix.replace('.', '_')}-raio{raio:g}-{self.hash[:16]}.pickle")
+        conteudo = _le_cache(arquivo, self.hash) if usar_cache else None
+        if conteudo is not None and conteudo.get('raio') == raio:
+            logger.info(f"Cobertura com raio {raio:g} m carregada do cache ({arquivo.name})")
+            indice = conteudo['indice']
+        else:
+            from cobertura_raio import indice_raio
+            origens, destinos, pesos = self.arestas()
+            indice = indice_raio(self.indice, origens, destinos, pesos, raio, max_workers)
+            if usar_cache:
+                try:
+                    _grava_cache(arquivo, {'versao': VERSAO_CACHE, 'hash': self.hash, 'raio': raio,
+                                           'indice': indice})
+                except OSError as e:
+                    logger.warning(f"Não foi possível gravar o cache da cobertura por raio: {e}")
+
+        self._indices_raio[raio] = indice
+        return indice
+
+
+def _junta_vertex_cover(caminho: Path, dados: Dict):
+    arquivo = arquivo_vertex_cover(caminho)
+    if arquivo.exists():
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            dados["vertex_cover"] = json.load(f)["vertex_cover"]
+
+
+def hash_instancia(caminho: Path) -> str:
+    """
+    Hash da instância: o do arquivo, combinado com o da cobertura de vértices quando ela existir.
+    """
+    hash = hash_arquivo(caminho)
+    arquivo = arquivo_vertex_cover(caminho)
+    if arquivo.exists():
+        hash = hashlib.sha256((hash + hash_arquivo(arquivo)).encode()).hexdigest()
+    return hash
+
+
+def _arquivo_cache(caminho: Path, hash: str, diretorio: Path) -> Path:
+    return diretorio / f"{caminho.stem}{caminho.suffix.replace('.', '_')}-{hash[:16]}.pickle"
+
+
+def _le_cache(arquivo: Path, hash: str) -> Optional[Dict]:
+    try:
+        with open(arquivo, 'rb') as f:
+            conteudo = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Cache inválido em {arquivo} ({e}); reconstruindo")
+        return None
+    if conteudo.get('versao') != VERSAO_CACHE or conteudo.get('hash') != hash:
+        return None
+    return conteudo
+
+
+def _grava_cache(arquivo: Path, conteudo: Dict):
+    arquivo.parent.mkdir(parents=True, exist_ok=True)
+    # Entradas antigas da mesma instância (outro conteúdo) deixam de valer
+    prefixo = arquivo.name.rsplit('-', 1)[0]
+    for antigo in arquivo.parent.glob(f"{prefixo}-*.pickle"):
+        # O prefixo da instância também casa com os caches por raio dela, que ficam
+        if antigo != arquivo and antigo.name.rsplit('-', 1)[0] == prefixo:
+            antigo.unlink(missing_ok=True)
+    # Escrita atômica: outro processo nunca lê um cache pela metade
+    fd, temporario = tempfile.mkstemp(dir=arquivo.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(conteudo, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporario, arquivo)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+
+
+def carrega_instancia(caminho=None, usar_cache: bool = True,
+                      diretorio_cache: Optional[Path] = None) -> Instancia:
+    """
+    Carrega a instância usada por todos os scripts do pipeline.
+
+    O grafo, as posições e o índice das vizinhanças ficam guardados em disco,
+    identificados pelo SHA-256 do arquivo da instância (e da cobertura de
+    vértices, se calculada à parte). Se um deles mudar, o hash muda e o
+    cache antigo é descartado na próxima carga. Instâncias .bin não passam
+    pelo cache: o arquivo já é mapeado em memória e o índice sai direto
+    da adjacência CSR gravada nele.
+
+    Args:
+        caminho: Arquivo da instância, .json, .jsonl ou .bin (padrão: instancias/ondina.bin)
+        usar_cache: Se False, sempre lê e constrói a partir do arquivo
+        diretorio_cache: Diretório do cache (padrão: instancias/.cache)
+
+    Returns:
+        Instancia: Dados, grafo, posições e índice
+    """
+    caminho = Path(caminho) if caminho is not None else INSTANCIA_PADRAO
+    hash = hash_instancia(caminho)
+    if not usar_cache or caminho.suffix == '.bin':
+        return Instancia.constroi(caminho, hash)
+
+    arquivo = _arquivo_cache(caminho, hash, Path(diretorio_cache or DIRETORIO_CACHE))
+    conteudo = _le_cache(arquivo, hash)
+    if conteudo is not None:
+        logger.info(f"Instância {caminho.name} carregada do cache ({arquivo.name})")
+        return Instancia(caminho, hash, conteudo['dados'], conteudo['grafo'],
+                         conteudo['pos'], conteudo['indice'])
+
+    instancia = Instancia.constroi(caminho, hash)
+    try:
+        _grava_cache(arquivo, {
+            'versao': VERSAO_CACHE,
+            'hash': hash,
+            'dados': instancia.dados,
+            'grafo': instancia.grafo,
+            'pos': instancia.pos,
+            'indice': instancia.indice,
+        })
+    except OSError as e:
+        # Sem permissão de escrita o pipeline continua, só sem cache
+        logger.warning(f"Não foi possível gravar o cache da instância: {e}")
+    return instancia
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import dijkstra
+
+from indice_vizinhanca import IndiceVizinhanca
+
+# Elementos da matriz densa de distâncias de um bloco de origens (float64: 32 MiB)
+ELEMENTOS_POR_BLOCO = 1 << 22
+# Peso mínimo de uma aresta: no csgraph um zero explícito seria ausência de aresta
+PESO_MINIMO = 1e-9
+
+
+def matriz_pesos(indice: IndiceVizinhanca, origens: Iterable, destinos: Iterable,
+                 pesos: Iterable[float]) -> sparse.csr_matrix:
+    """
+    Matriz esparsa simétrica n×n com o comprimento de cada rua (em metros),
+    nas posições do índice. Entre arestas paralelas vale a mais curta;
+    laços são descartados.
+    """
+    u = indice.posicoes(origens)
+    v = indice.posicoes(destinos)
+    w = np.maximum(np.asarray(list(pesos), dtype=np.float64), PESO_MINIMO)
+    validas = u != v
+    linhas = np.concatenate([u[validas], v[validas]])
+    colunas = np.concatenate([v[validas], u[validas]])
+    w = np.concatenate([w[validas], w[validas]])
+
+    # Ordena por (linha, coluna, peso) e fica com o primeiro de cada par
+    ordem = np.lexsort((w, colunas, linhas))
+    linhas, colunas, w = linhas[ordem], colunas[ordem], w[ordem]
+    primeiro = np.ones(len(linhas), dtype=bool)
+    primeiro[1:] = (linhas[1:] != linhas[:-1]) | (colunas[1:] != colunas[:-1])
+    return sparse.csr_matrix((w[primeiro], (linhas[primeiro], colunas[primeiro])),
+                             shape=(indice.n, indice.n))
+
+
+def _conjuntos_bloco(pesos: sparse.csr_matrix, raio: float, fontes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Dijkstra limitado a `raio` a partir de um bloco de origens.
+
+    Returns:
+        Tupla (tamanho do conjunto de cada origem, posições cobertas em ordem de origem)
+    """
+    distancias = dijkstra(pesos, directed=False, indices=fontes, limit=raio)
+    linhas, colunas = np.nonzero(np.isfinite(distancias))
+    return np.bincount(linhas, minlength=len(fontes)), colunas.astype(np.int32)
+
+
+_pesos_processo = None
+_raio_processo = None
+
+def _inicializa_processo(pesos, raio):
+    """
+    Inicializador do pool: a matriz de pesos é enviada uma única vez por processo.
+    """
+    global _pesos_processo, _raio_processo
+    _pesos_processo, _raio_processo = pesos, raio
+
+def _conjuntos_bloco_processo(fontes):
+    return _conjuntos_bloco(_pesos_processo, _raio_processo, fontes)
+
+
+def conjuntos_cobertura(pesos: sparse.csr_matrix, raio: float,
+                        max_workers: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Conjunto de cobertura de cada candidato: os vértices a até `raio` metros
+    pela malha viária, incluindo o próprio.
+
+    As origens são processadas em blocos com scipy.sparse.csgraph.dijkstra
+    (limit=raio); cada bloco devolve uma matriz densa de distâncias, por
+    isso o tamanho do bloco diminui com n. O limite poupa a busca, mas o
+    csgraph ainda gasta O(n) por origem (≈ 1 min para 100 mil vértices):
+    por isso o resultado fica em cache por raio e, com max_workers > 1,
+    os blocos são distribuídos em um ProcessPoolExecutor.
+
+    Returns:
+        Tupla (indptr, indices) em CSR: a linha p são as posições cobertas por uma câmera em p
+    """
+    n = pesos.shape[0]
+    tamanho_bloco = max(1, ELEMENTOS_POR_BLOCO // max(n, 1))
+    blocos = [np.arange(inicio, min(inicio + tamanho_bloco, n)) for inicio in range(0, n, tamanho_bloco)]
+
+    if max_workers is not None and max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_inicializa_processo,
+                                 initargs=(pesos, raio)) as executor:
+            resultados = list(executor.map(_conjuntos_bloco_processo, blocos))
+    else:
+        resultados = [_conjuntos_bloco(pesos, raio, fontes) for fontes in blocos]
+
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    if resultados:
+        np.cumsum(np.concatenate([tamanhos for tamanhos, _ in resultados]), out=indptr[1:])
+    indices = (np.concatenate([colunas for _, colunas in resultados]) if resultados
+               else np.zeros(0, dtype=np.int32))
+    return indptr, indices
+
+
+def indice_raio(indice: IndiceVizinhanca, origens: Iterable, destinos: Iterable, pesos: Iterable[float],
+                raio: float, max_workers: Optional[int] = None) -> IndiceVizinhanca:
+    """
+    Índice de cobertura por raio: a linha p passa a ser tudo o que está a
+    até `raio` metros de p, em vez de N[p]. Os solvers usam este índice
+    sem nenhuma mudança, pois só dependem das linhas (conjuntos de cobertura).
+
+    Args:
+        indice: Índice das vizinhanças fechadas (define posições e ids)
+        origens, destinos, pesos: Arestas da instância (ids e comprimento em metros)
+        raio: Alcance da câmera ao longo das ruas, em metros
+        max_workers: Processos para o Dijkstra (padrão: execução serial)
+    """
+    if raio < 0:
+        raise ValueError(f"O raio deve ser não negativo: {raio}")
+    pesos = matriz_pesos(indice, origens, destinos, pesos)
+    indptr, indices = conjuntos_cobertura(pesos, raio, max_workers)
+    return IndiceVizinhanca(indice.nos, indptr, indices)
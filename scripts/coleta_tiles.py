@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import bz2
+import hashlib
+import logging
+import math
+import os
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from xml.etree.ElementTree import iterparse
+from xml.sax.saxutils import quoteattr
+
+import networkx as nx
+import osmnx as ox
+
+logger = logging.getLogger(__name__)
+
+DIRETORIO_TILES = Path(__file__).parent.parent / "instancias" / ".cache" / "tiles"
+
+# Tipos de via excluídos da rede 'drive' (mesmo critério do filtro do OSMnx)
+VIAS_NAO_DIRIGIVEIS = {
+    "abandoned", "bridleway", "bus_guideway", "construction", "corridor", "cycleway",
+    "elevator", "escalator", "footway", "no", "path", "pedestrian", "planned",
+    "platform", "proposed", "raceway", "razed", "steps", "track",
+}
+SERVICOS_NAO_DIRIGIVEIS = {
+    "alley", "driveway", "emergency_access", "parking", "parking_aisle", "private",
+}
+
+BBox = Tuple[float, float, float, float]  # (oeste, sul, leste, norte), como no OSMnx 2
+
+
+def divide_bbox(bbox: BBox, tamanho: float) -> List[BBox]:
+    """
+    Divide o retângulo em tiles de `tamanho` graus (os da borda podem ser menores).
+
+    Args:
+        bbox: (oeste, sul, leste, norte) em graus
+        tamanho: Lado de cada tile em graus
+
+    Returns:
+        List[BBox]: Tiles linha a linha, de sul para norte e de oeste para leste
+    """
+    oeste, sul, leste, norte = bbox
+    colunas = max(1, math.ceil((leste - oeste) / tamanho - 1e-9))
+    linhas = max(1, math.ceil((norte - sul) / tamanho - 1e-9))
+    tiles = []
+    for i in range(linhas):
+        for j in range(colunas):
+            tiles.append((
+                oeste + j * tamanho,
+                sul + i * tamanho,
+                min(leste, oeste + (j + 1) * tamanho),
+                min(norte, sul + (i + 1) * tamanho),
+            ))
+    return tiles
+
+
+def via_dirigivel(tags: Dict[str, str], network_type: str = "drive") -> bool:
+    """
+    Indica se uma via do OSM entra na rede. O graph_from_xml não filtra por
+    tipo de rede, então o filtro é aplicado ao dividir o extrato.
+    """
+    if "highway" not in tags or tags.get("area") == "yes":
+        return False
+    if network_type == "all":
+        return True
+    return (tags["highway"] not in VIAS_NAO_DIRIGIVEIS
+            and tags.get("service") not in SERVICOS_NAO_DIRIGIVEIS
+            and tags.get("access") != "private"
+            and tags.get("motor_vehicle") != "no"
+            and tags.get("motorcar") != "no")
+
+
+def _abre_extrato(caminho: Path):
+    if caminho.suffix == ".pbf":
+        raise ValueError(
+            f"{caminho}: extratos .pbf precisam ser convertidos para XML antes "
+            f"(ex.: osmium cat {caminho.name} -o {caminho.stem}.osm)"
+        )
+    if caminho.suffix == ".bz2":
+        return bz2.open(caminho, "rb")
+    return open(caminho, "rb")
+
+
+def _tile_do_ponto(lon: float, lat: float, tiles: Sequence[BBox]) -> Optional[int]:
+    for k, (oeste, sul, leste, norte) in enumerate(tiles):
+        if oeste <= lon <= leste and sul <= lat <= norte:
+            return k
+    return None
+
+
+def divide_extrato(caminho: Path, tiles: Sequence[BBox], diretorio: Path,
+                   network_type: str = "drive") -> List[Path]:
+    """
+    Divide um extrato OSM (XML) em um arquivo por tile, em uma única leitura.
+
+    Cada tile recebe as vias da rede que têm pelo menos um nó dentro dele,
+    inteiras (com os nós de fora). Assim os nós de fronteira aparecem com o
+    mesmo id do OSM nos tiles vizinhos e a junção dos grafos os costura.
+
+    Returns:
+        List[Path]: Arquivo .osm de cada tile com vias (tiles vazios são omitidos)
+    """
+    coordenadas: Dict[str, Tuple[str, str]] = {}
+    tags_nos: Dict[str, List[Tuple[str, str]]] = {}
+    vias_por_tile: List[List] = [[] for _ in tiles]
+
+    with _abre_extrato(caminho) as f:
+        for _, elem in iterparse(f, events=("end",)):
+            if elem.tag == "node":
+                coordenadas[elem.get("id")] = (elem.get("lat"), elem.get("lon"))
+                tags = [(t.get("k"), t.get("v")) for t in elem.iter("tag")]
+                if tags:
+                    tags_nos[elem.get("id")] = tags
+                elem.clear()
+            elif elem.tag == "way":
+                tags = {t.get("k"): t.get("v") for t in elem.iter("tag")}
+                if via_dirigivel(tags, network_type):
+                    refs = [nd.get("ref") for nd in elem.iter("nd")]
+                    via = (elem.get("id"), refs, tags)
+                    destinos = set()
+                    for ref in refs:
+                        if ref in coordenadas:
+                            lat, lon = coordenadas[ref]
+                            k = _tile_do_ponto(float(lon), float(lat), tiles)
+                            if k is not None:
+                                destinos.add(k)
+                    for k in destinos:
+                        vias_por_tile[k].append(via)
+                elem.clear()
+            elif elem.tag == "relation":
+                elem.clear()
+
+    diretorio.mkdir(parents=True, exist_ok=True)
+    arquivos = []
+    for k, vias in enumerate(vias_por_tile):
+        arquivo = diretorio / f"tile_{k}.osm"
+        if not vias:
+            arquivo.unlink(missing_ok=True)
+            continue
+        nos = sorted({ref for _, refs, _ in vias for ref in refs if ref in coordenadas}, key=int)
+        with open(arquivo, "w", encoding="utf-8") as saida:
+            saida.write('<?xml version="1.0" encoding="UTF-8"?>\n<osm version="0.6">\n')
+            for no in nos:
+                lat, lon = coordenadas[no]
+                tags = tags_nos.get(no)
+                if tags:
+                    saida.write(f'  <node id="{no}" lat="{lat}" lon="{lon}">\n')
+                    for chave, valor in tags:
+                        saida.write(f'    <tag k={quoteattr(chave)} v={quoteattr(valor)}/>\n')
+                    saida.write('  </node>\n')
+                else:
+                    saida.write(f'  <node id="{no}" lat="{lat}" lon="{lon}"/>\n')
+            for id_via, refs, tags in sorted(vias, key=lambda via: int(via[0])):
+                saida.write(f'  <way id="{id_via}">\n')
+                for ref in refs:
+                    if ref in coordenadas:
+                        saida.write(f'    <nd ref="{ref}"/>\n')
+                for chave, valor in tags.items():
+                    saida.write(f'    <tag k={quoteattr(chave)} v={quoteattr(valor)}/>\n')
+                saida.write('  </way>\n')
+            saida.write('</osm>\n')
+        arquivos.append(arquivo)
+    return arquivos
+
+
+def _hash_arquivo(caminho: Path) -> str:
+    h = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def _constroi_tile(tarefa: Tuple[str, object, str, str]) -> str:
+    """
+    Constrói o grafo de um tile (sem simplificar) e o grava no cache.
+    Executada nos processos do pool.
+    """
+    tipo, origem, network_type, arquivo_cache = tarefa
+    if tipo == "xml":
+        grafo = ox.graph_from_xml(origem, simplify=False, retain_all=True)
+    elif tipo == "lugar":
+        grafo = ox.graph_from_place(origem, network_type=network_type, simplify=False, retain_all=True)
+    else:
+        grafo = ox.graph_from_bbox(tuple(origem), network_type=network_type, simplify=False,
+                                   retain_all=True, truncate_by_edge=True)
+
+    fd, temporario = tempfile.mkstemp(dir=Path(arquivo_cache).parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        pickle.dump(grafo, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporario, arquivo_cache)
+    return arquivo_cache
+
+
+def junta_tiles(grafos: Sequence[nx.MultiDiGraph], retain_all: bool = False) -> nx.MultiDiGraph:
+    """
+    Junta os grafos dos tiles em um único grafo consolidado.
+
+    Os tiles são construídos sem simplificação, então os nós de fronteira
+    têm o mesmo id do OSM dos dois lados e as arestas repetidas coincidem.
+    A simplificação só é feita no grafo completo; feita por tile, ela
+    apagaria nós que são interseções apenas no tile vizinho.
+    """
+    grafos = [g for g in grafos if len(g)]
+    if not grafos:
+        raise ValueError("Nenhum tile contém vias da rede")
+    grafo = nx.compose_all(grafos)
+    grafo.graph.update({"crs": "epsg:4326", "simplified": False})
+    grafo = ox.simplify_graph(grafo)
+    if not retain_all:
+        grafo = ox.truncate.largest_component(grafo, strongly=False)
+    return grafo
+
+
+def coleta_tiles(lugares: Optional[Sequence[str]] = None, bbox: Optional[BBox] = None,
+                 tamanho_tile: float = 0.01, extrato: Optional[Path] = None,
+                 network_type: str = "drive", max_workers: Optional[int] = None,
+                 diretorio_cache: Path = DIRETORIO_TILES, atualizar: bool = False,
+                 retain_all: bool = False) -> nx.MultiDiGraph:
+    """
+    Coleta a malha viária por tiles e devolve um único grafo consolidado.
+
+    Modos:
+    - `extrato` + `bbox`: extrato OSM local (.osm/.osm.bz2), dividido em tiles
+      de `tamanho_tile` graus; funciona sem internet. O cache de cada tile é
+      identificado pelo hash do seu recorte do extrato, então ao trocar o
+      extrato só os tiles cujo conteúdo mudou são reconstruídos.
+    - `bbox` sem extrato: cada tile é baixado com graph_from_bbox.
+    - `lugares`: cada lugar (ex.: bairros) é um tile baixado com graph_from_place.
+    Nos modos online o cache é identificado pelo lugar/retângulo; use
+    `atualizar` para baixar de novo.
+
+    Args:
+        lugares: Nomes de lugares (um tile por lugar)
+        bbox: (oeste, sul, leste, norte) em graus
+        tamanho_tile: Lado dos tiles em graus
+        extrato: Extrato OSM local em XML
+        network_type: Tipo de rede do OSMnx ('drive' ou 'all' no modo offline)
+        max_workers: Processos do pool (padrão: núcleos disponíveis)
+        diretorio_cache: Diretório dos tiles
+        atualizar: Reconstrói todos os tiles, ignorando o cache
+        retain_all: Mantém componentes desconectados no grafo final
+
+    Returns:
+        nx.MultiDiGraph: Grafo consolidado e simplificado
+    """
+    diretorio_cache = Path(diretorio_cache)
+    diretorio_cache.mkdir(parents=True, exist_ok=True)
+
+    tarefas = []
+    if extrato is not None:
+        if bbox is None:
+            raise ValueError("O modo offline precisa do retângulo (bbox) a dividir em tiles")
+        arquivos = divide_extrato(Path(extrato), divide_bbox(bbox, tamanho_tile),
+                                  diretorio_cache / "xml", network_type)
+        for arquivo in arquivos:
+            chave = _hash_arquivo(arquivo)[:24]
+            tarefas.append(("xml", str(arquivo), network_type, chave))
+    elif lugares:
+        for lugar in lugares:
+            chave = hashlib.sha256(f"lugar:{lugar}:{network_type}".encode()).hexdigest()[:24]
+            tarefas.append(("lugar", lugar, network_type, chave))
+    elif bbox is not None:
+        for tile in divide_bbox(bbox, tamanho_tile):
+            chave = hashlib.sha256(f"bbox:{tile!r}:{network_type}".encode()).hexdigest()[:24]
+            tarefas.append(("bbox", tile, network_type, chave))
+    else:
+        raise ValueError("Informe lugares, bbox ou um extrato OSM")
+
+    pendentes, arquivos_cache = [], []
+    for tipo, origem, rede, chave in tarefas:
+        arquivo_cache = diretorio_cache / f"{chave}.gpickle"
+        arquivos_cache.append(arquivo_cache)
+        if atualizar or not arquivo_cache.exists():
+            pendentes.append((tipo, origem, rede, str(arquivo_cache)))
+    logger.info(f"{len(tarefas)} tiles: {len(tarefas) - len(pendentes)} do cache, "
+                f"{len(pendentes)} a construir")
+
+    if pendentes:
+        if max_workers == 1 or len(pendentes) == 1:
+            for tarefa in pendentes:
+                _constroi_tile(tarefa)
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(_constroi_tile, pendentes))
+
+    grafos = []
+    for arquivo_cache in arquivos_cache:
+        with open(arquivo_cache, "rb") as f:
+            grafos.append(pickle.load(f))
+    return junta_tiles(grafos, retain_all=retain_all)
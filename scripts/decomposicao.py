@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import heapq
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from scipy.sparse.csgraph import connected_components
+
+from avaliacao_incremental import AvaliadorIncremental
+from carregador import carrega_instancia
+from guloso_preguicoso import GulosoPreguicoso
+from indice_vizinhanca import IndiceVizinhanca
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def particao_componentes(indice: IndiceVizinhanca) -> List[np.ndarray]:
+    """
+    Componentes conexos do grafo (posições). Os problemas de cobertura
+    separam exatamente sobre eles.
+    """
+    num, rotulos = connected_components(indice.matriz_csr(), directed=False)
+    ordem = np.argsort(rotulos, kind='stable')
+    cortes = np.cumsum(np.bincount(rotulos, minlength=num))[:-1]
+    return np.split(ordem, cortes)
+
+
+def particao_espacial(coordenadas: np.ndarray, num_partes: int) -> List[np.ndarray]:
+    """
+    Bisseção recursiva por coordenadas: cada região é cortada na mediana do
+    eixo de maior extensão, com tamanhos proporcionais ao número de partes
+    de cada lado. As partes ficam compactas e com fronteira pequena.
+
+    Args:
+        coordenadas: Array n×2 com (lon, lat) de cada posição
+        num_partes: Número de partes
+
+    Returns:
+        List[np.ndarray]: Posições de cada parte
+    """
+    def bissecta(posicoes: np.ndarray, partes: int) -> List[np.ndarray]:
+        if partes <= 1 or len(posicoes) <= 1:
+            return [posicoes]
+        pontos = coordenadas[posicoes]
+        eixo = int(np.argmax(pontos.max(axis=0) - pontos.min(axis=0)))
+        ordem = posicoes[np.argsort(pontos[:, eixo], kind='stable')]
+        esquerda = partes // 2
+        corte = len(ordem) * esquerda // partes
+        return bissecta(ordem[:corte], esquerda) + bissecta(ordem[corte:], partes - esquerda)
+
+    return [np.sort(parte) for parte in bissecta(np.arange(len(coordenadas)), num_partes) if len(parte)]
+
+
+def agrupa_partes(partes: Sequence[np.ndarray], num_grupos: int) -> List[np.ndarray]:
+    """
+    Junta partes pequenas (ex.: muitos componentes) em `num_grupos` grupos de
+    tamanho parecido, para não criar uma tarefa por componente minúsculo.
+    """
+    if len(partes) <= num_grupos:
+        return list(partes)
+    grupos = [[] for _ in range(num_grupos)]
+    cargas = [(0, g) for g in range(num_grupos)]
+    for parte in sorted(partes, key=len, reverse=True):
+        carga, g = heapq.heappop(cargas)
+        grupos[g].append(parte)
+        heapq.heappush(cargas, (carga + len(parte), g))
+    return [np.sort(np.concatenate(grupo)) for grupo in grupos if grupo]
+
+
+_indice_parte = None
+
+def _inicializa_parte(indice):
+    """
+    Inicializador dos processos: o índice é enviado uma única vez por processo.
+    """
+    global _indice_parte
+    _indice_parte = indice
+
+
+def _resolve_parte(demanda: np.ndarray, candidatos: np.ndarray):
+    """
+    Guloso até cobrir toda a demanda da parte. O prefixo de tamanho k da
+    ordem de seleção é a solução gulosa com k câmeras, então a mesma
+    execução serve à cobertura completa e à máxima.
+
+    Returns:
+        Tupla com (câmeras na ordem de seleção, ganho de cada câmera, tempo)
+    """
+    inicio = time.perf_counter()
+    guloso = GulosoPreguicoso(_indice_parte, candidatos, demanda)
+    selecionados = guloso.seleciona()
+    return selecionados, guloso.ganhos, time.perf_counter() - inicio
+
+
+class Decomposicao:
+    def __init__(self, indice: IndiceVizinhanca, partes: Sequence[np.ndarray]):
+        """
+        Resolve a cobertura por partes independentes, em paralelo.
+
+        Cada parte cobre os seus próprios vértices (demanda) e pode instalar
+        câmeras neles e na sua vizinhança imediata (halo), então vértices de
+        fronteira podem ser cobertos por câmeras da parte vizinha. As
+        soluções das partes são juntadas e reparadas no fim.
+
+        Args:
+            indice: Índice das vizinhanças fechadas
+            partes: Posições de cada parte (disjuntas, cobrindo todos os vértices)
+        """
+        self.indice = indice
+        self.partes = [np.asarray(parte, dtype=np.int64) for parte in partes]
+        self.estatisticas = {}
+
+    @classmethod
+    def por_componentes(cls, indice: IndiceVizinhanca, num_grupos: Optional[int] = None) -> "Decomposicao":
+        """
+        Decomposição exata pelos componentes conexos, agrupados em até `num_grupos` tarefas.
+        """
+        partes = particao_componentes(indice)
+        return cls(indice, agrupa_partes(partes, num_grupos or 4 * (os.cpu_count() or 1)))
+
+    @classmethod
+    def espacial(cls, indice: IndiceVizinhanca, coordenadas: np.ndarray, num_partes: int) -> "Decomposicao":
+        """
+        Decomposição aproximada em regiões geográficas dentro de cada componente.
+        """
+        partes = []
+        componentes = particao_componentes(indice)
+        for componente in componentes:
+            # Cada componente recebe partes proporcionais ao seu tamanho
+            k = max(1, round(num_partes * len(componente) / indice.n))
+            partes.extend(componente[parte] for parte in particao_espacial(coordenadas[componente], k))
+        return cls(indice, partes)
+
+    def _halo(self, parte: np.ndarray) -> np.ndarray:
+        inicio, fim = self.indice.indptr[parte], self.indice.indptr[parte + 1]
+        vizinhos = np.concatenate([self.indice.indices[a:b] for a, b in zip(inicio.tolist(), fim.tolist())])
+        return np.unique(vizinhos).astype(np.int64)
+
+    def _resolve_partes(self, max_workers: Optional[int]):
+        tarefas = [(parte, self._halo(parte)) for parte in self.partes]
+        inicio = time.perf_counter()
+        if max_workers == 1 or len(tarefas) == 1:
+            _inicializa_parte(self.indice)
+            resultados = [_resolve_parte(*tarefa) for tarefa in tarefas]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_inicializa_parte,
+                                     initargs=(self.indice,)) as executor:
+                resultados = list(executor.map(_resolve_parte, *zip(*tarefas)))
+
+        self.estatisticas = {
+            "partes": [
+                {
+                    "vertices": len(parte),
+                    "candidatos": len(candidatos),
+                    "cameras": len(selecionados),
+                    "tempo": tempo,
+                }
+                for (parte, candidatos), (selecionados, _, tempo) in zip(tarefas, resultados)
+            ],
+            "tempo_partes": time.perf_counter() - inicio,
+        }
+        return resultados
+
+    def _remove_redundantes(self, cameras: Sequence[int]) -> List[int]:
+        """
+        Reparo da fronteira: partes vizinhas podem cobrir o mesmo vértice de
+        fronteira, então câmeras cuja remoção não descobre nenhum vértice saem.
+        As de menor vizinhança são testadas primeiro.
+        """
+        avaliador = AvaliadorIncremental(self.indice, cameras)
+        graus = self.indice.graus()
+        for u in sorted(avaliador.cameras, key=lambda v: (graus[v], v)):
+            if avaliador.perda_remocao(u) == 0:
+                avaliador.remover(u)
+        return sorted(avaliador.cameras)
+
+    def resolve_cobertura_completa(self, max_workers: Optional[int] = None) -> List[int]:
+        """
+        Cobertura completa: união das coberturas das partes, sem as câmeras redundantes.
+
+        Returns:
+            List[int]: Posições das câmeras
+        """
+        resultados = self._resolve_partes(max_workers)
+        uniao = sorted(set(v for selecionados, _, _ in resultados for v in selecionados))
+        cameras = self._remove_redundantes(uniao)
+        self.estatisticas["cameras_antes_reparo"] = len(uniao)
+        self.estatisticas["cameras_removidas_reparo"] = len(uniao) - len(cameras)
+        return cameras
+
+    def resolve_cobertura_maxima(self, max_cameras: int, max_workers: Optional[int] = None) -> List[int]:
+        """
+        Cobertura máxima: o orçamento é repartido pelas curvas de ganho das partes.
+
+        Os ganhos de cada parte não crescem ao longo da execução gulosa, então
+        escolher os `max_cameras` maiores ganhos entre todas as partes dá o
+        prefixo que cada parte pode usar. Câmeras repetidas no halo liberam
+        orçamento, que é completado com o guloso sobre os vértices ainda descobertos.
+
+        Returns:
+            List[int]: Posições das câmeras
+        """
+        resultados = self._resolve_partes(max_workers)
+        ganhos = [(-ganho, p, k) for p, (_, ganhos_parte, _) in enumerate(resultados)
+                  for k, ganho in enumerate(ganhos_parte)]
+        prefixos = [0] * len(resultados)
+        for _, p, _ in heapq.nsmallest(max_cameras, ganhos):
+            prefixos[p] += 1
+
+        cameras, escolhidas = [], set()
+        for (selecionados, _, _), k in zip(resultados, prefixos):
+            for v in selecionados[:k]:
+                if v not in escolhidas:
+                    escolhidas.add(v)
+                    cameras.append(v)
+
+        restante = max_cameras - len(cameras)
+        if restante > 0:
+            descobertos = np.flatnonzero(~self.indice.mascara_cobertura(cameras))
+            if len(descobertos):
+                completa = GulosoPreguicoso(self.indice, range(self.indice.n), descobertos)
+                cameras.extend(completa.seleciona(restante))
+
+        self.estatisticas["orcamento_por_parte"] = prefixos
+        self.estatisticas["cameras_completadas"] = max(restante, 0)
+        return cameras
+
+
+def salva_resultado(indice: IndiceVizinhanca, cameras: Sequence[int], arquivo: Path, extras: Dict):
+    vertices_cobertos = np.flatnonzero(indice.mascara_cobertura(cameras))
+    resultado = {
+        "vertices_selecionados": indice.ids(cameras),
+        "vertices_cobertos": indice.ids(vertices_cobertos),
+        "num_cameras": len(cameras),
+        "total_cobertura": len(vertices_cobertos),
+        "total_vertices": indice.n,
+        "decomposicao": extras,
+    }
+    arquivo.parent.mkdir(parents=True, exist_ok=True)
+    with open(arquivo, 'w') as f:
+        json.dump(resultado, f, indent=2)
+    return resultado
+
+
+def main():
+    script_dir = Path(__file__).parent.parent
+    parser = argparse.ArgumentParser(description="Cobertura por decomposição da instância em partes independentes")
+    parser.add_argument("--instancia", type=Path, default=script_dir / "instancias" / "ondina.bin")
+    parser.add_argument("--modo", choices=["componentes", "espacial"], default="componentes",
+                        help="Componentes conexos (exato) ou regiões geográficas com halo")
+    parser.add_argument("--partes", type=int, default=4, help="Número de regiões no modo espacial")
+    parser.add_argument("--max-cameras", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Número de processos (padrão: núcleos disponíveis)")
+    parser.add_argument("--saida", type=Path, default=script_dir / "resultados")
+    args = parser.parse_args()
+
+    instancia = carrega_instancia(args.instancia)
+    indice = instancia.indice
+    if args.modo == "componentes":
+        decomposicao = Decomposicao.por_componentes(indice)
+    else:
+        coordenadas = np.array([instancia.pos[v] for v in indice.ids(range(indice.n))])
+        decomposicao = Decomposicao.espacial(indice, coordenadas, args.partes)
+    logger.info(f"{len(decomposicao.partes)} partes ({args.modo}), "
+                f"tamanhos {[len(parte) for parte in decomposicao.partes]}")
+
+    completa = decomposicao.resolve_cobertura_completa(args.workers)
+    resultado = salva_resultado(indice, completa, args.saida / "cobertura_completa_decomposicao.json",
+                                decomposicao.estatisticas)
+    logger.info(f"Cobertura completa: {resultado['num_cameras']} câmeras "
+                f"({decomposicao.estatisticas['cameras_removidas_reparo']} removidas no reparo da fronteira)")
+
+    maxima = decomposicao.resolve_cobertura_maxima(args.max_cameras, args.workers)
+    resultado = salva_resultado(indice, maxima, args.saida / "cobertura_maxima_decomposicao.json",
+                                decomposicao.estatisticas)
+    logger.info(f"Cobertura máxima: {resultado['total_cobertura']} vértices com {resultado['num_cameras']} câmeras "
+                f"(orçamento por parte: {decomposicao.estatisticas['orcamento_por_parte']})")
+
+
+if __name__ == "__main__":
+    main()
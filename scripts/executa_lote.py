@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import hashlib
+import importlib
+import itertools
+import json
+import logging
+import os
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+from carregador import carrega_instancia
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+RAIZ = Path(__file__).parent.parent
+
+# Grade usada quando nenhum arquivo é informado: os experimentos do README
+GRADE_PADRAO = {
+    "instancias": ["instancias/ondina.bin"],
+    "solvers": {
+        "guloso_completa": {},
+        "guloso_maxima": {"max_cameras": [40]},
+        "genetico": {
+            "max_cameras": [40],
+            "population_size": [1000],
+            "generations": [200],
+            "crossover_rate": [0.8],
+            "mutation_rate": [0.1],
+        },
+    },
+    "sementes": [0, 1, 2],
+}
+
+# Solvers cujo resultado depende da semente; os demais rodam uma vez por combinação
+SOLVERS_ESTOCASTICOS = {"genetico", "guloso_estocastico"}
+
+
+def expande_grade(grade: Dict) -> List[Dict]:
+    """
+    Produto cartesiano instâncias × solvers × parâmetros × sementes.
+
+    Cada valor de parâmetro na grade é uma lista; valores escalares são
+    tratados como lista de um elemento.
+
+    Returns:
+        List[Dict]: Execuções com id, instância, solver, parâmetros e semente
+    """
+    execucoes = []
+    sementes = grade.get("sementes", [0])
+    for instancia in grade["instancias"]:
+        for solver, parametros in grade["solvers"].items():
+            nomes = sorted(parametros)
+            valores = [v if isinstance(v, list) else [v] for v in (parametros[n] for n in nomes)]
+            for combinacao in itertools.product(*valores):
+                params = dict(zip(nomes, combinacao))
+                for semente in (sementes if solver in SOLVERS_ESTOCASTICOS else [None]):
+                    execucao = {"instancia": instancia, "solver": solver, "params": params, "semente": semente}
+                    chave = json.dumps(execucao, sort_keys=True)
+                    execucao["id"] = hashlib.sha1(chave.encode()).hexdigest()[:16]
+                    execucoes.append(execucao)
+    return execucoes
+
+
+_instancias = {}
+
+def _instancia(caminho: str):
+    # Cada processo carrega cada instância uma vez (do cache em disco do carregador)
+    if caminho not in _instancias:
+        arquivo = Path(caminho)
+        _instancias[caminho] = carrega_instancia(arquivo if arquivo.is_absolute() else RAIZ / arquivo)
+    return _instancias[caminho]
+
+
+def _resolve(execucao: Dict) -> Dict:
+    """
+    Executa um solver e devolve as métricas (ids das câmeras e cobertura).
+    """
+    instancia = _instancia(execucao["instancia"])
+    params = dict(execucao["params"])
+    # 'raio' vale para qualquer solver: troca N[v] pela cobertura a até R metros
+    raio = params.pop("raio", None)
+    indice = instancia.indice_raio(raio) if raio is not None else instancia.indice
+    solver = execucao["solver"]
+
+    if solver == "genetico":
+        genetico = importlib.import_module("7_resolve_cobertura_genetico")
+        ga = genetico.GeneticVertexCover(None, indice=indice, semente=execucao["semente"],
+                                         verbose=False, **params)
+        ga.run()
+        cameras = indice.ids(ga.cameras(ga.best_solution))
+        extras = {"geracoes_avaliadas": len(ga.historico), "motivo_parada": ga.motivo_parada}
+    else:
+        cobertura = importlib.import_module("5_resolve_cobertura")
+        solver_cobertura = cobertura.CoberturaVertices(instancia.grafo, indice)
+        extras = {}
+        if solver == "guloso_completa":
+            cameras = list(solver_cobertura.resolve_cobertura_completa())
+        elif solver == "guloso_maxima":
+            cameras, _ = solver_cobertura.resolve_cobertura_maxima(**params)
+        elif solver == "guloso_estocastico":
+            cameras, _ = solver_cobertura.resolve_cobertura_maxima(semente=execucao["semente"], **{"epsilon": 0.1, **params})
+            extras = {"avaliacoes": solver_cobertura.estatisticas_guloso["avaliacoes"]}
+        elif solver == "exato_completa":
+            resultado = solver_cobertura.resolve_cobertura_completa_exata(**params)
+            cameras = resultado["solucao"]
+            extras = {"gap": resultado["gap"], "otimo": resultado["otimo"]}
+        elif solver == "exato_maxima":
+            resultado = solver_cobertura.resolve_cobertura_maxima_exata(**params)
+            cameras = resultado["solucao"]
+            extras = {"gap": resultado["gap"], "otimo": resultado["otimo"]}
+        else:
+            raise ValueError(f"Solver desconhecido: {solver}")
+
+    return {
+        "num_cameras": len(cameras),
+        "total_cobertura": indice.cobertura(indice.posicoes(cameras)),
+        "total_vertices": indice.n,
+        "vertices_selecionados": json.dumps(sorted(cameras)),
+        **extras,
+    }
+
+
+def executa(execucao: Dict, diretorio_partes: str) -> Dict:
+    """
+    Executa uma combinação da grade e grava o resultado em um arquivo
+    próprio, de forma atômica. Erros viram registros com status 'erro'
+    em vez de interromper o lote.
+    """
+    inicio = time.perf_counter()
+    registro = {
+        "id": execucao["id"],
+        "instancia": execucao["instancia"],
+        "solver": execucao["solver"],
+        "semente": execucao["semente"],
+        "params": json.dumps(execucao["params"], sort_keys=True),
+        **{f"param_{nome}": valor for nome, valor in execucao["params"].items()},
+    }
+    try:
+        registro.update(_resolve(execucao))
+        registro["status"] = "ok"
+    except Exception as e:
+        registro["status"] = "erro"
+        registro["erro"] = f"{type(e).__name__}: {e}"
+        registro["traceback"] = traceback.format_exc()
+    registro["tempo"] = time.perf_counter() - inicio
+
+    fd, temporario = tempfile.mkstemp(dir=diretorio_partes, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(registro, f)
+    os.replace(temporario, Path(diretorio_partes) / f"{execucao['id']}.json")
+    return registro
+
+
+def concluidas(diretorio_partes: Path) -> set:
+    """
+    Ids das execuções já concluídas com sucesso (as com erro são refeitas).
+    """
+    ids = set()
+    for arquivo in diretorio_partes.glob("*.json"):
+        with open(arquivo) as f:
+            if json.load(f).get("status") == "ok":
+                ids.add(arquivo.stem)
+    return ids
+
+
+def consolida(diretorio: Path) -> Path:
+    """
+    Junta os resultados de todas as execuções em um único arquivo colunar.
+
+    Usa Parquet quando há um engine instalado (pyarrow); sem ele, grava CSV.
+    """
+    registros = []
+    for arquivo in sorted((diretorio / "partes").glob("*.json")):
+        with open(arquivo) as f:
+            registros.append(json.load(f))
+    tabela = pd.DataFrame(registros)
+
+    saida = diretorio / "resultados.parquet"
+    try:
+        tabela.to_parquet(saida, index=False)
+    except ImportError:
+        saida = diretorio / "resultados.csv"
+        logger.warning(f"Nenhum engine de Parquet instalado (pip install pyarrow); gravando {saida.name}")
+        tabela.to_csv(saida, index=False)
+    return saida
+
+
+def executa_lote(grade: Dict, diretorio: Path, max_workers: int = None) -> Path:
+    """
+    Executa a grade em um ProcessPoolExecutor, retomando de onde parou.
+
+    Cada execução concluída fica em `diretorio/partes/<id>.json`; ao rodar
+    de novo a mesma grade, só as execuções que faltam (ou que falharam)
+    são refeitas. No fim os resultados são consolidados em uma tabela.
+
+    Args:
+        grade: Instâncias, solvers com listas de parâmetros e sementes
+        diretorio: Diretório do lote
+        max_workers: Número de processos (padrão: núcleos disponíveis)
+
+    Returns:
+        Path: Arquivo consolidado
+    """
+    diretorio_partes = diretorio / "partes"
+    diretorio_partes.mkdir(parents=True, exist_ok=True)
+    execucoes = expande_grade(grade)
+    feitas = concluidas(diretorio_partes)
+    pendentes = [e for e in execucoes if e["id"] not in feitas]
+    logger.info(f"{len(execucoes)} execuções na grade: {len(execucoes) - len(pendentes)} já concluídas, "
+                f"{len(pendentes)} pendentes")
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futuros = [executor.submit(executa, e, str(diretorio_partes)) for e in pendentes]
+        for k, futuro in enumerate(as_completed(futuros), 1):
+            registro = futuro.result()
+            detalhe = (f"{registro['total_cobertura']} cobertos com {registro['num_cameras']} câmeras"
+                       if registro["status"] == "ok" else registro["erro"])
+            logger.info(f"[{k}/{len(pendentes)}] {registro['solver']} {registro['params']} "
+                        f"semente={registro['semente']}: {detalhe} ({registro['tempo']:.2f} s)")
+
+    saida = consolida(diretorio)
+    logger.info(f"Resultados consolidados em {saida}")
+    return saida
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Executa uma grade de experimentos (instâncias × solvers × parâmetros × sementes)")
+    parser.add_argument("grade", nargs="?", type=Path, default=None,
+                        help="Arquivo JSON com a grade (padrão: experimentos do README)")
+    parser.add_argument("--saida", type=Path, default=RAIZ / "resultados" / "lote",
+                        help="Diretório do lote (resultados parciais e tabela consolidada)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Número de processos (padrão: núcleos disponíveis)")
+    args = parser.parse_args()
+
+    grade = GRADE_PADRAO
+    if args.grade is not None:
+        with open(args.grade) as f:
+            grade = json.load(f)
+    executa_lote(grade, args.saida, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from indice_vizinhanca import IndiceVizinhanca
+
+
+class GulosoEstocastico:
+    def __init__(self, indice: IndiceVizinhanca, candidatos: Iterable[int], demanda: Iterable[int],
+                 epsilon: float = 0.1, semente: Optional[int] = None):
+        """
+        Guloso estocástico ("lazier than lazy greedy") para a cobertura máxima.
+
+        Em cada uma das k rodadas só uma amostra aleatória de
+        s = ⌈(n/k)·ln(1/ε)⌉ candidatos restantes é avaliada, e entra o de
+        maior ganho na amostra. No total são ≈ n·ln(1/ε) avaliações,
+        independentemente de k, e a cobertura esperada é pelo menos
+        (1 - 1/e - ε) do ótimo.
+
+        Mesma interface do GulosoPreguicoso (seleciona, ganhos, coberto,
+        estatisticas), mas exige um orçamento.
+
+        Args:
+            indice: Índice das vizinhanças fechadas (ou de cobertura por raio)
+            candidatos: Posições dos vértices de instalação (conjunto J)
+            demanda: Posições dos vértices que contam na cobertura (conjunto I)
+            epsilon: Perda admitida na garantia de aproximação, em (0, 1)
+            semente: Semente do numpy.random.Generator da amostragem
+        """
+        if not 0 < epsilon < 1:
+            raise ValueError(f"epsilon deve estar em (0, 1): {epsilon}")
+        self.indice = indice
+        self.candidatos = np.asarray([int(v) for v in candidatos], dtype=np.int64)
+        self.demanda = np.zeros(indice.n, dtype=bool)
+        self.demanda[np.asarray(list(demanda), dtype=np.int64)] = True
+        self.epsilon = epsilon
+        self.rng = np.random.default_rng(semente)
+        self.estatisticas = {}
+
+    @property
+    def fator_aproximacao(self) -> float:
+        """
+        Garantia em esperança: 1 - 1/e - ε.
+        """
+        return 1 - 1 / math.e - self.epsilon
+
+    def tamanho_amostra(self, max_cameras: int) -> int:
+        n = len(self.candidatos)
+        return min(n, max(1, math.ceil(n / max_cameras * math.log(1 / self.epsilon))))
+
+    def _ganhos(self, amostra: np.ndarray, coberto: np.ndarray) -> np.ndarray:
+        """
+        Ganhos marginais de toda a amostra de uma vez: as linhas CSR dos
+        candidatos são concatenadas e os vértices novos somados por linha.
+        """
+        self.estatisticas["avaliacoes"] += len(amostra)
+        inicios = self.indice.indptr[amostra]
+        tamanhos = self.indice.indptr[amostra + 1] - inicios
+        deslocamentos = np.arange(int(tamanhos.sum())) - np.repeat(np.cumsum(tamanhos) - tamanhos, tamanhos)
+        novos = ~coberto[self.indice.indices[np.repeat(inicios, tamanhos) + deslocamentos]]
+        return np.bincount(np.repeat(np.arange(len(amostra)), tamanhos), weights=novos,
+                           minlength=len(amostra)).astype(np.int64)
+
+    def seleciona(self, max_cameras: int) -> List[int]:
+        """
+        Seleciona até max_cameras câmeras.
+
+        Se o melhor da amostra não tiver ganho, todos os candidatos
+        restantes são avaliados antes de parar: a seleção só termina cedo
+        quando de fato nenhum candidato acrescenta cobertura.
+
+        Returns:
+            List[int]: Posições das câmeras na ordem em que foram escolhidas
+        """
+        if max_cameras is None:
+            raise ValueError("O guloso estocástico precisa de um orçamento (max_cameras)")
+        self.coberto = ~self.demanda
+        selecionados = []
+        self.ganhos = []
+        tamanho = self.tamanho_amostra(max_cameras)
+        self.estatisticas = {"avaliacoes": 0, "avaliacoes_ingenuas": 0, "tamanho_amostra": tamanho,
+                             "epsilon": self.epsilon, "fator_aproximacao": self.fator_aproximacao}
+
+        # Candidatos ainda não escolhidos; a remoção troca com o último (O(1))
+        restantes = self.candidatos.copy()
+        livres = len(restantes)
+        while livres > 0 and len(selecionados) < max_cameras:
+            self.estatisticas["avaliacoes_ingenuas"] += livres
+            sorteio = self.rng.choice(livres, size=min(tamanho, livres), replace=False)
+            ganhos = self._ganhos(restantes[sorteio], self.coberto)
+            melhor = int(np.argmax(ganhos))
+            if ganhos[melhor] == 0:
+                sorteio = np.arange(livres)
+                ganhos = self._ganhos(restantes[:livres], self.coberto)
+                melhor = int(np.argmax(ganhos))
+                if ganhos[melhor] == 0:
+                    break
+
+            i = int(sorteio[melhor])
+            v = int(restantes[i])
+            livres -= 1
+            restantes[i], restantes[livres] = restantes[livres], restantes[i]
+            selecionados.append(v)
+            self.ganhos.append(int(ganhos[melhor]))
+            self.coberto[self.indice.vizinhanca(v)] = True
+
+        self.estatisticas["reavaliacoes_evitadas"] = (
+            self.estatisticas["avaliacoes_ingenuas"] - self.estatisticas["avaliacoes"]
+        )
+        return selecionados
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import heapq
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from indice_vizinhanca import IndiceVizinhanca
+
+
+class GulosoPreguicoso:
+    def __init__(self, indice: IndiceVizinhanca, candidatos: Iterable[int], demanda: Iterable[int]):
+        """
+        Motor guloso preguiçoso (CELF) para os problemas de cobertura.
+
+        O ganho marginal de cada candidato só pode diminuir à medida que
+        vértices são cobertos, então o ganho guardado no heap é um limite
+        superior do ganho real. A cada rodada apenas o topo do heap é
+        reavaliado, até que o topo esteja atualizado.
+
+        O desempate é o mesmo da varredura completa: em caso de ganhos
+        iguais vence o candidato que aparece primeiro em `candidatos`.
+
+        Args:
+            indice: Índice das vizinhanças fechadas
+            candidatos: Posições dos vértices de instalação (conjunto J), na ordem de desempate
+            demanda: Posições dos vértices que precisam ser cobertos (conjunto I)
+        """
+        self.indice = indice
+        self.candidatos = [int(v) for v in candidatos]
+        self.demanda = np.zeros(indice.n, dtype=bool)
+        self.demanda[np.asarray(list(demanda), dtype=np.int64)] = True
+        self.estatisticas = {}
+
+    def _ganho(self, v: int, coberto: np.ndarray) -> int:
+        self.estatisticas["avaliacoes"] += 1
+        return self.indice.ganho(v, coberto)
+
+    def seleciona(self, max_cameras: Optional[int] = None) -> List[int]:
+        """
+        Seleciona câmeras enquanto houver ganho positivo e orçamento.
+
+        Args:
+            max_cameras: Número máximo de câmeras (None para cobrir toda a demanda)
+
+        Returns:
+            List[int]: Posições das câmeras na ordem em que foram escolhidas
+        """
+        # Vértices fora da demanda contam como já cobertos
+        self.coberto = ~self.demanda
+        selecionados = []
+        self.ganhos = []
+        self.estatisticas = {"avaliacoes": 0, "avaliacoes_ingenuas": 0}
+
+        # Entradas: (-ganho, ordem em J, vértice, rodada em que o ganho foi calculado)
+        heap = [(-self._ganho(v, self.coberto), ordem, v, 0)
+                for ordem, v in enumerate(self.candidatos)]
+        heapq.heapify(heap)
+
+        while heap and (max_cameras is None or len(selecionados) < max_cameras):
+            rodada = len(selecionados)
+            # A varredura completa avaliaria todos os candidatos restantes
+            self.estatisticas["avaliacoes_ingenuas"] += len(heap)
+
+            while True:
+                ganho_negativo, ordem, v, rodada_avaliada = heap[0]
+                if rodada_avaliada == rodada:
+                    break
+                ganho = self._ganho(v, self.coberto)
+                heapq.heapreplace(heap, (-ganho, ordem, v, rodada))
+
+            if ganho_negativo == 0:
+                break
+
+            heapq.heappop(heap)
+            selecionados.append(v)
+            self.ganhos.append(-ganho_negativo)
+            self.coberto[self.indice.vizinhanca(v)] = True
+
+        self.estatisticas["reavaliacoes_evitadas"] = (
+            self.estatisticas["avaliacoes_ingenuas"] - self.estatisticas["avaliacoes"]
+        )
+        return selecionados
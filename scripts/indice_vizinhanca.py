@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+from typing import Iterable, List
+
+import networkx as nx
+import numpy as np
+from scipy import sparse
+
+
+class IndiceVizinhanca:
+    def __init__(self, nos: np.ndarray, indptr: np.ndarray, indices: np.ndarray, bitsets: bool = False):
+        """
+        Índice compacto das vizinhanças fechadas N[v] = vizinhos(v) ∪ {v}.
+
+        As vizinhanças ficam em formato CSR: a linha da posição p é
+        indices[indptr[p]:indptr[p+1]]. Todas as operações trabalham com
+        posições (0..n-1); `nos` guarda o id original de cada posição.
+
+        Args:
+            nos: Id do vértice em cada posição
+            indptr: Início de cada linha em `indices` (tamanho n+1)
+            indices: Posições dos vértices de cada vizinhança fechada
+            bitsets: Se True, também guarda cada linha como bitset compactado
+        """
+        self.nos = np.asarray(nos)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.n = len(self.nos)
+        self.posicao = {int(no): p for p, no in enumerate(self.nos.tolist())}
+        self.bits = self._constroi_bitsets() if bitsets else None
+
+    @classmethod
+    def _de_posicoes(cls, nos: np.ndarray, origens: np.ndarray, destinos: np.ndarray,
+                     bitsets: bool) -> "IndiceVizinhanca":
+        n = len(nos)
+        proprios = np.arange(n, dtype=np.int64)
+
+        # Arestas nos dois sentidos mais o próprio vértice, sem repetições
+        linhas = np.concatenate([origens, destinos, proprios])
+        colunas = np.concatenate([destinos, origens, proprios])
+        chaves = np.unique(linhas * n + colunas)
+        linhas, colunas = np.divmod(chaves, n)
+
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(linhas, minlength=n), out=indptr[1:])
+        return cls(nos, indptr, colunas.astype(np.int32), bitsets=bitsets)
+
+    @classmethod
+    def de_arestas(cls, nos: Iterable, origens: Iterable, destinos: Iterable, bitsets: bool = False) -> "IndiceVizinhanca":
+        """
+        Constrói o índice a partir da lista de ids e das arestas (não direcionadas).
+        """
+        nos = np.asarray(list(nos))
+        posicao = {int(no): p for p, no in enumerate(nos.tolist())}
+
+        origens = np.fromiter((posicao[int(u)] for u in origens), dtype=np.int64)
+        destinos = np.fromiter((posicao[int(v)] for v in destinos), dtype=np.int64)
+        return cls._de_posicoes(nos, origens, destinos, bitsets)
+
+    @classmethod
+    def de_adjacencia(cls, nos: np.ndarray, indptr: np.ndarray, indices: np.ndarray,
+                      bitsets: bool = False) -> "IndiceVizinhanca":
+        """
+        Constrói o índice a partir da adjacência em CSR (em posições), como a da instância binária.
+        """
+        origens = np.repeat(np.arange(len(nos), dtype=np.int64), np.diff(indptr))
+        return cls._de_posicoes(np.asarray(nos), origens, np.asarray(indices, dtype=np.int64), bitsets)
+
+    @classmethod
+    def de_grafo(cls, grafo: nx.Graph, bitsets: bool = False) -> "IndiceVizinhanca":
+        """
+        Constrói o índice a partir de um grafo do NetworkX.
+        """
+        arestas = list(grafo.edges())
+        return cls.de_arestas(
+            list(grafo.nodes()),
+            [u for u, _ in arestas],
+            [v for _, v in arestas],
+            bitsets=bitsets,
+        )
+
+    @classmethod
+    def de_json(cls, json_path: str, bitsets: bool = False) -> "IndiceVizinhanca":
+        """
+        Constrói o índice diretamente do arquivo da instância, sem passar pelo NetworkX.
+        """
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        return cls.de_arestas(
+            [node['id'] for node in data['nodes']],
+            [edge['source'] for edge in data['edges']],
+            [edge['target'] for edge in data['edges']],
+            bitsets=bitsets,
+        )
+
+    def _constroi_bitsets(self) -> np.ndarray:
+        bits = np.zeros((self.n, (self.n + 7) // 8), dtype=np.uint8)
+        linhas = np.repeat(np.arange(self.n), np.diff(self.indptr))
+        # Mesma ordem de bits de np.packbits (bit mais significativo primeiro)
+        np.bitwise_or.at(bits, (linhas, self.indices >> 3), (0x80 >> (self.indices & 7)).astype(np.uint8))
+        return bits
+
+    def vizinhanca(self, p: int) -> np.ndarray:
+        """
+        Retorna as posições de N[p].
+        """
+        return self.indices[self.indptr[p]:self.indptr[p + 1]]
+
+    def graus(self) -> np.ndarray:
+        """
+        Retorna |N[p]| para todas as posições.
+        """
+        return np.diff(self.indptr)
+
+    def posicoes(self, ids: Iterable) -> np.ndarray:
+        """
+        Converte ids de vértices em posições do índice.
+        """
+        return np.fromiter((self.posicao[int(v)] for v in ids), dtype=np.int64)
+
+    def ids(self, posicoes: Iterable) -> List[int]:
+        """
+        Converte posições do índice nos ids originais dos vértices.
+        """
+        return self.nos[np.asarray(list(posicoes), dtype=np.int64)].tolist()
+
+    def mascara_cobertura(self, cameras: Iterable[int]) -> np.ndarray:
+        """
+        Máscara booleana dos vértices cobertos pelas câmeras (posições).
+        """
+        cameras = np.asarray(list(cameras), dtype=np.int64)
+        if self.bits is not None:
+            if len(cameras) == 0:
+                return np.zeros(self.n, dtype=bool)
+            linha = np.bitwise_or.reduce(self.bits[cameras], axis=0)
+            return np.unpackbits(linha, count=self.n).astype(bool)
+
+        coberto = np.zeros(self.n, dtype=bool)
+        for p in cameras:
+            coberto[self.indices[self.indptr[p]:self.indptr[p + 1]]] = True
+        return coberto
+
+    def cobertura(self, cameras: Iterable[int]) -> int:
+        """
+        Número de vértices cobertos pelas câmeras (posições).
+        """
+        return int(np.count_nonzero(self.mascara_cobertura(cameras)))
+
+    def ganho(self, p: int, coberto: np.ndarray) -> int:
+        """
+        Ganho marginal de instalar uma câmera em p dada a máscara de vértices já cobertos.
+        """
+        return int(np.count_nonzero(~coberto[self.indices[self.indptr[p]:self.indptr[p + 1]]]))
+
+    def memoria_bytes(self) -> int:
+        """
+        Bytes ocupados pelos arrays do índice (ids, CSR e bitsets, se houver).
+        Cresce com |V| + |E|; só os bitsets crescem com |V|².
+        """
+        total = self.nos.nbytes + self.indptr.nbytes + self.indices.nbytes
+        if self.bits is not None:
+            total += self.bits.nbytes
+        return int(total)
+
+    def matriz_csr(self, dtype=np.int32) -> sparse.csr_matrix:
+        """
+        Matriz esparsa n×n com A[j, i] = 1 se a câmera em j cobre i.
+        """
+        dados = np.ones(len(self.indices), dtype=dtype)
+        return sparse.csr_matrix((dados, self.indices, self.indptr), shape=(self.n, self.n))
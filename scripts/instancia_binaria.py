@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import json
+import struct
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import networkx as nx
+import numpy as np
+
+from indice_vizinhanca import IndiceVizinhanca
+
+# Formato binário da instância:
+#   [8 bytes: MAGICO] [8 bytes: tamanho do cabeçalho] [cabeçalho JSON] [arrays]
+# O cabeçalho guarda metadados, a tabela de nomes de ruas (internados) e, para
+# cada array, dtype, shape e offset. Os arrays começam alinhados em 64 bytes,
+# então podem ser lidos direto do arquivo mapeado em memória, sem cópia.
+MAGICO = b"CAMINST1"
+ALINHAMENTO = 64
+
+
+def _alinha(posicao: int) -> int:
+    return (posicao + ALINHAMENTO - 1) // ALINHAMENTO * ALINHAMENTO
+
+
+def _adjacencia_csr(n: int, origens: np.ndarray, destinos: np.ndarray, pesos: np.ndarray):
+    """
+    Adjacência não direcionada em CSR (posições). Entre arestas paralelas
+    fica o menor comprimento, que é o que importa para caminhos mínimos.
+    """
+    linhas = np.concatenate([origens, destinos])
+    colunas = np.concatenate([destinos, origens])
+    valores = np.concatenate([pesos, pesos])
+
+    ordem = np.lexsort((valores, colunas, linhas))
+    linhas, colunas, valores = linhas[ordem], colunas[ordem], valores[ordem]
+    primeiro = np.ones(len(linhas), dtype=bool)
+    primeiro[1:] = (linhas[1:] != linhas[:-1]) | (colunas[1:] != colunas[:-1])
+    linhas, colunas, valores = linhas[primeiro], colunas[primeiro], valores[primeiro]
+
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(linhas, minlength=n), out=indptr[1:])
+    return indptr, colunas.astype(np.int32), valores.astype(np.float64)
+
+
+def salva_instancia_binaria(caminho: str, nos, lat, lon, origens, destinos, pesos, nomes: List,
+                            metadata: Optional[Dict] = None, vertex_cover=None):
+    """
+    Grava a instância no formato binário.
+
+    Args:
+        caminho: Arquivo de saída
+        nos, lat, lon: Id e coordenadas de cada vértice
+        origens, destinos, pesos: Arestas da instância (ids dos vértices e comprimento em metros)
+        nomes: Nome de cada aresta (texto, lista de textos ou '')
+        metadata: Metadados da instância
+        vertex_cover: Ids da cobertura de vértices, se calculada
+    """
+    nos = np.asarray(nos, dtype=np.int64)
+    posicao = {int(no): p for p, no in enumerate(nos.tolist())}
+    origens = np.fromiter((posicao[int(u)] for u in origens), dtype=np.int64)
+    destinos = np.fromiter((posicao[int(v)] for v in destinos), dtype=np.int64)
+    pesos = np.asarray(pesos, dtype=np.float64)
+
+    # Nomes de ruas internados: cada aresta guarda o índice na tabela
+    tabela, indice_nome = [], {}
+    ids_nomes = np.empty(len(nomes), dtype=np.int32)
+    for k, nome in enumerate(nomes):
+        chave = json.dumps(nome, ensure_ascii=False)
+        if chave not in indice_nome:
+            indice_nome[chave] = len(tabela)
+            tabela.append(nome)
+        ids_nomes[k] = indice_nome[chave]
+
+    indptr, indices, pesos_adj = _adjacencia_csr(len(nos), origens, destinos, pesos)
+    arrays = {
+        "nos": nos,
+        "lat": np.asarray(lat, dtype=np.float64),
+        "lon": np.asarray(lon, dtype=np.float64),
+        "origens": origens.astype(np.int32),
+        "destinos": destinos.astype(np.int32),
+        "pesos": pesos,
+        "nomes": ids_nomes,
+        "indptr": indptr,
+        "indices": indices,
+        "pesos_adjacencia": pesos_adj,
+    }
+    if vertex_cover is not None:
+        arrays["vertex_cover"] = np.asarray(list(vertex_cover), dtype=np.int64)
+
+    cabecalho = {
+        "versao": 1,
+        "metadata": metadata or {},
+        "tabela_nomes": tabela,
+        "arrays": {},
+    }
+    # O offset dos arrays depende do tamanho do cabeçalho, que depende dos offsets;
+    # os offsets são calculados com folga suficiente para o cabeçalho final
+    folga = 0
+    while True:
+        inicio = _alinha(16 + len(json.dumps(cabecalho, ensure_ascii=False).encode("utf-8")) + folga)
+        posicao_atual = inicio
+        for nome, array in arrays.items():
+            cabecalho["arrays"][nome] = {
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+                "offset": posicao_atual,
+            }
+            posicao_atual = _alinha(posicao_atual + array.nbytes)
+        bytes_cabecalho = json.dumps(cabecalho, ensure_ascii=False).encode("utf-8")
+        if 16 + len(bytes_cabecalho) <= inicio:
+            break
+        folga += ALINHAMENTO
+
+    with open(caminho, "wb") as f:
+        f.write(MAGICO)
+        f.write(struct.pack("<Q", len(bytes_cabecalho)))
+        f.write(bytes_cabecalho)
+        for nome, array in arrays.items():
+            f.seek(cabecalho["arrays"][nome]["offset"])
+            f.write(np.ascontiguousarray(array).tobytes())
+
+
+class InstanciaBinaria:
+    def __init__(self, caminho: str):
+        """
+        Abre uma instância binária mapeando o arquivo em memória.
+        Os arrays são visões do arquivo: nada é copiado nem interpretado
+        até ser usado.
+
+        Args:
+            caminho: Arquivo da instância binária
+        """
+        self.caminho = str(caminho)
+        with open(self.caminho, "rb") as f:
+            if f.read(8) != MAGICO:
+                raise ValueError(f"{self.caminho} não é uma instância binária")
+            tamanho = struct.unpack("<Q", f.read(8))[0]
+            cabecalho = json.loads(f.read(tamanho).decode("utf-8"))
+
+        self.metadata = cabecalho["metadata"]
+        self.tabela_nomes = cabecalho["tabela_nomes"]
+        self._mapa = np.memmap(self.caminho, dtype=np.uint8, mode="r")
+        self.arrays = {}
+        for nome, info in cabecalho["arrays"].items():
+            dtype = np.dtype(info["dtype"])
+            quantidade = int(np.prod(info["shape"], dtype=np.int64))
+            inicio = info["offset"]
+            self.arrays[nome] = (self._mapa[inicio:inicio + quantidade * dtype.itemsize]
+                                 .view(dtype).reshape(info["shape"]))
+
+        self.nos = self.arrays["nos"]
+        self.lat = self.arrays["lat"]
+        self.lon = self.arrays["lon"]
+        self.origens = self.arrays["origens"]
+        self.destinos = self.arrays["destinos"]
+        self.pesos = self.arrays["pesos"]
+        self.indptr = self.arrays["indptr"]
+        self.indices = self.arrays["indices"]
+        self.pesos_adjacencia = self.arrays["pesos_adjacencia"]
+
+    @property
+    def num_vertices(self) -> int:
+        return len(self.arrays["nos"])
+
+    @property
+    def num_arestas(self) -> int:
+        return len(self.arrays["origens"])
+
+    def nomes_arestas(self) -> List:
+        """
+        Nome de cada aresta, reconstruído a partir da tabela internada.
+        """
+        return [self.tabela_nomes[k] for k in self.arrays["nomes"].tolist()]
+
+    def vertex_cover(self) -> List[int]:
+        if "vertex_cover" not in self.arrays:
+            return []
+        return self.arrays["vertex_cover"].tolist()
+
+    def indice(self, bitsets: bool = False) -> IndiceVizinhanca:
+        """
+        Índice das vizinhanças fechadas construído direto da adjacência CSR.
+        """
+        return IndiceVizinhanca.de_adjacencia(self.nos, self.indptr, self.indices, bitsets=bitsets)
+
+    def posicoes(self) -> Dict[int, tuple]:
+        """
+        Posições (lon, lat) para desenhar o grafo.
+        """
+        return dict(zip(self.nos.tolist(), zip(self.lon.tolist(), self.lat.tolist())))
+
+    def grafo(self) -> nx.Graph:
+        """
+        Grafo do NetworkX com os mesmos atributos de load_graph_from_json.
+        """
+        ids = self.nos.tolist()
+        G = nx.Graph()
+        G.add_nodes_from(
+            (no, {"lat": lat, "lon": lon})
+            for no, lat, lon in zip(ids, self.lat.tolist(), self.lon.tolist())
+        )
+        G.add_edges_from(
+            (ids[u], ids[v], {"weight": peso, "name": nome})
+            for u, v, peso, nome in zip(self.origens.tolist(), self.destinos.tolist(),
+                                        self.pesos.tolist(), self.nomes_arestas())
+        )
+        return G
+
+    def para_dict(self) -> Dict:
+        """
+        Instância no mesmo formato do ondina.json.
+        """
+        ids = self.nos.tolist()
+        instancia = {
+            "nodes": [
+                {"id": no, "lat": lat, "lon": lon}
+                for no, lat, lon in zip(ids, self.lat.tolist(), self.lon.tolist())
+            ],
+            "edges": [
+                {"source": ids[u], "target": ids[v], "weight": peso, "name": nome}
+                for u, v, peso, nome in zip(self.origens.tolist(), self.destinos.tolist(),
+                                            self.pesos.tolist(), self.nomes_arestas())
+            ],
+            "metadata": self.metadata,
+        }
+        if "vertex_cover" in self.arrays:
+            instancia["vertex_cover"] = self.vertex_cover()
+        return instancia
+
+    def exporta_json(self, caminho: str):
+        """
+        Exporta a instância para o formato JSON.
+        """
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(self.para_dict(), f, indent=2, ensure_ascii=False)
+
+
+def converte_json(json_path: str, caminho: str):
+    """
+    Converte uma instância JSON para o formato binário.
+    """
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    salva_instancia_binaria(
+        caminho,
+        nos=[node["id"] for node in data["nodes"]],
+        lat=[node["lat"] for node in data["nodes"]],
+        lon=[node["lon"] for node in data["nodes"]],
+        origens=[edge["source"] for edge in data["edges"]],
+        destinos=[edge["target"] for edge in data["edges"]],
+        pesos=[edge["weight"] for edge in data["edges"]],
+        nomes=[edge.get("name", "") for edge in data["edges"]],
+        metadata=data.get("metadata"),
+        vertex_cover=data.get("vertex_cover"),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Conversão entre a instância JSON e o formato binário")
+    parser.add_argument("entrada", type=Path, help="Instância .json (gera .bin) ou .bin (gera .json)")
+    parser.add_argument("--saida", type=Path, default=None)
+    args = parser.parse_args()
+
+    if args.entrada.suffix == ".json":
+        saida = args.saida or args.entrada.with_suffix(".bin")
+        converte_json(str(args.entrada), str(saida))
+    else:
+        saida = args.saida or args.entrada.with_suffix(".json")
+        InstanciaBinaria(str(args.entrada)).exporta_json(str(saida))
+    print(f"Instância salva em: {saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+from typing import Dict, Iterable, Optional
+
+# Formato JSON Lines da instância: um registro por linha, na ordem
+#   {"tipo": "metadata", ...}
+#   {"tipo": "no", "id": ..., "lat": ..., "lon": ...}          (um por vértice)
+#   {"tipo": "aresta", "source": ..., "target": ..., ...}      (uma por aresta)
+# Cada linha é escrita assim que é gerada, então a memória de escrita não
+# depende do tamanho da instância.
+TAMANHO_BUFFER = 1 << 20
+
+
+def escreve_jsonl(caminho: str, metadata: Optional[Dict], nos: Iterable[Dict], arestas: Iterable[Dict]):
+    """
+    Grava a instância em JSON Lines consumindo os geradores de nós e arestas.
+
+    Args:
+        caminho: Arquivo de saída
+        metadata: Metadados da instância
+        nos: Dicionários {id, lat, lon}
+        arestas: Dicionários {source, target, weight, name}
+
+    Returns:
+        Tupla (número de nós, número de arestas)
+    """
+    num_nos = num_arestas = 0
+    with open(caminho, 'w', encoding='utf-8', buffering=TAMANHO_BUFFER) as f:
+        f.write(json.dumps({"tipo": "metadata", **(metadata or {})}, ensure_ascii=False) + "\n")
+        for no in nos:
+            f.write(json.dumps({"tipo": "no", **no}, ensure_ascii=False) + "\n")
+            num_nos += 1
+        for aresta in arestas:
+            f.write(json.dumps({"tipo": "aresta", **aresta}, ensure_ascii=False) + "\n")
+            num_arestas += 1
+    return num_nos, num_arestas
+
+
+def le_jsonl(caminho: str) -> Dict:
+    """
+    Lê uma instância JSON Lines no mesmo formato do ondina.json.
+    """
+    instancia = {"nodes": [], "edges": [], "metadata": {}}
+    with open(caminho, 'r', encoding='utf-8') as f:
+        for linha in f:
+            if not linha.strip():
+                continue
+            registro = json.loads(linha)
+            tipo = registro.pop("tipo")
+            if tipo == "no":
+                instancia["nodes"].append(registro)
+            elif tipo == "aresta":
+                instancia["edges"].append(registro)
+            elif tipo == "metadata":
+                instancia["metadata"] = registro
+    return instancia
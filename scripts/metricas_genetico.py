@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import cProfile
+import csv
+import io
+import json
+import logging
+import pstats
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class Callback:
+    """
+    Ganchos chamados por GeneticVertexCover.run. As subclasses sobrescrevem
+    só os que usam.
+    """
+
+    def inicio(self, ga) -> None:
+        """Antes da primeira geração."""
+
+    def geracao(self, ga, registro: Dict, population: List, fitness: List[float]) -> None:
+        """
+        Ao fim de cada geração.
+
+        Args:
+            ga: O GeneticVertexCover em execução
+            registro: Número da geração, tempo total e por fase (avaliação,
+                seleção, crossover, mutação), avaliações acumuladas e melhor fitness
+            population: População avaliada nesta geração
+            fitness: Fitness de cada indivíduo de `population`
+        """
+
+    def fim(self, ga) -> None:
+        """Depois da última geração."""
+
+
+class MetricasGeracao(Callback):
+    def __init__(self, diversidade: bool = True, memoria: bool = False):
+        """
+        Registra, a cada geração, os tempos por fase, a distribuição da
+        fitness, a diversidade da população e o número de avaliações.
+
+        Args:
+            diversidade: Calcula a diversidade (custa uma passada pela população)
+            memoria: Registra a memória alocada (tracemalloc) ao fim de cada geração
+        """
+        self.diversidade = diversidade
+        self.memoria = memoria
+        self.registros: List[Dict] = []
+        self._iniciou_tracemalloc = False
+
+    def inicio(self, ga) -> None:
+        if self.memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._iniciou_tracemalloc = True
+
+    def geracao(self, ga, registro, population, fitness) -> None:
+        registro = dict(registro)
+        valores = np.array(fitness, dtype=float)
+        validos = valores[np.isfinite(valores)]
+        registro["fitness_min"] = float(validos.min()) if len(validos) else None
+        registro["fitness_media"] = float(validos.mean()) if len(validos) else None
+        registro["fitness_max"] = float(validos.max()) if len(validos) else None
+        registro["invalidos"] = int(len(valores) - len(validos))
+        if ga.cache is not None:
+            registro["cache_acertos"] = ga.cache.acertos
+            registro["cache_taxa_acertos"] = ga.cache.taxa_acertos
+        if self.diversidade:
+            registro.update(diversidade(ga, population))
+        if self.memoria:
+            atual, pico = tracemalloc.get_traced_memory()
+            registro["memoria_atual"] = atual
+            registro["memoria_pico"] = pico
+        self.registros.append(registro)
+
+    def fim(self, ga) -> None:
+        if self._iniciou_tracemalloc:
+            tracemalloc.stop()
+            self._iniciou_tracemalloc = False
+
+    def resumo(self) -> Dict:
+        """
+        Tempo total por fase e fração do tempo de cada uma.
+        """
+        fases = ["avaliacao", "selecao", "crossover", "mutacao"]
+        totais = {fase: sum(r[f"tempo_{fase}"] for r in self.registros) for fase in fases}
+        total = sum(r["tempo"] for r in self.registros)
+        return {
+            "geracoes": len(self.registros),
+            "tempo": total,
+            "avaliacoes": self.registros[-1]["avaliacoes"] if self.registros else 0,
+            **{f"tempo_{fase}": t for fase, t in totais.items()},
+            **{f"fracao_{fase}": (t / total if total else 0.0) for fase, t in totais.items()},
+        }
+
+    def salva(self, caminho) -> Path:
+        """
+        Grava o traço por geração em JSON (com o resumo) ou CSV, conforme a extensão.
+        """
+        caminho = Path(caminho)
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        if caminho.suffix == ".csv":
+            colunas = list(dict.fromkeys(c for r in self.registros for c in r))
+            with open(caminho, "w", newline="") as f:
+                escritor = csv.DictWriter(f, fieldnames=colunas)
+                escritor.writeheader()
+                escritor.writerows(self.registros)
+        else:
+            with open(caminho, "w") as f:
+                json.dump({"resumo": self.resumo(), "geracoes": self.registros}, f, indent=2)
+        return caminho
+
+
+def diversidade(ga, population) -> Dict:
+    """
+    Diversidade da população a partir da frequência de cada posição.
+
+    Com c_v indivíduos contendo a câmera v, o número de pares que diferem
+    em v é c_v·(N - c_v); somando e dividindo pelo número de pares sai a
+    distância de Hamming média, aqui normalizada pelo máximo 2·max_cameras.
+
+    Returns:
+        Dict: Distância média normalizada ('diversidade') e número de indivíduos distintos
+    """
+    cameras = [ga.cameras(ind) for ind in population]
+    tamanho = len(cameras)
+    if tamanho < 2:
+        return {"diversidade": 0.0, "distintos": tamanho}
+    contagem = np.bincount(np.concatenate([np.asarray(c, dtype=np.int64) for c in cameras]),
+                           minlength=ga.num_vertices)
+    pares = tamanho * (tamanho - 1) / 2
+    distancia_media = float(np.sum(contagem * (tamanho - contagem))) / pares
+    return {
+        "diversidade": distancia_media / (2 * ga.max_cameras),
+        "distintos": len({tuple(c) for c in cameras}),
+    }
+
+
+class PerfilCProfile(Callback):
+    def __init__(self, arquivo: Optional[str] = None, ordenacao: str = "cumulative", linhas: int = 20):
+        """
+        Executa o run() sob o cProfile.
+
+        Args:
+            arquivo: Onde gravar as estatísticas (formato pstats, ex.: para snakeviz)
+            ordenacao: Critério de ordenação do relatório no log
+            linhas: Número de funções no relatório
+        """
+        self.arquivo = arquivo
+        self.ordenacao = ordenacao
+        self.linhas = linhas
+        self.perfil = cProfile.Profile()
+
+    def inicio(self, ga) -> None:
+        self.perfil.enable()
+
+    def fim(self, ga) -> None:
+        self.perfil.disable()
+        if self.arquivo:
+            self.perfil.dump_stats(self.arquivo)
+            logger.info(f"Perfil salvo em {self.arquivo}")
+        logger.info(self.relatorio())
+
+    def relatorio(self) -> str:
+        saida = io.StringIO()
+        pstats.Stats(self.perfil, stream=saida).sort_stats(self.ordenacao).print_stats(self.linhas)
+        return saida.getvalue()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import Dict, Iterable, List, Optional, Set
+
+from indice_vizinhanca import IndiceVizinhanca
+
+
+class ReducaoInstancia:
+    def __init__(self, indice: IndiceVizinhanca, modo: str = 'completa',
+                 candidatos: Optional[Iterable[int]] = None, demanda: Optional[Iterable[int]] = None):
+        """
+        Redução (kernelização) da instância antes dos solvers de cobertura.
+
+        Regras aplicadas até não haver mais mudanças:
+        - candidato dominado: se tudo o que j cobre também é coberto por j',
+          j sai de J (com vizinhanças iguais, gêmeos, fica o de menor posição);
+        - demanda dominada (só cobertura completa): se todo candidato que
+          cobre i' também cobre i, cobrir i' já garante i, então i sai de I;
+        - seleção forçada (só cobertura completa): se apenas um candidato
+          cobre i, ele entra na solução. Em uma rua sem saída a folha é
+          dominada pelo vizinho, que acaba forçado por esta regra.
+
+        Na cobertura máxima o orçamento impede seleções forçadas e todos os
+        vértices contam, então só a dominância entre candidatos é usada.
+
+        Args:
+            indice: Índice das vizinhanças fechadas
+            modo: 'completa' ou 'maxima'
+            candidatos: Posições dos vértices de instalação (padrão: todos)
+            demanda: Posições dos vértices de demanda (padrão: todos)
+        """
+        self.indice = indice
+        self.modo = modo
+        todos = range(indice.n)
+        self.candidatos = set(int(v) for v in (candidatos if candidatos is not None else todos))
+        self.demanda = set(int(v) for v in (demanda if demanda is not None else todos))
+        self.forcados: List[int] = []
+        self.representante: Dict[int, int] = {}  # candidato gêmeo removido -> candidato mantido
+        self.estatisticas = {
+            "candidatos_iniciais": len(self.candidatos),
+            "demanda_inicial": len(self.demanda),
+        }
+
+        matriz = indice.matriz_csr()
+        transposta = matriz.T.tocsr()
+        # cobre[j]: demanda coberta por j; cobertores[i]: candidatos que cobrem i
+        self.cobre = {
+            j: set(matriz.indices[matriz.indptr[j]:matriz.indptr[j + 1]].tolist()) & self.demanda
+            for j in self.candidatos
+        }
+        self.cobertores = {
+            i: set(transposta.indices[transposta.indptr[i]:transposta.indptr[i + 1]].tolist()) & self.candidatos
+            for i in self.demanda
+        }
+
+    def _remove_candidato(self, j: int):
+        for i in self.cobre.pop(j):
+            self.cobertores[i].discard(j)
+        self.candidatos.discard(j)
+
+    def _remove_demanda(self, i: int):
+        for j in self.cobertores.pop(i):
+            self.cobre[j].discard(i)
+        self.demanda.discard(i)
+
+    def _dominancia_candidatos(self) -> bool:
+        mudou = False
+        for j in sorted(self.candidatos):
+            if j not in self.candidatos:
+                continue
+            cobre_j = self.cobre[j]
+            if not cobre_j:
+                self._remove_candidato(j)
+                mudou = True
+                continue
+            # Quem domina j precisa cobrir o vértice de j com menos cobertores
+            pivo = min(cobre_j, key=lambda i: len(self.cobertores[i]))
+            for outro in sorted(self.cobertores[pivo]):
+                if outro == j or not cobre_j <= self.cobre[outro]:
+                    continue
+                if cobre_j == self.cobre[outro]:
+                    if outro > j:
+                        continue
+                    self.representante[j] = outro
+                self._remove_candidato(j)
+                mudou = True
+                break
+        return mudou
+
+    def _dominancia_demanda(self) -> bool:
+        mudou = False
+        for i in sorted(self.demanda):
+            if i not in self.demanda:
+                continue
+            cobertores_i = self.cobertores[i]
+            if not cobertores_i:
+                continue
+            pivo = min(cobertores_i, key=lambda j: len(self.cobre[j]))
+            for outro in sorted(self.cobre[pivo]):
+                if outro == i or not self.cobertores[outro] <= cobertores_i:
+                    continue
+                if self.cobertores[outro] == cobertores_i and outro > i:
+                    continue
+                self._remove_demanda(i)
+                mudou = True
+                break
+        return mudou
+
+    def _selecoes_forcadas(self) -> bool:
+        mudou = False
+        for i in sorted(self.demanda):
+            if i not in self.demanda or len(self.cobertores[i]) != 1:
+                continue
+            j = next(iter(self.cobertores[i]))
+            self.forcados.append(j)
+            for coberto in list(self.cobre[j]):
+                self._remove_demanda(coberto)
+            self._remove_candidato(j)
+            mudou = True
+        return mudou
+
+    def reduz(self) -> "ReducaoInstancia":
+        """
+        Aplica as regras até o ponto fixo.
+        """
+        mudou = True
+        while mudou:
+            mudou = self._dominancia_candidatos()
+            if self.modo == 'completa':
+                mudou = self._dominancia_demanda() or mudou
+                mudou = self._selecoes_forcadas() or mudou
+
+        self.estatisticas.update({
+            "candidatos_finais": len(self.candidatos),
+            "demanda_final": len(self.demanda),
+            "forcados": len(self.forcados),
+            "gemeos": len(self.representante),
+        })
+        return self
+
+    def ids_candidatos(self) -> List[int]:
+        """
+        Ids originais do conjunto J reduzido.
+        """
+        return self.indice.ids(sorted(self.candidatos))
+
+    def ids_demanda(self) -> List[int]:
+        """
+        Ids originais do conjunto I reduzido.
+        """
+        return self.indice.ids(sorted(self.demanda))
+
+    def eleva(self, solucao_ids: Iterable[int]) -> Set[int]:
+        """
+        Leva uma solução da instância reduzida de volta à original: as
+        seleções forçadas são somadas aos ids escolhidos pelo solver.
+        """
+        return set(self.indice.ids(self.forcados)) | set(int(v) for v in solucao_ids)
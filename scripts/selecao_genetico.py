@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+
+def elites(fitness: np.ndarray, quantidade: int, desempate: np.ndarray = None) -> np.ndarray:
+    """
+    Posições dos `quantidade` indivíduos de maior fitness, do melhor para o pior.
+
+    A separação é feita com argpartition (O(N)) e só os escolhidos são
+    ordenados. Entre fitness iguais vence o maior `desempate` (se dado) e,
+    por fim, a menor posição, inclusive na fronteira.
+    """
+    quantidade = min(quantidade, len(fitness))
+    if quantidade <= 0:
+        return np.zeros(0, dtype=np.int64)
+    if quantidade < len(fitness):
+        # O argpartition só garante o valor da fronteira, não quais empatados
+        # nela ficam: entram todos acima dela e os melhores empatados nela
+        limiar = fitness[np.argpartition(-fitness, quantidade - 1)[quantidade - 1]]
+        acima = np.flatnonzero(fitness > limiar)
+        empatados = np.flatnonzero(fitness == limiar)
+        if desempate is not None:
+            empatados = empatados[np.lexsort((empatados, -desempate[empatados]))]
+        escolhidos = np.concatenate([acima, empatados[:quantidade - len(acima)]])
+    else:
+        escolhidos = np.arange(len(fitness))
+    if desempate is None:
+        return escolhidos[np.lexsort((escolhidos, -fitness[escolhidos]))]
+    return escolhidos[np.lexsort((escolhidos, -desempate[escolhidos], -fitness[escolhidos]))]
+
+
+class SelecaoTopo:
+    def __init__(self, tamanho: int = 50):
+        """
+        Pais sorteados uniformemente entre os `tamanho` melhores (a seleção
+        original do run(): random.choice sobre os 50 primeiros).
+        """
+        self.tamanho = tamanho
+
+    def sorteia(self, fitness: np.ndarray, quantidade: int, rng: np.random.Generator,
+                desempate: np.ndarray = None) -> np.ndarray:
+        melhores = elites(fitness, self.tamanho, desempate)
+        return melhores[rng.integers(len(melhores), size=quantidade)]
+
+
+class SelecaoTorneio:
+    def __init__(self, tamanho: int = 2):
+        """
+        Torneio: cada pai é o melhor de `tamanho` indivíduos sorteados com
+        reposição (empates ficam com o primeiro sorteado; `desempate` não é usado).
+        """
+        self.tamanho = tamanho
+
+    def sorteia(self, fitness: np.ndarray, quantidade: int, rng: np.random.Generator,
+                desempate: np.ndarray = None) -> np.ndarray:
+        participantes = rng.integers(len(fitness), size=(quantidade, self.tamanho))
+        vencedor = np.argmax(fitness[participantes], axis=1)
+        return participantes[np.arange(quantidade), vencedor]
+
+
+class SelecaoSUS:
+    """
+    Amostragem universal estocástica: `quantidade` ponteiros igualmente
+    espaçados sobre a roleta, com um único sorteio de início. A fatia de
+    cada indivíduo é a fitness acima da pior da geração (inválidos ficam
+    sem fatia); os pais saem embaralhados para formar pares aleatórios.
+    A roleta só depende da fitness: `desempate` não é usado.
+    """
+
+    def sorteia(self, fitness: np.ndarray, quantidade: int, rng: np.random.Generator,
+                desempate: np.ndarray = None) -> np.ndarray:
+        validos = np.isfinite(fitness)
+        pesos = np.zeros(len(fitness))
+        if validos.any():
+            pesos[validos] = fitness[validos] - fitness[validos].min()
+        if pesos.sum() <= 0:
+            # Todos iguais: a roleta é uniforme entre os válidos (ou entre todos)
+            pesos = validos.astype(np.float64) if validos.any() else np.ones(len(fitness))
+        acumulado = np.cumsum(pesos)
+        passo = acumulado[-1] / quantidade
+        ponteiros = rng.uniform(0, passo) + passo * np.arange(quantidade)
+        escolhidos = np.searchsorted(acumulado, ponteiros, side='right')
+        return rng.permutation(np.minimum(escolhidos, len(fitness) - 1))
+
+
+SELECOES = {"topo": SelecaoTopo, "torneio": SelecaoTorneio, "sus": SelecaoSUS}
+
+
+def cria_selecao(nome: str, **params):
+    """
+    Cria a estratégia de seleção pelo nome ('topo', 'torneio' ou 'sus').
+    """
+    if nome not in SELECOES:
+        raise ValueError(f"Seleção desconhecida: {nome} (use {', '.join(SELECOES)})")
+    return SELECOES[nome](**params)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import heapq
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from guloso_preguicoso import GulosoPreguicoso
+from indice_vizinhanca import IndiceVizinhanca
+
+# Estratégias de semeadura da população inicial do genético
+ESTRATEGIAS = ("guloso", "guloso_aleatorio", "grau")
+
+
+def guloso(indice: IndiceVizinhanca, candidatos: Sequence[int], max_cameras: int) -> List[int]:
+    """
+    Solução gulosa (CELF) da cobertura máxima, completada com candidatos
+    quaisquer se a cobertura total for atingida antes do orçamento.
+    """
+    escolhidos = GulosoPreguicoso(indice, candidatos, range(indice.n)).seleciona(max_cameras)
+    return _completa(escolhidos, candidatos, max_cameras)
+
+
+def guloso_aleatorio(indice: IndiceVizinhanca, candidatos: Sequence[int], max_cameras: int, r: int,
+                     rng: np.random.Generator) -> List[int]:
+    """
+    Guloso aleatorizado: em cada rodada sorteia um dos r candidatos de maior ganho.
+
+    Usa a mesma avaliação preguiçosa do CELF: um candidato retirado do heap
+    com ganho já atualizado nesta rodada é maior ou igual a todos os
+    limites que ficaram, então os r primeiros atualizados são os r melhores.
+    """
+    coberto = np.zeros(indice.n, dtype=bool)
+    heap = [(-indice.ganho(v, coberto), ordem, v, 0) for ordem, v in enumerate(candidatos)]
+    heapq.heapify(heap)
+    escolhidos = []
+    while heap and len(escolhidos) < max_cameras:
+        rodada = len(escolhidos)
+        melhores = []
+        while heap and len(melhores) < r:
+            entrada = heapq.heappop(heap)
+            if entrada[3] == rodada:
+                melhores.append(entrada)
+            else:
+                _, ordem, v, _ = entrada
+                heapq.heappush(heap, (-indice.ganho(v, coberto), ordem, v, rodada))
+        melhores = [entrada for entrada in melhores if entrada[0] < 0]
+        if not melhores:
+            break
+        k = int(rng.integers(len(melhores)))
+        v = melhores.pop(k)[2]
+        for entrada in melhores:
+            heapq.heappush(heap, entrada)
+        escolhidos.append(v)
+        coberto[indice.vizinhanca(v)] = True
+    return _completa(escolhidos, candidatos, max_cameras, rng)
+
+
+def amostra_por_grau(indice: IndiceVizinhanca, candidatos: Sequence[int], max_cameras: int,
+                     rng: np.random.Generator, expoente: float = 1.0) -> List[int]:
+    """
+    Sorteia max_cameras candidatos distintos com probabilidade proporcional
+    a |N[v]|^expoente (vértices que cobrem mais são mais prováveis).
+    """
+    candidatos = np.asarray(candidatos, dtype=np.int64)
+    pesos = indice.graus()[candidatos].astype(np.float64) ** expoente
+    escolhidos = rng.choice(candidatos, size=max_cameras, replace=False, p=pesos / pesos.sum())
+    return escolhidos.tolist()
+
+
+def _completa(escolhidos: List[int], candidatos: Sequence[int], max_cameras: int,
+              rng: np.random.Generator = None) -> List[int]:
+    # O genético trabalha com exatamente max_cameras câmeras
+    faltam = max_cameras - len(escolhidos)
+    if faltam <= 0:
+        return escolhidos
+    usados = set(escolhidos)
+    livres = [v for v in candidatos if v not in usados]
+    if rng is not None:
+        livres = rng.permutation(livres).tolist()
+    return escolhidos + livres[:faltam]
+
+
+def quantidades(fracoes: Dict[str, float], tamanho: int) -> Dict[str, int]:
+    """
+    Número de indivíduos de cada estratégia; o restante da população é aleatório.
+    A estratégia 'guloso' é determinística e gera no máximo um indivíduo.
+    """
+    desconhecidas = set(fracoes) - set(ESTRATEGIAS)
+    if desconhecidas:
+        raise ValueError(f"Estratégias desconhecidas: {sorted(desconhecidas)} (use {', '.join(ESTRATEGIAS)})")
+    if sum(fracoes.values()) > 1:
+        raise ValueError(f"As frações somam mais que 1: {fracoes}")
+    numeros = {nome: int(round(fracao * tamanho)) for nome, fracao in fracoes.items()}
+    if "guloso" in numeros:
+        numeros["guloso"] = 1 if fracoes["guloso"] > 0 else 0
+    return numeros
+
+
+def le_fracoes(texto: str) -> Dict[str, float]:
+    """
+    Lê frações no formato 'guloso=0.01,guloso_aleatorio=0.2,grau=0.2'.
+    """
+    fracoes = {}
+    for item in filter(None, (parte.strip() for parte in texto.split(","))):
+        nome, _, valor = item.partition("=")
+        fracoes[nome.strip()] = float(valor)
+    return fracoes
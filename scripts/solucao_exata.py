@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+import time
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+from scipy import sparse
+from scipy.optimize import Bounds, LinearConstraint, milp
+
+from indice_vizinhanca import IndiceVizinhanca
+
+
+class SolverExato:
+    def __init__(self, indice: IndiceVizinhanca, candidatos: Iterable[int], demanda: Iterable[int]):
+        """
+        Formulações inteiras dos problemas de cobertura resolvidas com scipy.optimize.milp (HiGHS).
+
+        Args:
+            indice: Índice das vizinhanças fechadas
+            candidatos: Posições dos vértices de instalação (conjunto J)
+            demanda: Posições dos vértices que precisam ser cobertos (conjunto I)
+        """
+        self.indice = indice
+        self.candidatos = np.asarray(list(candidatos), dtype=np.int64)
+        self.demanda = np.asarray(list(demanda), dtype=np.int64)
+        # Linha i (de I), coluna j (de J): 1 se a câmera em j cobre i
+        self.cobertura = indice.matriz_csr()[self.candidatos][:, self.demanda].T.tocsr()
+
+    def _cobertura_demanda(self, solucao) -> int:
+        mascara = self.indice.mascara_cobertura(solucao)
+        return int(np.count_nonzero(mascara[self.demanda]))
+
+    def _trivial(self, inicio: float) -> Dict:
+        """
+        Instância sem demanda ou sem candidatos (ex.: totalmente resolvida pela redução).
+        """
+        return {
+            "solucao": [],
+            "valor": 0,
+            "limite_inferior": 0,
+            "limite_superior": 0,
+            "gap": 0.0,
+            "otimo": True,
+            "status": "Instância trivial",
+            "tempo": time.perf_counter() - inicio,
+        }
+
+    def _resultado(self, res, inicio: float, solucao_inicial, valor_inicial, minimizacao: bool) -> Dict:
+        """
+        Monta o resultado com os limites inferior e superior do valor ótimo.
+        """
+        if res.x is not None:
+            x = res.x[:len(self.candidatos)]
+            solucao = self.candidatos[np.round(x) > 0.5].tolist()
+            valor = len(solucao) if minimizacao else self._cobertura_demanda(solucao)
+        else:
+            # Nenhuma solução melhor que a inicial dentro do tempo limite
+            solucao, valor = list(solucao_inicial), valor_inicial
+
+        # Sem nenhuma solução viável os limites triviais são todos os candidatos / nenhuma cobertura
+        limite_dual = getattr(res, 'mip_dual_bound', None)
+        if minimizacao:
+            limite_inferior = math.ceil(limite_dual - 1e-6) if limite_dual is not None else 0
+            limite_superior = valor if valor is not None else len(self.candidatos)
+        else:
+            limite_inferior = valor if valor is not None else 0
+            limite_superior = (math.floor(-limite_dual + 1e-6) if limite_dual is not None
+                               else len(self.demanda))
+        if res.status == 0:
+            limite_inferior = limite_superior = valor
+
+        return {
+            "solucao": solucao,
+            "valor": valor,
+            "limite_inferior": limite_inferior,
+            "limite_superior": limite_superior,
+            "gap": (limite_superior - limite_inferior) / max(abs(limite_superior), 1),
+            "otimo": valor is not None and limite_inferior == limite_superior,
+            "status": res.message,
+            "tempo": time.perf_counter() - inicio,
+        }
+
+    def resolve_cobertura_completa(self, solucao_inicial: Optional[Iterable[int]] = None,
+                                   tempo_limite: Optional[float] = 60.0) -> Dict:
+        """
+        Conjunto mínimo de câmeras que cobre toda a demanda.
+
+            min  Σ x_j   s.a.  Σ_{j cobre i} x_j ≥ 1  ∀ i ∈ I,  x_j ∈ {0, 1}
+
+        O milp do SciPy não aceita solução inicial, então a solução gulosa
+        entra como corte: Σ x_j ≤ |solução inicial|. Se o tempo acabar sem
+        solução melhor, a inicial é devolvida com o gap em relação ao limite dual.
+
+        Args:
+            solucao_inicial: Posições de uma cobertura completa viável (ex.: gulosa)
+            tempo_limite: Tempo máximo do solver em segundos
+
+        Returns:
+            Dict: solução, valor, limites inferior/superior, gap e tempo
+        """
+        inicio = time.perf_counter()
+        n = len(self.candidatos)
+        if len(self.demanda) == 0:
+            return self._trivial(inicio)
+        restricoes = [LinearConstraint(self.cobertura, lb=1, ub=np.inf)]
+        valor_inicial = None
+        if solucao_inicial is not None:
+            solucao_inicial = list(solucao_inicial)
+            valor_inicial = len(solucao_inicial)
+            restricoes.append(LinearConstraint(np.ones((1, n)), lb=0, ub=valor_inicial))
+
+        opcoes = {"disp": False}
+        if tempo_limite is not None:
+            opcoes["time_limit"] = tempo_limite
+        res = milp(c=np.ones(n), constraints=restricoes, integrality=np.ones(n),
+                   bounds=Bounds(0, 1), options=opcoes)
+        return self._resultado(res, inicio, solucao_inicial or [], valor_inicial, minimizacao=True)
+
+    def resolve_cobertura_maxima(self, max_cameras: int, solucao_inicial: Optional[Iterable[int]] = None,
+                                 tempo_limite: Optional[float] = 60.0) -> Dict:
+        """
+        Máximo de vértices de demanda cobertos com no máximo max_cameras câmeras.
+
+            max  Σ y_i   s.a.  y_i ≤ Σ_{j cobre i} x_j  ∀ i ∈ I,  Σ x_j ≤ p,
+                 x_j ∈ {0, 1},  0 ≤ y_i ≤ 1
+
+        A solução inicial entra como corte Σ y_i ≥ cobertura inicial.
+
+        Args:
+            max_cameras: Número máximo de câmeras
+            solucao_inicial: Posições de uma solução viável (ex.: gulosa)
+            tempo_limite: Tempo máximo do solver em segundos
+
+        Returns:
+            Dict: solução, valor, limites inferior/superior, gap e tempo
+        """
+        inicio = time.perf_counter()
+        n, m = len(self.candidatos), len(self.demanda)
+        if n == 0 or m == 0:
+            return self._trivial(inicio)
+
+        # Variáveis: [x_j para j em J] + [y_i para i em I]
+        c = np.concatenate([np.zeros(n), -np.ones(m)])
+        integralidade = np.concatenate([np.ones(n), np.zeros(m)])
+        ligacao = sparse.hstack([-self.cobertura, sparse.identity(m, format='csr')]).tocsr()
+        orcamento = np.concatenate([np.ones(n), np.zeros(m)]).reshape(1, -1)
+        restricoes = [
+            LinearConstraint(ligacao, lb=-np.inf, ub=0),
+            LinearConstraint(orcamento, lb=0, ub=max_cameras),
+        ]
+        valor_inicial = None
+        if solucao_inicial is not None:
+            solucao_inicial = list(solucao_inicial)
+            valor_inicial = self._cobertura_demanda(solucao_inicial)
+            corte = np.concatenate([np.zeros(n), np.ones(m)]).reshape(1, -1)
+            restricoes.append(LinearConstraint(corte, lb=valor_inicial, ub=np.inf))
+
+        opcoes = {"disp": False}
+        if tempo_limite is not None:
+            opcoes["time_limit"] = tempo_limite
+        res = milp(c=c, constraints=restricoes, integrality=integralidade,
+                   bounds=Bounds(0, 1), options=opcoes)
+        return self._resultado(res, inicio, solucao_inicial or [], valor_inicial, minimizacao=False)